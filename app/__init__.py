@@ -1,15 +1,49 @@
 from flask import Flask
 from config import Config
 from app.extensions import db
+from app.logging_config import init_logging
 from app.routes import register_routes
+from app.database import init_sqlite
+from app.query_stats import init_query_stats
+from app.metrics import init_metrics
+from app.signals import init_signals
+from app.references import init_references
+from app.idempotency import init_idempotency
+from app.guest_search import init_guest_search
+from app.reference_search import init_reference_search
+from app.table_versions import init_table_versions
+from app.room_catalog import init_room_catalog
+from app.availability import init_availability
+from app.events import init_events
+from app.documents import init_documents
+from app.transitions import init_transitions
+from app.priorities import init_priorities
+from app.query_plans import register_commands
 
 
-def create_app():
+def create_app(config_class=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_class)
+    init_logging(app)
 
     db.init_app(app)
+    init_sqlite(app)
+    init_query_stats(app)
+    init_metrics(app)
+    init_signals()
+    init_references()
+    init_idempotency()
+    init_guest_search()
+    init_reference_search()
+    init_table_versions()
+    init_room_catalog(app)
 
     register_routes(app)
+    init_availability(app)
+    init_priorities(app)
+    init_events()
+    init_documents(app)
+    init_transitions(app)
+    register_commands(app)
 
     return app
@@ -0,0 +1,236 @@
+# app/availability.py
+from bisect import bisect_left, insort
+from datetime import date
+import logging
+import threading
+from sqlalchemy.exc import OperationalError
+from app.extensions import db
+from flask import current_app
+from app.models import Booking
+from app.signals import bookings_committed
+from app.occupancy import OccupancyMatrix
+from app.room_catalog import get_room_catalog
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('booked', 'checked-in')
+
+
+class RoomIntervals:
+    """Sorted [check_in, check_out) intervals for one room with a prefix max of check-out dates."""
+
+    def __init__(self):
+        self.intervals = []
+        self.starts = []
+        self.max_ends = []
+
+    def _rebuild(self):
+        self.starts = [start for start, _, _ in self.intervals]
+        self.max_ends = []
+        running = None
+        for _, end, _ in self.intervals:
+            running = end if running is None or end > running else running
+            self.max_ends.append(running)
+
+    def add(self, start, end, booking_id):
+        insort(self.intervals, (start, end, booking_id))
+        self._rebuild()
+
+    def remove(self, start, end, booking_id):
+        try:
+            self.intervals.remove((start, end, booking_id))
+        except ValueError:
+            return
+        self._rebuild()
+
+    def overlaps(self, check_in, check_out, exclude_booking_id=None):
+        # Only intervals starting before check_out can overlap; of those, one overlaps
+        # as soon as any of them ends after check_in.
+        i = bisect_left(self.starts, check_out)
+        if i == 0:
+            return False
+        if exclude_booking_id is None:
+            return self.max_ends[i - 1] > check_in
+        return any(end > check_in and booking_id != exclude_booking_id
+                   for _, end, booking_id in self.intervals[:i])
+
+    def __len__(self):
+        return len(self.intervals)
+
+
+class AvailabilityIndex:
+    """In-memory per-room interval index of active bookings ('booked'/'checked-in').
+
+    The index is process-local: it is loaded once from the bookings table and then kept
+    current from the bookings_committed signal, so it only sees writes made by this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rooms = {}
+        self._bookings = {}
+        self.loaded = False
+
+    def load(self):
+        rows = db.session.query(
+            Booking.id, Booking.room_id, Booking.check_in_date, Booking.check_out_date
+        ).filter(
+            Booking.status.in_(ACTIVE_STATUSES),
+            Booking.room_id.isnot(None),
+            Booking.check_out_date >= date.today()
+        ).all()
+        with self._lock:
+            self._rooms = {}
+            self._bookings = {}
+            for booking_id, room_id, check_in, check_out in rows:
+                self._insert(booking_id, room_id, check_in, check_out)
+            self.loaded = True
+        logger.debug("Availability index loaded with %s active bookings", len(rows))
+
+    def _insert(self, booking_id, room_id, check_in, check_out):
+        self._rooms.setdefault(room_id, RoomIntervals()).add(check_in, check_out, booking_id)
+        self._bookings[booking_id] = (room_id, check_in, check_out)
+
+    def _discard(self, booking_id):
+        entry = self._bookings.pop(booking_id, None)
+        if entry:
+            room_id, check_in, check_out = entry
+            intervals = self._rooms.get(room_id)
+            if intervals is not None:
+                intervals.remove(check_in, check_out, booking_id)
+                if not intervals:
+                    del self._rooms[room_id]
+
+    def apply(self, changes):
+        with self._lock:
+            for change in changes:
+                self._discard(change.id)
+                if not change.deleted and change.room_id is not None and change.status in ACTIVE_STATUSES:
+                    self._insert(change.id, change.room_id, change.check_in_date, change.check_out_date)
+
+    def is_free(self, room_id, check_in, check_out, exclude_booking_id=None):
+        intervals = self._rooms.get(room_id)
+        return intervals is None or not intervals.overlaps(check_in, check_out, exclude_booking_id)
+
+    def free_rooms(self, rooms, check_in, check_out, exclude_booking_id=None):
+        """Filter an iterable of rooms down to those free for [check_in, check_out)."""
+        with self._lock:
+            return [room for room in rooms if self.is_free(room.id, check_in, check_out, exclude_booking_id)]
+
+
+def parse_price_filters(data):
+    """Read optional min_price/max_price from a request payload; raises ValueError when malformed."""
+    min_price = data.get('min_price')
+    max_price = data.get('max_price')
+    min_price = float(min_price) if min_price not in (None, '') else None
+    max_price = float(max_price) if max_price not in (None, '') else None
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise ValueError('min_price is greater than max_price')
+    return min_price, max_price
+
+
+def parse_exclude_booking_id(data):
+    """Read the optional exclude_booking_id from a request payload as an int; raises ValueError when malformed."""
+    value = data.get('exclude_booking_id')
+    if value in (None, ''):
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError('exclude_booking_id must be an integer')
+    return int(value)
+
+
+def find_available_rooms(check_in, check_out, room_type=None, min_price=None, max_price=None,
+                         exclude_booking_id=None):
+    """Return catalog rooms with no active booking overlapping [check_in, check_out).
+
+    Candidate rooms come from the process-local RoomCatalog. The default 'sql' backend then
+    drops the rooms returned by one booked-rooms query; the 'index' and 'matrix' backends
+    filter through a process-local structure instead.
+    """
+    rooms = get_room_catalog().rooms(room_type, min_price, max_price)
+    backend = current_app.config.get('AVAILABILITY_BACKEND')
+
+    if backend == 'index':
+        index = get_availability_index(current_app._get_current_object())
+        return index.free_rooms(rooms, check_in, check_out, exclude_booking_id)
+    if backend == 'matrix':
+        matrix = current_app.extensions['occupancy_matrix']
+        free = matrix.free_room_ids([room.id for room in rooms], check_in, check_out, exclude_booking_id)
+        if free is not None:
+            free = set(free)
+            return [room for room in rooms if room.id in free]
+        # Beyond the matrix horizon: fall through to SQL
+
+    booked = booked_room_ids(check_in, check_out, exclude_booking_id)
+    return [room for room in rooms if room.id not in booked]
+
+
+def booked_room_ids(check_in, check_out, exclude_booking_id=None):
+    """Ids of rooms holding an active booking that overlaps [check_in, check_out)."""
+    query = db.session.query(Booking.room_id).filter(
+        Booking.status.in_(ACTIVE_STATUSES),
+        Booking.check_in_date < check_out,
+        Booking.check_out_date > check_in
+    )
+    if exclude_booking_id is not None:
+        query = query.filter(Booking.id != exclude_booking_id)
+    return {room_id for room_id, in query.distinct()}
+
+
+def find_available_rooms_for_ranges(ranges, room_type=None, min_price=None, max_price=None):
+    """Free catalog rooms for each (check_in, check_out) in ranges, in the same order.
+
+    The 'matrix' backend answers every range from one vectorized pass; other backends
+    (and ranges past the matrix horizon) run find_available_rooms once per range.
+    """
+    if current_app.config.get('AVAILABILITY_BACKEND') != 'matrix':
+        return [find_available_rooms(check_in, check_out, room_type, min_price, max_price)
+                for check_in, check_out in ranges]
+    rooms = get_room_catalog().rooms(room_type, min_price, max_price)
+    matrix = current_app.extensions['occupancy_matrix']
+    free_ids = matrix.free_room_ids_for_ranges([room.id for room in rooms], ranges)
+    results = []
+    for (check_in, check_out), ids in zip(ranges, free_ids):
+        if ids is None:
+            results.append(find_available_rooms(check_in, check_out, room_type, min_price, max_price))
+        else:
+            ids = set(ids)
+            results.append([room for room in rooms if room.id in ids])
+    return results
+
+
+def get_availability_index(app):
+    index = app.extensions['availability_index']
+    if not index.loaded:
+        index.load()
+    return index
+
+
+def _on_bookings_committed(app, changes):
+    index = app.extensions.get('availability_index')
+    if index is not None and index.loaded:
+        index.apply(changes)
+    matrix = app.extensions.get('occupancy_matrix')
+    if matrix is not None:
+        matrix.apply(changes)
+
+
+def init_availability(app):
+    app.extensions['availability_index'] = AvailabilityIndex()
+    app.extensions['occupancy_matrix'] = OccupancyMatrix(app.config.get('OCCUPANCY_HORIZON_DAYS', 730),
+                                                         ACTIVE_STATUSES)
+    bookings_committed.connect(_on_bookings_committed)
+    backend = app.config.get('AVAILABILITY_BACKEND')
+    if backend not in ('index', 'matrix'):
+        return
+    with app.app_context():
+        try:
+            if backend == 'index':
+                app.extensions['availability_index'].load()
+            else:
+                app.extensions['occupancy_matrix'].load()
+        except OperationalError as e:
+            # Tables may not exist yet (e.g. before `flask db upgrade`); load lazily on first search.
+            logger.warning("Availability %s not loaded at startup: %s", backend, e)
+        finally:
+            db.session.remove()
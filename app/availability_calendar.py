@@ -0,0 +1,109 @@
+# app/availability_calendar.py
+from collections import OrderedDict
+from datetime import timedelta
+import threading
+import time
+import numpy as np
+from app.extensions import db
+from app.models import Booking
+from app.availability import ACTIVE_STATUSES
+from app.room_catalog import get_room_catalog
+from app.signals import bookings_committed
+
+MAX_CALENDAR_DAYS = 62
+# Latest start date the calendar serves, in days from today
+CALENDAR_HORIZON_DAYS = 730
+CALENDAR_CACHE_TTL = 60
+CALENDAR_CACHE_SIZE = 128
+
+
+def compute_calendar(start, days):
+    """Free room count and lowest free price per room_type for each night in [start, start + days).
+
+    Rooms come from the RoomCatalog and one query fetches the active bookings touching the
+    window; occupancy is a per-room difference array summed along the days axis.
+    """
+    end = start + timedelta(days=days)
+    rooms = get_room_catalog().rooms()
+    bookings = db.session.query(Booking.room_id, Booking.check_in_date, Booking.check_out_date).filter(
+        Booking.status.in_(ACTIVE_STATUSES),
+        Booking.room_id.isnot(None),
+        Booking.check_in_date < end,
+        Booking.check_out_date > start
+    ).all()
+
+    positions = {room.id: i for i, room in enumerate(rooms)}
+    diff = np.zeros((len(rooms), days + 1), dtype=np.int32)
+    booked = [(positions[room_id], check_in, check_out) for room_id, check_in, check_out in bookings
+              if room_id in positions]
+    if booked:
+        rows = np.array([row for row, _, _ in booked], dtype=np.int64)
+        starts = np.array([max((check_in - start).days, 0) for _, check_in, _ in booked], dtype=np.int64)
+        ends = np.array([min((check_out - start).days, days) for _, _, check_out in booked], dtype=np.int64)
+        np.add.at(diff, (rows, starts), 1)
+        np.add.at(diff, (rows, ends), -1)
+    free = np.cumsum(diff[:, :-1], axis=1) == 0
+
+    prices = np.array([room.price if room.price is not None else np.inf for room in rooms], dtype=np.float64)
+    room_types = np.array([room.room_type for room in rooms], dtype=object)
+    by_type = {}
+    for room_type in sorted({room.room_type for room in rooms}):
+        type_free = free[room_types == room_type]
+        type_prices = prices[room_types == room_type]
+        lowest = np.where(type_free, type_prices[:, None], np.inf).min(axis=0)
+        by_type[room_type] = (type_free.sum(axis=0), lowest)
+
+    calendar = []
+    for day in range(days):
+        calendar.append({
+            'date': (start + timedelta(days=day)).isoformat(),
+            'room_types': {
+                room_type: {
+                    'available': int(counts[day]),
+                    'lowest_price': float(lowest[day]) if np.isfinite(lowest[day]) else None
+                } for room_type, (counts, lowest) in by_type.items()
+            }
+        })
+    return calendar
+
+
+class CalendarCache:
+    """Bounded LRU of calendar grids keyed by (start, days); cleared whenever bookings change."""
+
+    def __init__(self, ttl=CALENDAR_CACHE_TTL, size=CALENDAR_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._grids = OrderedDict()
+        self.ttl = ttl
+        self.size = size
+
+    def get(self, start, days):
+        now = time.monotonic()
+        with self._lock:
+            cached = self._grids.get((start, days))
+            if cached and now - cached[1] < self.ttl:
+                self._grids.move_to_end((start, days))
+                return cached[0]
+        calendar = compute_calendar(start, days)
+        with self._lock:
+            self._grids[(start, days)] = (calendar, now)
+            self._grids.move_to_end((start, days))
+            while len(self._grids) > self.size:
+                self._grids.popitem(last=False)
+        return calendar
+
+    def __len__(self):
+        return len(self._grids)
+
+    def clear(self):
+        with self._lock:
+            self._grids.clear()
+
+
+calendar_cache = CalendarCache()
+
+
+def _on_bookings_committed(app, changes):
+    calendar_cache.clear()
+
+
+bookings_committed.connect(_on_bookings_committed)
@@ -0,0 +1,81 @@
+# app/database.py
+import logging
+import threading
+import time
+from collections import Counter
+from flask import current_app, has_app_context, request, has_request_context
+from sqlalchemy import event
+from app.extensions import db
+from app.metrics import LOCK_FAILURES, LOCK_RETRIES
+
+logger = logging.getLogger(__name__)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, pragmas, busy_timeout_ms):
+    cursor = dbapi_connection.cursor()
+    try:
+        # busy_timeout first so the journal_mode switch itself waits for other writers
+        cursor.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def init_sqlite(app):
+    """Apply the SQLITE_PRAGMAS profile (WAL, busy_timeout, ...) to every new SQLite connection."""
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    busy_timeout_ms = app.config.get('SQLITE_BUSY_TIMEOUT_MS', 5000)
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        _apply_sqlite_pragmas(dbapi_connection, pragmas, busy_timeout_ms)
+
+
+class LockRetryPolicy:
+    """Shared retry policy for 'database is locked' errors that outlast busy_timeout.
+
+    With WAL and busy_timeout SQLite already waits for the write lock, so a retry here
+    means a writer held it for longer than the timeout; retries and give-ups are counted
+    per endpoint so that can be watched.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.retries = Counter()
+        self.failures = Counter()
+
+    @property
+    def attempts(self):
+        if has_app_context():
+            return current_app.config.get('LOCK_RETRY_ATTEMPTS', 2)
+        return 2
+
+    def should_retry(self, error, attempt):
+        """Record a locked-database error and sleep before the next attempt if one remains."""
+        if 'database is locked' not in str(error):
+            return False
+        endpoint = (request.endpoint or '<unmatched>') if has_request_context() else '<no request>'
+        if attempt >= self.attempts - 1:
+            with self._lock:
+                self.failures[endpoint] += 1
+            LOCK_FAILURES.labels(endpoint).inc()
+            return False
+        with self._lock:
+            self.retries[endpoint] += 1
+        LOCK_RETRIES.labels(endpoint).inc()
+        backoff = current_app.config.get('LOCK_RETRY_BACKOFF', 0.05) if has_app_context() else 0.05
+        logger.warning("Database locked in %s, retrying attempt %s/%s", endpoint, attempt + 1, self.attempts)
+        time.sleep(backoff * (2 ** attempt))
+        return True
+
+    def snapshot(self):
+        with self._lock:
+            return {'retries': dict(self.retries), 'failures': dict(self.failures)}
+
+
+lock_retry = LockRetryPolicy()
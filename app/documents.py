@@ -0,0 +1,192 @@
+# app/documents.py
+import atexit
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, wait
+from datetime import date
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import click
+from app.models import Booking, Guest, Room
+from app.pdf_render import render_document
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_KINDS = ('confirmation', 'invoice')
+# Bump when the PDF layout changes so every cached file is re-rendered
+LAYOUT_VERSION = 2
+
+DOCUMENT_COLUMNS = (
+    Booking.id,
+    Booking.booking_reference,
+    Booking.check_in_date,
+    Booking.check_out_date,
+    Booking.status,
+    Booking.payment_status,
+    Booking.created_at,
+    Guest.full_name.label('guest_full_name'),
+    Guest.email.label('guest_email'),
+    Guest.phone.label('guest_phone'),
+    Room.room_number.label('room_number'),
+    Room.room_type.label('room_type'),
+    Room.price.label('room_price'),
+)
+
+
+def document_query(query=None):
+    """Projection of everything a confirmation or invoice prints, for a Booking query."""
+    query = query if query is not None else Booking.query
+    return query.outerjoin(Guest, Booking.guest_id == Guest.id) \
+        .outerjoin(Room, Booking.room_id == Room.id) \
+        .with_entities(*DOCUMENT_COLUMNS)
+
+
+def row_to_document_data(row, hotel_name, currency):
+    nights = (row.check_out_date - row.check_in_date).days
+    price = row.room_price or 0
+    return {
+        'layout': LAYOUT_VERSION,
+        'hotel_name': hotel_name,
+        'currency': currency,
+        'id': row.id,
+        'booking_reference': row.booking_reference,
+        'guest_full_name': row.guest_full_name or 'Unknown',
+        'guest_email': row.guest_email or '',
+        'guest_phone': row.guest_phone or '',
+        'room_number': row.room_number or 'N/A',
+        'room_type': row.room_type or 'N/A',
+        'room_price': price,
+        'check_in_date': row.check_in_date.isoformat(),
+        'check_out_date': row.check_out_date.isoformat(),
+        'nights': nights,
+        'total': round(price * nights, 2),
+        'status': row.status,
+        'payment_status': row.payment_status,
+        'created_at': row.created_at.isoformat() if row.created_at else '',
+    }
+
+
+def document_version(data):
+    """Fingerprint of the printed fields: any change to the booking, guest or room yields a new file."""
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def document_path(cache_dir, kind, data):
+    return os.path.join(cache_dir, kind, f"{data['id']}-{document_version(data)}.pdf")
+
+
+class DocumentRenderer:
+    """Renders PDFs in a process pool and remembers in-flight renders so each file is built once.
+
+    Workers are spawned rather than forked, so they start without the web process's locks,
+    sockets and threads, and only need render_document from app.pdf_render (importing the app
+    package defines create_app but never calls it). A spawned worker does re-import the
+    parent's __main__ module as __mp_main__, so a script entry point must not build the app
+    when loaded under that name; see run.py.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = {}
+        self.cache_dir = None
+        self.workers = None
+
+    def configure(self, cache_dir, workers):
+        self.cache_dir = cache_dir
+        self.workers = workers
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def submit(self, kind, data, path):
+        with self._lock:
+            future = self._pending.get(path)
+            if future is not None:
+                return future
+            future = self._pool().submit(render_document, kind, data, path)
+            self._pending[path] = future
+        # Outside the lock: the callback runs at once if the render has already finished
+        future.add_done_callback(lambda done: self._forget(path, done))
+        return future
+
+    def _forget(self, path, future):
+        with self._lock:
+            if self._pending.get(path) is future:
+                del self._pending[path]
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error("Rendering %s failed: %s", path, error)
+
+    def get(self, kind, data, wait_seconds):
+        """Path of the cached PDF, rendering it first if needed; None if not ready within wait_seconds."""
+        path = document_path(self.cache_dir, kind, data)
+        if os.path.exists(path):
+            return path
+        try:
+            return self.submit(kind, data, path).result(timeout=wait_seconds)
+        except TimeoutError:
+            return None
+
+    def render_all(self, jobs):
+        """Render (kind, data) jobs in parallel across the pool, skipping cached files; returns (rendered, failed)."""
+        futures = []
+        for kind, data in jobs:
+            path = document_path(self.cache_dir, kind, data)
+            if not os.path.exists(path):
+                futures.append(self.submit(kind, data, path))
+        done, _ = wait(futures)
+        failed = sum(1 for future in done if future.cancelled() or future.exception() is not None)
+        return len(futures) - failed, failed
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+document_renderer = DocumentRenderer()
+atexit.register(document_renderer.shutdown)
+
+
+def booking_document_data(booking_id, config):
+    row = document_query().filter(Booking.id == booking_id).first()
+    return row_to_document_data(row, config['HOTEL_NAME'], config['DOCUMENT_CURRENCY']) if row else None
+
+
+def end_of_day_jobs(day, kinds, config):
+    """Confirmations for bookings created on day and invoices for stays checking out on day."""
+    if 'confirmation' in kinds:
+        query = document_query(Booking.query.filter(Booking.created_at == day, Booking.status != 'cancelled'))
+        for row in query.execution_options(yield_per=500):
+            yield 'confirmation', row_to_document_data(row, config['HOTEL_NAME'], config['DOCUMENT_CURRENCY'])
+    if 'invoice' in kinds:
+        query = document_query(Booking.query.filter(Booking.check_out_date == day, Booking.status != 'cancelled'))
+        for row in query.execution_options(yield_per=500):
+            yield 'invoice', row_to_document_data(row, config['HOTEL_NAME'], config['DOCUMENT_CURRENCY'])
+
+
+def init_documents(app):
+    document_renderer.configure(app.config.get('DOCUMENT_CACHE_DIR') or os.path.join(app.instance_path, 'documents'),
+                                app.config.get('DOCUMENT_RENDER_WORKERS'))
+
+    @app.cli.command('render-documents')
+    @click.option('--date', 'day', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+                  help='Business day to render for (default: today).')
+    @click.option('--kind', type=click.Choice(DOCUMENT_KINDS + ('all',)), default='all')
+    def render_documents_command(day, kind):
+        """Pre-render the day's confirmations and invoices in parallel into the document cache."""
+        day = day.date() if day else date.today()
+        kinds = DOCUMENT_KINDS if kind == 'all' else (kind,)
+        rendered, failed = document_renderer.render_all(end_of_day_jobs(day, kinds, app.config))
+        click.echo(f"Rendered {rendered} document(s) for {day.isoformat()}, {failed} failed")
+        if failed:
+            raise SystemExit(1)
@@ -0,0 +1,44 @@
+# app/etags.py
+from datetime import date
+from functools import wraps
+import hashlib
+from flask import make_response, request, session
+from app.table_versions import read_versions
+
+
+def table_etag(tables, daily=False):
+    """Strong ETag for the current URL (path and query string) at the current table versions.
+
+    daily=True folds today's date in for payloads that change at midnight without a write.
+    """
+    parts = [request.full_path]
+    parts += [f"{name}={version}" for name, version in zip(tables, read_versions(tables))]
+    if daily:
+        parts.append(date.today().isoformat())
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+def conditional_get(*tables, daily=False):
+    """Answer If-None-Match with 304 before the view runs when none of `tables` changed.
+
+    Only applies to receptionist sessions; other requests fall through to the view's own
+    authorization check.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if session.get('role') != 'receptionist':
+                return view(*args, **kwargs)
+            etag = table_etag(tables, daily)
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            # Let the browser keep the body but revalidate it on every dashboard refresh
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,130 @@
+# app/events.py
+from collections import deque
+import itertools
+import json
+import logging
+import queue
+import threading
+from app.signals import bookings_committed, tables_committed
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 100
+REPLAY_BUFFER_SIZE = 256
+
+
+class EventBroker:
+    """In-process fan-out of dashboard events to every open /receptionist/events stream.
+
+    Each subscriber gets a bounded queue; one that falls behind is emptied and sent a
+    'resync' event so its dashboard refetches instead of blocking publishers. The last
+    REPLAY_BUFFER_SIZE events are kept so a reconnecting client can resume from
+    Last-Event-ID; an id the buffer cannot continue from gets 'resync'. Events only reach streams served by the same process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._recent = deque(maxlen=REPLAY_BUFFER_SIZE)
+        self._ids = itertools.count(1)
+        self._last_id = 0
+
+    def subscribe(self, last_event_id=None):
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            if last_event_id is not None:
+                oldest = self._recent[0][0] if self._recent else self._last_id + 1
+                missed = [event for event in self._recent if event[0] > last_event_id]
+                if not oldest - 1 <= last_event_id <= self._last_id or len(missed) > SUBSCRIBER_QUEUE_SIZE:
+                    # Older than the replay buffer, or from before a restart: the client has to refetch
+                    missed = [(self._last_id, 'resync', {})]
+                for event in missed:
+                    subscriber.put_nowait(event)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event_type, data):
+        with self._lock:
+            self._last_id = next(self._ids)
+            event = (self._last_id, event_type, data)
+            self._recent.append(event)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                _drain(subscriber)
+                try:
+                    subscriber.put_nowait((event[0], 'resync', {}))
+                except queue.Full:
+                    pass
+                logger.warning("Dashboard event subscriber fell behind; sent resync")
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+def _drain(subscriber):
+    try:
+        while True:
+            subscriber.get_nowait()
+    except queue.Empty:
+        pass
+
+
+def format_event(event):
+    event_id, event_type, data = event
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+def booking_action(change):
+    """Classify one committed BookingChange for the dashboard."""
+    previous = change.previous
+    if change.deleted:
+        return 'deleted'
+    if previous is None:
+        return 'created'
+    if change.status != previous.status:
+        if change.status == 'cancelled':
+            return 'cancelled'
+        if change.status == 'checked-out':
+            return 'checked_out'
+        return 'status'
+    if change.payment_status != previous.payment_status:
+        return 'payment'
+    return 'modified'
+
+
+def booking_event_data(change):
+    return {
+        'action': booking_action(change),
+        'id': change.id,
+        'room_id': change.room_id,
+        'check_in_date': change.check_in_date.isoformat() if change.check_in_date else None,
+        'check_out_date': change.check_out_date.isoformat() if change.check_out_date else None,
+        'status': change.status,
+        'payment_status': change.payment_status
+    }
+
+
+broker = EventBroker()
+
+
+def _on_bookings_committed(app, changes):
+    for change in changes:
+        broker.publish('booking', booking_event_data(change))
+
+
+def _on_tables_committed(app, names):
+    if 'rooms' in names:
+        broker.publish('rooms', {})
+
+
+def init_events():
+    bookings_committed.connect(_on_bookings_committed)
+    tables_committed.connect(_on_tables_committed)
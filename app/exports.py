@@ -0,0 +1,101 @@
+# app/exports.py
+import csv
+import io
+import tempfile
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from app.serializers import booking_list_query
+
+# Rows fetched per round trip while exporting
+EXPORT_BATCH = 1000
+# Bytes per chunk when sending the finished XLSX file
+XLSX_CHUNK_SIZE = 64 * 1024
+# Finished XLSX files up to this size stay in memory before spilling to disk
+XLSX_SPOOL_BYTES = 8 * 1024 * 1024
+
+EXPORT_COLUMNS = (
+    'Booking ID', 'Reference', 'Guest', 'Guest Email', 'Room', 'Room Type', 'Check-in', 'Check-out', 'Nights',
+    'Status', 'Payment Status',
+)
+
+# Leading characters that make Excel and LibreOffice read a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def spreadsheet_text(value):
+    """Text a spreadsheet will show as typed: values starting with a formula character get a leading quote."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def export_rows(query):
+    """Bookings of a filtered Booking query as EXPORT_COLUMNS tuples, at most one batch in memory.
+
+    Guest-supplied text is passed through spreadsheet_text, so a name like '=HYPERLINK(...)'
+    is exported as text rather than run as a formula.
+    """
+    result = booking_list_query(query).execution_options(yield_per=EXPORT_BATCH)
+    for row in result:
+        nights = (row.check_out_date - row.check_in_date).days if row.check_in_date and row.check_out_date else None
+        yield tuple(spreadsheet_text(value) for value in (
+            row.id, row.booking_reference, row.guest_full_name or 'Unknown', row.guest_email or '',
+            row.room_number or 'N/A', row.room_type or 'N/A', row.check_in_date, row.check_out_date, nights,
+            row.status, row.payment_status,
+        ))
+
+
+def _xlsx_cell(sheet, value):
+    if not isinstance(value, str):
+        return value
+    # Explicit string cell: openpyxl would otherwise store any text starting with '=' as a formula
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.data_type = 's'
+    return cell
+
+
+def stream_bookings_csv(query):
+    """Yield the export as CSV text, one chunk per fetched batch so bytes flow while the query runs."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so Excel opens the UTF-8 guest names correctly
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_COLUMNS)
+    for i, row in enumerate(export_rows(query), 1):
+        writer.writerow(row)
+        if i % EXPORT_BATCH == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_bookings_xlsx(query):
+    """Yield the export as an XLSX file built with a write-only workbook.
+
+    Write-only worksheets spill rows to a temporary file as they are appended, so memory
+    stays flat, but the zip container only exists once every row is in; the file is then
+    sent in XLSX_CHUNK_SIZE pieces from a spooled temporary file.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Bookings')
+    sheet.append(EXPORT_COLUMNS)
+    for row in export_rows(query):
+        sheet.append([_xlsx_cell(sheet, value) for value in row])
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_BYTES) as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(XLSX_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def export_filename(export_format, today):
+    return f"bookings-{today.isoformat()}.{export_format}"
@@ -0,0 +1,141 @@
+# app/guest_search.py
+import re
+import unicodedata
+from sqlalchemy import delete, event, insert, inspect, select
+from app.models import Guest, GuestNameToken
+
+MIN_QUERY_LENGTH = 2
+MIN_PHONE_DIGITS = 3
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+SEARCH_FIELDS = ('name', 'email', 'phone')
+
+_PHONE_LIKE = re.compile(r'^[\d\s()+\-.]+$')
+
+
+def fold_name(value):
+    """Case- and accent-insensitive form of a name with whitespace collapsed: 'José  Núñez' -> 'jose nunez'."""
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+def normalize_email(value):
+    return (value or '').strip().lower()
+
+
+def phone_digits(value):
+    return ''.join(ch for ch in (value or '') if ch.isdigit())
+
+
+def search_keys(full_name, email, phone):
+    """Column values for Guest.name_folded, email_normalized and phone_digits."""
+    return {
+        'name_folded': fold_name(full_name),
+        'email_normalized': normalize_email(email),
+        'phone_digits': phone_digits(phone),
+    }
+
+
+def name_tokens(full_name):
+    """Distinct words of the folded name, each indexed in guest_name_tokens: 'John  Smith' -> {'john', 'smith'}."""
+    return set(fold_name(full_name).split())
+
+
+def prefix_filter(column, prefix):
+    """column starts with prefix, written as a range so any B-tree index on column is used."""
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return (column >= prefix) & (column < upper)
+
+
+def search_field(query, field=None):
+    """Pick the field a free-text query targets: emails contain '@', phones are digits and punctuation."""
+    if field:
+        return field
+    if '@' in query:
+        return 'email'
+    if _PHONE_LIKE.match(query) and len(phone_digits(query)) >= MIN_PHONE_DIGITS:
+        return 'phone'
+    return 'name'
+
+
+def search_ranges(query, field=None):
+    """(column, prefix) index ranges to scan for a query; empty when it is too short to be selective."""
+    field = search_field(query, field)
+    if field == 'phone':
+        digits = phone_digits(query)
+        return [(Guest.phone_digits, digits)] if len(digits) >= MIN_PHONE_DIGITS else []
+    if field == 'email':
+        email = normalize_email(query)
+        return [(Guest.email_normalized, email)] if len(email) >= MIN_QUERY_LENGTH else []
+    name = fold_name(query)
+    if len(name) < MIN_QUERY_LENGTH:
+        return []
+    # A bare word may be the start of a name, of a later word in it (a surname), or of an email address
+    ranges = [(Guest.name_folded, name), (Guest.email_normalized, name.replace(' ', ''))]
+    if ' ' not in name:
+        ranges.insert(1, (GuestNameToken.token, name))
+    return ranges
+
+
+def search_guests(base_query, query, field=None, limit=SEARCH_LIMIT):
+    """Up to `limit` guests whose name, a word of their name, email or phone starts with `query`.
+
+    Each range is its own index scan ordered by the indexed column and cut off by LIMIT,
+    so the cost depends on `limit`, not on the size of the guests table.
+    """
+    results = {}
+    for column, prefix in search_ranges(query, field):
+        if column is GuestNameToken.token:
+            guest_ids = select(GuestNameToken.guest_id).where(prefix_filter(column, prefix)) \
+                .order_by(column).limit(limit)
+            rows = base_query.filter(Guest.id.in_(guest_ids)).order_by(Guest.name_folded).limit(limit).all()
+        else:
+            rows = base_query.filter(prefix_filter(column, prefix)).order_by(column).limit(limit).all()
+        for row in rows:
+            results.setdefault(row.id, row)
+        if len(results) >= limit:
+            break
+    return list(results.values())[:limit]
+
+
+def _set_search_keys(mapper, connection, guest):
+    for column, value in search_keys(guest.full_name, guest.email, guest.phone).items():
+        setattr(guest, column, value)
+
+
+def _insert_tokens(connection, guest):
+    rows = [{'token': token, 'guest_id': guest.id} for token in name_tokens(guest.full_name)]
+    if rows:
+        connection.execute(insert(GuestNameToken), rows)
+
+
+def _delete_tokens(connection, guest):
+    connection.execute(delete(GuestNameToken).where(GuestNameToken.guest_id == guest.id))
+
+
+def _after_insert(mapper, connection, guest):
+    _insert_tokens(connection, guest)
+
+
+def _after_update(mapper, connection, guest):
+    if inspect(guest).attrs.full_name.history.has_changes():
+        _delete_tokens(connection, guest)
+        _insert_tokens(connection, guest)
+
+
+def _after_delete(mapper, connection, guest):
+    _delete_tokens(connection, guest)
+
+
+def init_guest_search():
+    """Keep the normalized search columns and guest_name_tokens current on every ORM write of a Guest."""
+    if event.contains(Guest, 'before_insert', _set_search_keys):
+        return
+    event.listen(Guest, 'before_insert', _set_search_keys)
+    event.listen(Guest, 'before_update', _set_search_keys)
+    event.listen(Guest, 'after_insert', _after_insert)
+    event.listen(Guest, 'after_update', _after_update)
+    event.listen(Guest, 'after_delete', _after_delete)
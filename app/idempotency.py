@@ -0,0 +1,112 @@
+# app/idempotency.py
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import json
+import logging
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_HOURS = 24
+CACHE_SIZE = 1024
+PURGE_INTERVAL = 3600
+
+
+class ResponseCache:
+    """Bounded LRU of recently committed idempotent responses, checked before the table."""
+
+    def __init__(self, size=CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self._size = size
+
+    def get(self, scope, key):
+        with self._lock:
+            item = self._items.get((scope, key))
+            if item is None:
+                return None
+            expires_at, body, status_code = item
+            if expires_at <= datetime.utcnow():
+                del self._items[(scope, key)]
+                return None
+            self._items.move_to_end((scope, key))
+            return body, status_code
+
+    def put(self, scope, key, expires_at, body, status_code):
+        with self._lock:
+            self._items[(scope, key)] = (expires_at, body, status_code)
+            self._items.move_to_end((scope, key))
+            while len(self._items) > self._size:
+                self._items.popitem(last=False)
+
+
+_cache = ResponseCache()
+_last_purge = 0.0
+
+
+def replay_response(scope, key):
+    """Return (body, status_code) stored for a request_id, or None if it has not been seen."""
+    cached = _cache.get(scope, key)
+    if cached is not None:
+        return cached
+    row = IdempotencyKey.query.filter(
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.key == key,
+        IdempotencyKey.expires_at > datetime.utcnow()
+    ).first()
+    if row is None:
+        return None
+    body = json.loads(row.response_body)
+    _cache.put(scope, key, row.expires_at, body, row.status_code)
+    return body, row.status_code
+
+
+def record_response(scope, key, body, status_code=200):
+    """Store a response in the current transaction; it becomes replayable once that commits."""
+    ttl = timedelta(hours=current_app.config.get('IDEMPOTENCY_KEY_TTL_HOURS', DEFAULT_TTL_HOURS))
+    now = datetime.utcnow()
+    expires_at = now + ttl
+    # An expired row for this key may still be waiting for _purge_expired; it must not block the insert
+    IdempotencyKey.query.filter(
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.key == key,
+        IdempotencyKey.expires_at <= now
+    ).delete(synchronize_session=False)
+    db.session.add(IdempotencyKey(scope=scope, key=key, status_code=status_code,
+                                  response_body=json.dumps(body), expires_at=expires_at))
+    db.session.info.setdefault('idempotent_responses', []).append((scope, key, expires_at, body, status_code))
+    _purge_expired()
+
+
+def _purge_expired():
+    global _last_purge
+    now = time.monotonic()
+    if now - _last_purge < PURGE_INTERVAL:
+        return
+    _last_purge = now
+    deleted = IdempotencyKey.query.filter(IdempotencyKey.expires_at <= datetime.utcnow()).delete(
+        synchronize_session=False)
+    if deleted:
+        logger.debug("Purged %s expired idempotency keys", deleted)
+
+
+def _after_commit(session):
+    for scope, key, expires_at, body, status_code in session.info.pop('idempotent_responses', []):
+        _cache.put(scope, key, expires_at, body, status_code)
+
+
+def _after_rollback(session):
+    session.info.pop('idempotent_responses', None)
+
+
+def init_idempotency():
+    if event.contains(Session, 'after_commit', _after_commit):
+        return
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
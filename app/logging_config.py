@@ -0,0 +1,96 @@
+# app/logging_config.py
+import atexit
+from datetime import datetime, timezone
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from flask import has_request_context, request
+
+_listener = None
+_queue_handler = None
+_target = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; request fields are attached by RequestContextFilter."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in ('endpoint', 'method', 'path', 'remote_addr'):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Copy request details onto the record while still on the request thread."""
+
+    def filter(self, record):
+        if has_request_context():
+            record.endpoint = request.endpoint
+            record.method = request.method
+            record.path = request.path
+            record.remote_addr = request.remote_addr
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Keep only `rate` of DEBUG records so verbose loggers can stay on in busy processes."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+def init_logging(app):
+    """Route all logging through a QueueHandler; a QueueListener thread formats and writes.
+
+    Request threads only enqueue records, so slow disks or terminals never block them.
+    Levels come from LOG_LEVELS, so DEBUG payloads are not formatted unless enabled.
+    """
+    global _listener, _queue_handler, _target
+    root = logging.getLogger()
+    if _listener is not None:
+        _listener.stop()
+        root.removeHandler(_queue_handler)
+        _target.close()
+
+    log_file = app.config.get('LOG_FILE')
+    _target = logging.FileHandler(log_file, encoding='utf-8') if log_file else logging.StreamHandler(sys.stderr)
+    _target.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _queue_handler.addFilter(DebugSampler(app.config.get('LOG_DEBUG_SAMPLE_RATE', 1.0)))
+    _queue_handler.addFilter(RequestContextFilter())
+    root.addHandler(_queue_handler)
+
+    for name, level in (app.config.get('LOG_LEVELS') or {}).items():
+        logging.getLogger(name or None).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, _target, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
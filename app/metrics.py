@@ -0,0 +1,100 @@
+# app/metrics.py
+import os
+import time
+from flask import g, request
+from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+                               generate_latest)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from app.extensions import db
+from app.signals import bookings_committed
+
+# With PROMETHEUS_MULTIPROC_DIR set (before the app is imported) every worker writes its
+# samples to mmap-backed files in that directory and /metrics merges them on scrape; the
+# process manager should call prometheus_client.multiprocess.mark_process_dead(pid) when
+# a worker exits so its in-flight and pool gauges drop out.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram('hotel_request_duration_seconds', 'Request latency by endpoint and status',
+                            ['blueprint', 'endpoint', 'method', 'status'], buckets=LATENCY_BUCKETS)
+REQUESTS_IN_FLIGHT = Gauge('hotel_requests_in_flight', 'Requests currently being handled',
+                           multiprocess_mode='livesum')
+DB_POOL_CHECKED_OUT = Gauge('hotel_db_pool_checked_out', 'Database connections checked out of the pool',
+                            multiprocess_mode='livesum')
+DB_POOL_CONNECTIONS = Gauge('hotel_db_pool_connections', 'Open database connections held by the pool',
+                            multiprocess_mode='livesum')
+LOCK_RETRIES = Counter('hotel_db_lock_retries', "Retries after 'database is locked'", ['endpoint'])
+LOCK_FAILURES = Counter('hotel_db_lock_failures', "Requests that gave up on 'database is locked'", ['endpoint'])
+BOOKINGS_CREATED = Counter('hotel_bookings_created', 'Bookings committed')
+BOOKINGS_CANCELLED = Counter('hotel_bookings_cancelled', 'Bookings moved to cancelled')
+BOOKING_CONFLICTS = Counter('hotel_booking_conflicts', 'Booking attempts rejected with ROOM_BOOKED', ['endpoint'])
+
+
+def render_metrics():
+    """Prometheus text exposition of this process, or of all workers in multiprocess mode."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def _start_request():
+    g.metrics_started = time.perf_counter()
+    g.metrics_in_flight = True
+    REQUESTS_IN_FLIGHT.inc()
+
+
+def _finish_request(response):
+    started = g.get('metrics_started')
+    if started is not None:
+        REQUEST_LATENCY.labels(request.blueprint or '', request.endpoint or '', request.method,
+                               str(response.status_code)).observe(time.perf_counter() - started)
+    if response.status_code == 400 and response.is_json:
+        body = response.get_json(silent=True)
+        if isinstance(body, dict) and body.get('code') == 'ROOM_BOOKED':
+            BOOKING_CONFLICTS.labels(request.endpoint or '').inc()
+    return response
+
+
+def _teardown_request(error=None):
+    # Runs even when a view raised, so the gauge cannot drift upwards
+    if g.pop('metrics_in_flight', False):
+        REQUESTS_IN_FLIGHT.dec()
+
+
+def _on_bookings_committed(app, changes):
+    for change in changes:
+        if change.deleted:
+            continue
+        if change.previous is None:
+            BOOKINGS_CREATED.inc()
+        elif change.status == 'cancelled' and change.previous.status != 'cancelled':
+            BOOKINGS_CANCELLED.inc()
+
+
+def init_metrics(app):
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.inc()
+
+    @event.listens_for(engine, 'close')
+    def on_close(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.dec()
+
+    @event.listens_for(engine, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, 'checkin')
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_teardown_request)
+    bookings_committed.connect(_on_bookings_committed)
@@ -1,18 +1,28 @@
 from app.extensions import db
+from sqlalchemy import event
 from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import date
-import string
-import random
+from datetime import date, datetime
 
 
-def generate_booking_reference():
-    """Generate a unique booking reference like PL00001."""
-    prefix = "PL"
-    while True:
-        number = ''.join(random.choices(string.digits, k=5))
-        reference = f"{prefix}{number}"
-        if not Booking.query.filter_by(booking_reference=reference).first():
-            return reference
+class ReferenceCounter(db.Model):
+    __tablename__ = 'reference_counters'
+    name = db.Column(db.String(50), primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False, default=1)
+
+
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class JobRun(db.Model):
+    """Last run of each scheduled job; claiming a day's run is a conditional UPDATE of its row."""
+    __tablename__ = 'job_runs'
+    name = db.Column(db.String(50), primary_key=True)
+    last_run_on = db.Column(db.Date)
+    last_run_at = db.Column(db.DateTime)
+    last_result = db.Column(db.Text)
 
 
 class Receptionist(db.Model):
@@ -37,9 +47,26 @@ class Guest(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)  # Changed to unique
     phone = db.Column(db.String(20), nullable=False)
     created_at = db.Column(db.Date, default=date.today)
+    # Search keys kept in step with the columns above by app.guest_search
+    name_folded = db.Column(db.String(100))
+    email_normalized = db.Column(db.String(120))
+    phone_digits = db.Column(db.String(20))
 
     bookings = db.relationship('Booking', backref='guest', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_guests_name_folded', 'name_folded'),
+        db.Index('ix_guests_email_normalized', 'email_normalized'),
+        db.Index('ix_guests_phone_digits', 'phone_digits'),
+    )
+
+
+class GuestNameToken(db.Model):
+    """Each folded word of a guest's name, so a search for a surname finds it (see app.guest_search)."""
+    __tablename__ = 'guest_name_tokens'
+    token = db.Column(db.String(100), primary_key=True)
+    guest_id = db.Column(db.Integer, db.ForeignKey('guests.id', ondelete='CASCADE'), primary_key=True)
+
 
 class Room(db.Model):
     __tablename__ = 'rooms'
@@ -68,7 +95,8 @@ class Room(db.Model):
 class Booking(db.Model):
     __tablename__ = 'bookings'
     id = db.Column(db.Integer, primary_key=True)
-    booking_reference = db.Column(db.String(10), unique=True, nullable=False, default=generate_booking_reference)
+    # Assigned from app.references when the booking is first flushed
+    booking_reference = db.Column(db.String(10), unique=True, nullable=False)
     guest_id = db.Column(db.Integer, db.ForeignKey('guests.id'), nullable=False)
     room_id = db.Column(db.Integer, db.ForeignKey('rooms.id', ondelete='SET NULL'))
     check_in_date = db.Column(db.Date, nullable=False)
@@ -79,6 +107,17 @@ class Booking(db.Model):
 
     __table_args__ = (
         db.CheckConstraint('check_out_date > check_in_date', name='check_date_order'),
+        # Overlap checks: room_id = ? AND status IN (...) AND check_in_date < ? AND check_out_date > ?
+        db.Index('ix_bookings_room_status_dates', 'room_id', 'status', 'check_in_date', 'check_out_date'),
+        # Arrivals / upcoming check-ins and departures for the priorities panel
+        db.Index('ix_bookings_status_check_in', 'status', 'check_in_date'),
+        db.Index('ix_bookings_status_check_out', 'status', 'check_out_date'),
+        # Overdue payments: payment_status = 'pending' AND status IN (...) AND check_in_date <= today
+        db.Index('ix_bookings_payment_status_check_in', 'payment_status', 'status', 'check_in_date'),
+        # Dashboard list filtered by status, ordered by id DESC
+        db.Index('ix_bookings_status_id', 'status', 'id'),
+        db.Index('ix_bookings_created_at', 'created_at'),
+        db.Index('ix_bookings_guest_id', 'guest_id'),
     )
 
     def to_dict(self):
@@ -99,3 +138,37 @@ class Booking(db.Model):
             'status': self.status,
             'payment_status': self.payment_status
         }
+
+
+class BookingReferenceGram(db.Model):
+    """Trigrams of each booking reference's digits, for substring search (see app.reference_search)."""
+    __tablename__ = 'booking_reference_grams'
+    gram = db.Column(db.String(3), primary_key=True)
+    booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id', ondelete='CASCADE'), primary_key=True)
+
+
+class IdempotencyKey(db.Model):
+    __tablename__ = 'idempotency_keys'
+    scope = db.Column(db.String(50), primary_key=True)
+    key = db.Column(db.String(100), primary_key=True)
+    status_code = db.Column(db.Integer, nullable=False)
+    response_body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+# Rows the migrations seed. Databases built with db.create_all() instead get them from the
+# after_create hook below, so code can rely on them either way
+SEED_ROWS = {
+    ReferenceCounter.__table__: [{'name': 'booking', 'next_value': 1}],
+    TableVersion.__table__: [{'name': name, 'version': 0} for name in ('rooms', 'guests', 'bookings')],
+    JobRun.__table__: [{'name': 'booking_transitions'}],
+}
+
+
+def _seed_table(table, connection, **kw):
+    connection.execute(table.insert(), SEED_ROWS[table])
+
+
+for _table in SEED_ROWS:
+    event.listen(_table, 'after_create', _seed_table)
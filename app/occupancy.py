@@ -0,0 +1,161 @@
+# app/occupancy.py
+from datetime import date, timedelta
+import logging
+import threading
+import numpy as np
+from app.extensions import db
+from app.models import Booking, Room
+
+logger = logging.getLogger(__name__)
+
+
+class OccupancyMatrix:
+    """Rooms x days uint8 matrix of active bookings over a rolling horizon starting today.
+
+    Cell [r, d] counts the active bookings holding room r on night origin + d, so a room is
+    free for a range when its slice of the row is all zero. Like AvailabilityIndex it is
+    process-local and kept current from bookings_committed; it reloads when the date rolls
+    over or a room it has not seen is asked about.
+    """
+
+    def __init__(self, horizon_days, statuses):
+        self.horizon_days = horizon_days
+        self.statuses = tuple(statuses)
+        self._lock = threading.Lock()
+        self._room_ids = np.zeros(0, dtype=np.int64)
+        self._rows = {}
+        self._matrix = np.zeros((0, horizon_days), dtype=np.uint8)
+        self._busy_prefix = None
+        self._bookings = {}
+        self.origin = None
+        self.loaded = False
+
+    def load(self):
+        origin = date.today()
+        room_ids = np.array([room_id for room_id, in db.session.query(Room.id).order_by(Room.id)], dtype=np.int64)
+        rows = db.session.query(
+            Booking.id, Booking.room_id, Booking.check_in_date, Booking.check_out_date
+        ).filter(
+            Booking.status.in_(self.statuses),
+            Booking.room_id.isnot(None),
+            Booking.check_out_date > origin,
+            Booking.check_in_date < origin + timedelta(days=self.horizon_days)
+        ).all()
+
+        positions = {int(room_id): i for i, room_id in enumerate(room_ids)}
+        bookings = {}
+        for booking_id, room_id, check_in, check_out in rows:
+            if room_id in positions:
+                bookings[booking_id] = (room_id, check_in, check_out)
+
+        # Difference array per room (+1 at check-in, -1 at check-out) and one cumsum along the days axis
+        diff = np.zeros((len(room_ids), self.horizon_days + 1), dtype=np.int32)
+        if bookings:
+            entries = list(bookings.values())
+            room_rows = np.array([positions[room_id] for room_id, _, _ in entries], dtype=np.int64)
+            starts = np.array([self._clip((check_in - origin).days) for _, check_in, _ in entries], dtype=np.int64)
+            ends = np.array([self._clip((check_out - origin).days) for _, _, check_out in entries], dtype=np.int64)
+            np.add.at(diff, (room_rows, starts), 1)
+            np.add.at(diff, (room_rows, ends), -1)
+        matrix = np.cumsum(diff[:, :-1], axis=1).clip(0, 255).astype(np.uint8)
+
+        with self._lock:
+            self._room_ids = room_ids
+            self._rows = positions
+            self._matrix = matrix
+            self._busy_prefix = None
+            self._bookings = bookings
+            self.origin = origin
+            self.loaded = True
+        logger.debug("Occupancy matrix loaded: %s rooms x %s days, %s active bookings",
+                     len(room_ids), self.horizon_days, len(bookings))
+
+    def _clip(self, offset):
+        return min(max(offset, 0), self.horizon_days)
+
+    def _mark(self, booking_id, room_id, check_in, check_out, delta):
+        row = self._rows.get(room_id)
+        if row is None:
+            return False
+        start = self._clip((check_in - self.origin).days)
+        end = self._clip((check_out - self.origin).days)
+        if start < end:
+            cells = self._matrix[row, start:end].astype(np.int16) + delta
+            self._matrix[row, start:end] = cells.clip(0, 255)
+        if delta > 0:
+            self._bookings[booking_id] = (room_id, check_in, check_out)
+        return True
+
+    def apply(self, changes):
+        with self._lock:
+            if not self.loaded:
+                return
+            for change in changes:
+                entry = self._bookings.pop(change.id, None)
+                if entry:
+                    self._mark(change.id, *entry, -1)
+                if not change.deleted and change.room_id is not None and change.status in self.statuses:
+                    if not self._mark(change.id, change.room_id, change.check_in_date, change.check_out_date, 1):
+                        # A room created after the last load; rebuild on the next lookup
+                        self.loaded = False
+            self._busy_prefix = None
+
+    def _offsets(self, check_in, check_out):
+        start = (check_in - self.origin).days
+        end = (check_out - self.origin).days
+        if start < 0 or end > self.horizon_days or start >= end:
+            return None
+        return start, end
+
+    def _ensure_current(self, room_ids):
+        if not self.loaded or self.origin != date.today() or any(room_id not in self._rows for room_id in room_ids):
+            self.load()
+
+    def free_room_ids(self, room_ids, check_in, check_out, exclude_booking_id=None):
+        """Subset of room_ids free for [check_in, check_out), or None when the range is outside the horizon."""
+        self._ensure_current(room_ids)
+        with self._lock:
+            offsets = self._offsets(check_in, check_out)
+            if offsets is None:
+                return None
+            start, end = offsets
+            window = self._matrix[:, start:end]
+            excluded = self._bookings.get(exclude_booking_id) if exclude_booking_id is not None else None
+            if excluded:
+                # Take the booking being modified back out of its own room's row for this check
+                room_id, booked_in, booked_out = excluded
+                window = window.astype(np.int16)
+                row = self._rows[room_id]
+                lo = max(self._clip((booked_in - self.origin).days), start) - start
+                hi = min(self._clip((booked_out - self.origin).days), end) - start
+                if lo < hi:
+                    window[row, lo:hi] -= 1
+            free = self._room_ids[~(window > 0).any(axis=1)]
+        wanted = set(room_ids)
+        return [int(room_id) for room_id in free if int(room_id) in wanted]
+
+    def free_room_ids_for_ranges(self, room_ids, ranges):
+        """Free room ids for each (check_in, check_out) in ranges, in one vectorized pass.
+
+        Uses a per-room prefix count of occupied nights, so each range costs two column
+        lookups; ranges outside the horizon map to None.
+        """
+        self._ensure_current(room_ids)
+        with self._lock:
+            if self._busy_prefix is None:
+                busy = np.zeros((len(self._room_ids), self.horizon_days + 1), dtype=np.int32)
+                np.cumsum(self._matrix > 0, axis=1, out=busy[:, 1:])
+                self._busy_prefix = busy
+            offsets = [self._offsets(check_in, check_out) for check_in, check_out in ranges]
+            valid = [i for i, offset in enumerate(offsets) if offset is not None]
+            results = [None] * len(ranges)
+            if valid:
+                starts = np.array([offsets[i][0] for i in valid], dtype=np.int64)
+                ends = np.array([offsets[i][1] for i in valid], dtype=np.int64)
+                wanted = np.isin(self._room_ids, np.array(list(room_ids), dtype=np.int64))
+                # (rooms, ranges) matrix of occupied nights inside each range
+                occupied = self._busy_prefix[:, ends] - self._busy_prefix[:, starts]
+                free = (occupied == 0) & wanted[:, None]
+                for column, i in enumerate(valid):
+                    results[i] = [int(room_id) for room_id in self._room_ids[free[:, column]]]
+        return results
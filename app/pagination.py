@@ -0,0 +1,99 @@
+# app/pagination.py
+from collections import OrderedDict
+import base64
+import json
+import threading
+from sqlalchemy.sql.util import find_tables
+from app.extensions import db
+from app.table_versions import read_versions
+
+COUNT_CACHE_SIZE = 256
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(key, direction):
+    payload = json.dumps({'k': key, 'd': direction}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload['d'] not in ('next', 'prev'):
+            raise ValueError(payload['d'])
+        return payload['k'], payload['d']
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f"Malformed pagination cursor: {token!r}") from e
+
+
+def keyset_paginate(query, key_column, per_page, cursor=None, descending=False):
+    """Seek-based pagination on a unique, indexed column, returning opaque next/prev cursors.
+
+    Each page costs one LIMIT query no matter how deep it is, unlike OFFSET paging.
+    """
+    key, direction = decode_cursor(cursor) if cursor else (None, 'next')
+    # Walking backwards means reading the opposite order and flipping the page afterwards
+    forward = direction == 'next'
+    ascending = forward != descending
+    query = query.order_by(None).order_by(key_column.asc() if ascending else key_column.desc())
+    if key is not None:
+        query = query.filter(key_column > key if ascending else key_column < key)
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not forward:
+        rows.reverse()
+
+    first_key = getattr(rows[0], key_column.key) if rows else None
+    last_key = getattr(rows[-1], key_column.key) if rows else None
+    if forward:
+        has_next, has_prev = has_more, key is not None
+    else:
+        has_next, has_prev = True, has_more
+    return {
+        'items': rows,
+        'next_cursor': encode_cursor(last_key, 'next') if rows and has_next else None,
+        'prev_cursor': encode_cursor(first_key, 'prev') if rows and has_prev else None
+    }
+
+
+class CountCache:
+    """Bounded LRU of COUNT(*) results for the on-demand cursor-mode totals.
+
+    Entries are keyed by database, compiled statement and the table_versions of every table
+    it reads, so a write from any worker makes the old entry unreachable; it ages out of the LRU.
+    """
+
+    def __init__(self, max_entries=COUNT_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._counts = OrderedDict()
+        self.max_entries = max_entries
+
+    def count(self, query):
+        statement = query.order_by(None).statement
+        tables = sorted({table.name for table in find_tables(statement, include_joins=True)})
+        key = (str(db.engine.url),
+               str(statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True})),
+               tuple(read_versions(tables)))
+        with self._lock:
+            if key in self._counts:
+                self._counts.move_to_end(key)
+                return self._counts[key]
+        total = query.order_by(None).count()
+        with self._lock:
+            self._counts[key] = total
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return total
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+count_cache = CountCache()
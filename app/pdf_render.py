@@ -0,0 +1,79 @@
+# app/pdf_render.py
+import glob
+import os
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+# Runs in the spawned render workers: keep this module to the standard library and reportlab,
+# with no imports from the rest of the app
+
+
+def _draw_rows(pdf, x, y, rows):
+    for label, value in rows:
+        pdf.setFont('Helvetica-Bold', 10)
+        pdf.drawString(x, y, label)
+        pdf.setFont('Helvetica', 10)
+        pdf.drawString(x + 45 * mm, y, str(value))
+        y -= 7 * mm
+    return y
+
+
+def render_document(kind, data, path):
+    """Write one PDF to path; runs in a worker process, so it only touches its arguments and the disk.
+
+    The file is written under a temporary name and moved into place, so readers never see a
+    partial PDF, and older versions of the same booking's document are removed afterwards.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    width, height = A4
+    title = 'Booking Confirmation' if kind == 'confirmation' else 'Invoice'
+
+    pdf = canvas.Canvas(temp_path, pagesize=A4)
+    pdf.setTitle(f"{title} {data['booking_reference']}")
+    pdf.setAuthor(data['hotel_name'])
+    pdf.setFont('Helvetica-Bold', 20)
+    pdf.drawString(20 * mm, height - 25 * mm, data['hotel_name'])
+    pdf.setFont('Helvetica', 14)
+    pdf.drawString(20 * mm, height - 35 * mm, title)
+    pdf.line(20 * mm, height - 39 * mm, width - 20 * mm, height - 39 * mm)
+
+    rows = [
+        ('Invoice number' if kind == 'invoice' else 'Booking reference',
+         f"INV-{data['booking_reference']}" if kind == 'invoice' else data['booking_reference']),
+        # Invoices are dated at check-out so the page depends only on data and its fingerprint
+        ('Issued', data['check_out_date'] if kind == 'invoice' else data['created_at']),
+        ('Guest', data['guest_full_name']),
+        ('Email', data['guest_email']),
+        ('Phone', data['guest_phone']),
+        ('Room', f"{data['room_number']} ({data['room_type']})"),
+        ('Check-in', data['check_in_date']),
+        ('Check-out', data['check_out_date']),
+        ('Nights', data['nights']),
+        ('Status', data['status']),
+    ]
+    y = _draw_rows(pdf, 20 * mm, height - 50 * mm, rows)
+
+    if kind == 'invoice':
+        y -= 5 * mm
+        pdf.line(20 * mm, y + 4 * mm, width - 20 * mm, y + 4 * mm)
+        y = _draw_rows(pdf, 20 * mm, y - 3 * mm, [
+            ('Rate per night', f"{data['currency']} {data['room_price']:.2f}"),
+            ('Total', f"{data['currency']} {data['total']:.2f}"),
+            ('Payment status', data['payment_status']),
+        ])
+    else:
+        pdf.setFont('Helvetica', 10)
+        pdf.drawString(20 * mm, y - 5 * mm, 'Please present this confirmation at the front desk on arrival.')
+    pdf.showPage()
+    pdf.save()
+    os.replace(temp_path, path)
+
+    for stale in glob.glob(os.path.join(os.path.dirname(path), f"{data['id']}-*.pdf")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return path
@@ -0,0 +1,123 @@
+# app/priorities.py
+from datetime import date, timedelta
+import logging
+import threading
+import time
+from flask import current_app
+from sqlalchemy import and_, case, func, or_
+from app.extensions import db
+from app.models import Booking
+from app.availability import ACTIVE_STATUSES
+from app.signals import bookings_committed
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('check_ins_today', 'check_outs_today', 'overdue_payments', 'recent_bookings', 'upcoming_checkins',
+           'total_bookings_today')
+
+
+def _conditions(today):
+    seven_days_ago = today - timedelta(days=7)
+    seven_days_later = today + timedelta(days=7)
+    return {
+        'check_ins_today': and_(Booking.check_in_date == today, Booking.status == 'booked'),
+        'check_outs_today': and_(Booking.check_out_date == today, Booking.status == 'checked-in'),
+        'overdue_payments': and_(Booking.payment_status == 'pending', Booking.check_in_date <= today,
+                                 Booking.status.in_(ACTIVE_STATUSES)),
+        'recent_bookings': Booking.created_at >= seven_days_ago,
+        'upcoming_checkins': and_(Booking.check_in_date.between(today, seven_days_later),
+                                  Booking.status == 'booked'),
+        'total_bookings_today': and_(Booking.check_in_date <= today, Booking.check_out_date >= today,
+                                     Booking.status.in_(ACTIVE_STATUSES)),
+    }
+
+
+def matches(booking, today):
+    """Python mirror of _conditions() for one booking snapshot; must stay in step with it."""
+    seven_days_ago = today - timedelta(days=7)
+    seven_days_later = today + timedelta(days=7)
+    active = booking.status in ACTIVE_STATUSES
+    return {
+        'check_ins_today': booking.check_in_date == today and booking.status == 'booked',
+        'check_outs_today': booking.check_out_date == today and booking.status == 'checked-in',
+        'overdue_payments': booking.payment_status == 'pending' and booking.check_in_date <= today and active,
+        'recent_bookings': booking.created_at is not None and booking.created_at >= seven_days_ago,
+        'upcoming_checkins': today <= booking.check_in_date <= seven_days_later and booking.status == 'booked',
+        'total_bookings_today': booking.check_in_date <= today <= booking.check_out_date and active,
+    }
+
+
+def priorities_query(today):
+    conditions = _conditions(today)
+    return db.session.query(*[
+        func.coalesce(func.sum(case((conditions[name], 1), else_=0)), 0).label(name) for name in METRICS
+    ]).filter(
+        or_(Booking.status.in_(ACTIVE_STATUSES), Booking.created_at >= today - timedelta(days=7))
+    )
+
+
+def compute_priorities(today=None):
+    """All six priority counts in one conditional-aggregation pass over bookings."""
+    row = priorities_query(today or date.today()).one()
+    return {name: int(getattr(row, name)) for name in METRICS}
+
+
+class PriorityCounters:
+    """Process-local priority counts kept current from committed booking changes.
+
+    Counts are recomputed from the database when the date rolls over and every
+    PRIORITIES_RESYNC_SECONDS, which also picks up writes made by other workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = None
+        self._day = None
+        self._synced_at = 0.0
+
+    def get(self, resync_seconds):
+        today = date.today()
+        with self._lock:
+            fresh = (self._counts is not None and self._day == today
+                     and time.monotonic() - self._synced_at < resync_seconds)
+            if fresh:
+                return dict(self._counts)
+        counts = compute_priorities(today)
+        with self._lock:
+            self._counts, self._day, self._synced_at = counts, today, time.monotonic()
+        return dict(counts)
+
+    def apply(self, changes):
+        with self._lock:
+            if self._counts is None:
+                return
+            today = self._day
+            for change in changes:
+                if change.previous is not None:
+                    for name, hit in matches(change.previous, today).items():
+                        self._counts[name] -= hit
+                if not change.deleted:
+                    for name, hit in matches(change, today).items():
+                        self._counts[name] += hit
+
+    def reset(self):
+        with self._lock:
+            self._counts = None
+
+
+def current_priorities(app=None):
+    app = app or current_app
+    if not app.config.get('PRIORITIES_COUNTER_CACHE'):
+        return compute_priorities()
+    return app.extensions['priority_counters'].get(app.config.get('PRIORITIES_RESYNC_SECONDS', 300))
+
+
+def _on_bookings_committed(app, changes):
+    counters = app.extensions.get('priority_counters')
+    if counters is not None:
+        counters.apply(changes)
+
+
+def init_priorities(app):
+    app.extensions['priority_counters'] = PriorityCounters()
+    bookings_committed.connect(_on_bookings_committed)
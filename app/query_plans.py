@@ -0,0 +1,86 @@
+# app/query_plans.py
+from datetime import date, timedelta
+import click
+from sqlalchemy import text
+from app.extensions import db
+from app.models import Booking
+from app.availability import ACTIVE_STATUSES
+from app.priorities import priorities_query
+from app.reference_search import gram_filter, reference_filter, reference_grams
+
+
+def hot_queries():
+    """The booking queries that run on every search or dashboard poll, keyed by name."""
+    today = date.today()
+    check_out = today + timedelta(days=3)
+    return {
+        'overlap_check': Booking.query.filter(
+            Booking.room_id == 1,
+            Booking.status.in_(ACTIVE_STATUSES),
+            Booking.check_in_date < check_out,
+            Booking.check_out_date > today
+        ),
+        'booked_rooms': db.session.query(Booking.room_id).filter(
+            Booking.status.in_(ACTIVE_STATUSES),
+            Booking.check_in_date < check_out,
+            Booking.check_out_date > today
+        ).distinct(),
+        'priorities': priorities_query(today),
+        'upcoming_checkins': Booking.query.filter(
+            Booking.check_in_date.between(today, today + timedelta(days=7)),
+            Booking.status == 'booked'
+        ),
+        'bookings_by_guest': Booking.query.filter(Booking.guest_id == 1),
+        'dashboard_by_status': Booking.query.filter(Booking.status == 'booked').order_by(Booking.id.desc()).limit(10),
+        'reference_prefix': Booking.query.filter(reference_filter('PL0001')).order_by(Booking.id.desc()).limit(10),
+        # The gram path itself: reference_filter only takes it when some gram is selective
+        'reference_substring': Booking.query.filter(
+            gram_filter('0001', sorted(reference_grams('0001')))
+        ).order_by(Booking.id.desc()).limit(10),
+    }
+
+
+def explain(query):
+    """Return the SQLite EXPLAIN QUERY PLAN detail lines for an ORM query."""
+    compiled = query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return [row[-1] for row in rows]
+
+
+# Plan lines that only describe how SEARCH steps are combined, sorted or de-duplicated
+ALLOWED_PLAN_LINES = (
+    'MULTI-INDEX OR', 'INDEX ', 'USE TEMP B-TREE FOR ', 'LIST SUBQUERY ', 'SCALAR SUBQUERY ',
+    'CORRELATED ', 'COMPOUND QUERY', 'LEFT-MOST SUBQUERY', 'INTERSECT USING TEMP B-TREE',
+    'UNION USING TEMP B-TREE', 'UNION ALL', 'EXCEPT USING TEMP B-TREE',
+)
+
+
+def full_scans(plan):
+    """Plan lines that are neither an index SEARCH nor in ALLOWED_PLAN_LINES.
+
+    Any SCAN fails, including 'SCAN bookings USING INDEX ...', which still reads every
+    entry of the index.
+    """
+    return [line for line in plan if not line.startswith('SEARCH ') and not line.startswith(ALLOWED_PLAN_LINES)]
+
+
+def check_hot_query_plans():
+    results = {}
+    for name, query in hot_queries().items():
+        plan = explain(query)
+        results[name] = (plan, full_scans(plan))
+    return results
+
+
+def register_commands(app):
+    @app.cli.command('check-query-plans')
+    def check_query_plans_command():
+        """Fail if any hot booking query plan does anything but index searches."""
+        failed = False
+        for name, (plan, scans) in check_hot_query_plans().items():
+            click.echo(f"{'FAIL' if scans else 'ok  '} {name}")
+            for line in plan:
+                click.echo(f"       {line}")
+            failed = failed or bool(scans)
+        if failed:
+            raise SystemExit(1)
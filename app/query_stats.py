@@ -0,0 +1,98 @@
+# app/query_stats.py
+import threading
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from app.extensions import db
+from app.slow_queries import slow_query_log
+
+SLOWEST_STATEMENT_CHARS = 500
+
+
+class QueryStats:
+    """Per-endpoint totals of SQL statements and database time, fed once per request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, count, db_time, slowest):
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'max_queries': 0, 'db_time_ms': 0.0, 'slowest_ms': 0.0,
+                'slowest_statement': None
+            })
+            stats['requests'] += 1
+            stats['queries'] += count
+            stats['max_queries'] = max(stats['max_queries'], count)
+            stats['db_time_ms'] += db_time * 1000
+            if slowest and slowest[0] * 1000 > stats['slowest_ms']:
+                stats['slowest_ms'] = slowest[0] * 1000
+                stats['slowest_statement'] = slowest[1][:SLOWEST_STATEMENT_CHARS]
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: dict(stats,
+                               avg_queries=round(stats['queries'] / stats['requests'], 2),
+                               avg_db_time_ms=round(stats['db_time_ms'] / stats['requests'], 3),
+                               db_time_ms=round(stats['db_time_ms'], 3),
+                               slowest_ms=round(stats['slowest_ms'], 3))
+                for endpoint, stats in self._endpoints.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+query_stats = QueryStats()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    in_request = has_request_context()
+    if elapsed * 1000 >= slow_query_log.threshold_ms:
+        slow_query_log.observe(conn.engine, statement, parameters, elapsed * 1000,
+                               (request.endpoint or '<unmatched>') if in_request else '<no request>',
+                               executemany)
+    if not in_request:
+        return
+    g.query_count = g.get('query_count', 0) + 1
+    g.db_time = g.get('db_time', 0.0) + elapsed
+    slowest = g.get('slowest_query')
+    if slowest is None or elapsed > slowest[0]:
+        g.slowest_query = (elapsed, statement)
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+
+
+def _finish_request(response):
+    count = g.get('query_count', 0)
+    db_time = g.get('db_time', 0.0)
+    total = time.perf_counter() - g.get('request_started', time.perf_counter())
+    # 404s and 405s match no endpoint; a None key would break sorting the snapshot
+    query_stats.record(request.endpoint or '<unmatched>', count, db_time, g.get('slowest_query'))
+    response.headers['X-Query-Count'] = str(count)
+    response.headers['Server-Timing'] = (f'db;dur={db_time * 1000:.2f};desc="{count} queries", '
+                                         f'app;dur={max(total - db_time, 0) * 1000:.2f}')
+    return response
+
+
+def init_query_stats(app):
+    """Count statements and database time per request, and feed the slow-query log, via cursor events."""
+    slow_query_log.configure(app.config.get('SLOW_QUERY_THRESHOLD_MS', 100),
+                             app.config.get('SLOW_QUERY_EXPLAIN_INTERVAL', 300))
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
@@ -0,0 +1,102 @@
+# app/reference_search.py
+import re
+from sqlalchemy import delete, event, false, func, insert, intersect, select
+from app.extensions import db
+from app.guest_search import prefix_filter
+from app.models import Booking, BookingReferenceGram
+from app.references import PREFIX
+
+GRAM_SIZE = 3
+# Grams on more bookings than this (zero-padding runs like '000') are left out of the intersection
+MAX_GRAM_POSTINGS = 2000
+
+_SEPARATORS = re.compile(r'[\s\-_/.]')
+
+
+def normalize_reference_query(value):
+    """('PL', '1234') for ' pl-1234 ', ('', '1234') for '1234'; None when it cannot match any reference."""
+    text = _SEPARATORS.sub('', value or '').upper()
+    prefix = ''
+    if text.startswith(PREFIX):
+        prefix, text = PREFIX, text[len(PREFIX):]
+    if text and not text.isdigit():
+        return None
+    return prefix, text
+
+
+def canonical_reference(value):
+    """The stored form of a typed reference: 'pl 0000001-8' -> 'PL00000018'."""
+    normalized = normalize_reference_query(value)
+    return PREFIX + normalized[1] if normalized else None
+
+
+def reference_grams(reference):
+    digits = reference[len(PREFIX):] if reference.startswith(PREFIX) else reference
+    return {digits[i:i + GRAM_SIZE] for i in range(len(digits) - GRAM_SIZE + 1)}
+
+
+def selective_grams(grams, max_postings=MAX_GRAM_POSTINGS):
+    """The grams held by at most max_postings bookings, each counted over at most max_postings + 1 index entries."""
+    selective = []
+    for gram in sorted(grams):
+        postings = select(BookingReferenceGram.booking_id).where(BookingReferenceGram.gram == gram) \
+            .limit(max_postings + 1).subquery()
+        if db.session.execute(select(func.count()).select_from(postings)).scalar() <= max_postings:
+            selective.append(gram)
+    return selective
+
+
+def reference_filter(value, substring=True):
+    """Index-backed condition on Booking for a typed reference, or None when it filters nothing.
+
+    'PL…' input is a prefix range over the unique booking_reference index. Bare digits are
+    matched anywhere in the serial through booking_reference_grams when `substring` is on and
+    the input is at least one trigram long, otherwise as a prefix as well. Only selective
+    grams are intersected; when every gram is common, so are the matches, and the LIKE alone
+    stops early under the dashboard's ORDER BY id LIMIT.
+    """
+    normalized = normalize_reference_query(value)
+    if normalized is None:
+        return false()
+    prefix, digits = normalized
+    if not digits:
+        return None
+    if prefix or not substring or len(digits) < GRAM_SIZE:
+        return prefix_filter(Booking.booking_reference, PREFIX + digits)
+    grams = selective_grams(reference_grams(digits), MAX_GRAM_POSTINGS)
+    if not grams:
+        return Booking.booking_reference.like(f'%{digits}%')
+    return gram_filter(digits, grams)
+
+
+def gram_filter(digits, grams):
+    """Bookings holding every one of grams whose reference contains digits."""
+    postings = [select(BookingReferenceGram.booking_id).where(BookingReferenceGram.gram == gram) for gram in grams]
+    candidates = intersect(*postings) if len(postings) > 1 else postings[0]
+    # The grams can co-occur without being adjacent, so confirm on the handful of candidates
+    return Booking.id.in_(candidates) & Booking.booking_reference.like(f'%{digits}%')
+
+
+def _gram_rows(booking):
+    return [{'gram': gram, 'booking_id': booking.id} for gram in reference_grams(booking.booking_reference)]
+
+
+def _after_insert(mapper, connection, booking):
+    rows = _gram_rows(booking)
+    if rows:
+        connection.execute(insert(BookingReferenceGram), rows)
+
+
+def _after_delete(mapper, connection, booking):
+    connection.execute(delete(BookingReferenceGram).where(BookingReferenceGram.booking_id == booking.id))
+
+
+def init_reference_search():
+    """Keep booking_reference_grams in step with ORM inserts and deletes of bookings.
+
+    References never change once assigned, so updates need no listener.
+    """
+    if event.contains(Booking, 'after_insert', _after_insert):
+        return
+    event.listen(Booking, 'after_insert', _after_insert)
+    event.listen(Booking, 'after_delete', _after_delete)
@@ -0,0 +1,149 @@
+# app/references.py
+import re
+import threading
+from flask import current_app, has_app_context
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from app.models import Booking, ReferenceCounter
+
+PREFIX = 'PL'
+COUNTER_NAME = 'booking'
+SERIAL_DIGITS = 7
+MAX_SERIAL = 10 ** SERIAL_DIGITS - 1
+DEFAULT_BLOCK_SIZE = 50
+
+# PL + 5 random digits, issued before the counter existed
+LEGACY_REFERENCE = re.compile(r'^PL\d{5}$')
+# PL + 7-digit serial + Luhn check digit
+REFERENCE = re.compile(r'^PL\d{8}$')
+
+
+def luhn_check_digit(digits):
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        n = int(ch)
+        if i % 2 == 0:
+            n *= 2
+            if n > 9:
+                n -= 9
+        total += n
+    return str((10 - total % 10) % 10)
+
+
+def encode_reference(serial):
+    if not 0 < serial <= MAX_SERIAL:
+        raise ValueError(f"Booking reference serial {serial} is out of range")
+    digits = f"{serial:0{SERIAL_DIGITS}d}"
+    return f"{PREFIX}{digits}{luhn_check_digit(digits)}"
+
+
+def is_valid_booking_reference(reference):
+    """True for legacy PL00001-style references and check-digit-valid PL######## references."""
+    if not reference:
+        return False
+    if LEGACY_REFERENCE.match(reference):
+        return True
+    if REFERENCE.match(reference):
+        digits = reference[len(PREFIX):-1]
+        return luhn_check_digit(digits) == reference[-1]
+    return False
+
+
+class ReferenceAllocator:
+    """Hands out booking reference serials from blocks reserved in reference_counters.
+
+    A block is reserved inside the caller's transaction and only joins the shared
+    per-process pool once that transaction commits; if it rolls back the block is
+    dropped, so no two processes can ever be handed the same serial.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Committed blocks per database URL, so apps bound to different databases never share serials
+        self._blocks = {}
+
+    def _take_committed(self, database):
+        with self._lock:
+            blocks = self._blocks.get(database, [])
+            while blocks:
+                block = blocks[0]
+                if block[0] < block[1]:
+                    serial = block[0]
+                    block[0] += 1
+                    return serial
+                blocks.pop(0)
+        return None
+
+    def release(self, database, start, end):
+        """Make the unused rest of a committed block available to every thread."""
+        with self._lock:
+            self._blocks.setdefault(database, []).append([start, end])
+
+    def reserve(self, session, block_size):
+        connection = session.connection()
+        connection.execute(
+            update(ReferenceCounter)
+            .where(ReferenceCounter.name == COUNTER_NAME)
+            .values(next_value=ReferenceCounter.next_value + block_size)
+        )
+        end = connection.execute(
+            select(ReferenceCounter.next_value).where(ReferenceCounter.name == COUNTER_NAME)
+        ).scalar_one()
+        return end - block_size, end
+
+    def next_reference(self, session):
+        pending = session.info.setdefault('reference_blocks', [])
+        for block in pending:
+            if block[2] < block[3]:
+                serial = block[2]
+                block[2] += 1
+                return encode_reference(serial)
+        database = str(session.get_bind().url)
+        serial = self._take_committed(database)
+        if serial is None:
+            block_size = DEFAULT_BLOCK_SIZE
+            if has_app_context():
+                block_size = current_app.config.get('BOOKING_REFERENCE_BLOCK_SIZE', DEFAULT_BLOCK_SIZE)
+            start, end = self.reserve(session, block_size)
+            transaction = session.get_nested_transaction() or session.get_transaction()
+            pending.append([transaction, database, start + 1, end])
+            serial = start
+        return encode_reference(serial)
+
+
+allocator = ReferenceAllocator()
+
+
+def _within(transaction, ancestor):
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+def _before_flush(session, flush_context, instances):
+    for obj in session.new:
+        if isinstance(obj, Booking) and not obj.booking_reference:
+            obj.booking_reference = allocator.next_reference(session)
+
+
+def _after_commit(session):
+    for _, database, start, end in session.info.pop('reference_blocks', []):
+        if start < end:
+            allocator.release(database, start, end)
+
+
+def _after_soft_rollback(session, previous_transaction):
+    pending = session.info.get('reference_blocks')
+    if pending:
+        pending[:] = [block for block in pending if not _within(block[0], previous_transaction)]
+
+
+def init_references():
+    """Assign booking references from the block allocator when new bookings are flushed."""
+    if event.contains(Session, 'before_flush', _before_flush):
+        return
+    event.listen(Session, 'before_flush', _before_flush)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_soft_rollback', _after_soft_rollback)
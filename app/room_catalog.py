@@ -0,0 +1,90 @@
+# app/room_catalog.py
+from collections import namedtuple
+import logging
+import threading
+import time
+from flask import current_app
+from app.extensions import db
+from app.models import Room
+from app.signals import tables_committed
+from app.table_versions import read_version
+
+logger = logging.getLogger(__name__)
+
+VERSION_NAME = 'rooms'
+
+
+class CatalogRoom(namedtuple('CatalogRoom', ['id', 'room_number', 'room_type', 'price', 'status'])):
+    """Read-only copy of a Room row; exposes the same attributes and to_dict() as the model."""
+    __slots__ = ()
+
+    def to_dict(self):
+        return self._asdict()
+
+
+class RoomCatalog:
+    """Process-local copy of the rooms table, reloaded when the rooms version moves.
+
+    Room writes made through the ORM bump table_versions['rooms'] in the same transaction
+    and drop this process's copy on commit; other processes notice the new version on
+    their next check, at most every ROOM_CATALOG_CHECK_SECONDS.
+    """
+
+    def __init__(self, check_seconds):
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._rooms = ()
+        self._by_id = {}
+        self._version = None
+        self._checked_at = 0.0
+
+    def _current(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self.check_seconds:
+                return self._rooms, self._by_id
+        version = read_version(VERSION_NAME)
+        with self._lock:
+            if version == self._version:
+                self._checked_at = now
+                return self._rooms, self._by_id
+        rows = db.session.query(Room.id, Room.room_number, Room.room_type, Room.price, Room.status) \
+            .order_by(Room.id).all()
+        rooms = tuple(CatalogRoom(*row) for row in rows)
+        by_id = {room.id: room for room in rooms}
+        with self._lock:
+            self._rooms, self._by_id, self._version, self._checked_at = rooms, by_id, version, now
+        logger.debug("Room catalog loaded %s rooms at version %s", len(rooms), version)
+        return rooms, by_id
+
+    def rooms(self, room_type=None, min_price=None, max_price=None):
+        """Catalog rooms ordered by id, optionally filtered like the room search forms."""
+        rooms, _ = self._current()
+        return [room for room in rooms
+                if (not room_type or room.room_type == room_type)
+                and (min_price is None or room.price >= min_price)
+                and (max_price is None or room.price <= max_price)]
+
+    def get(self, room_id):
+        _, by_id = self._current()
+        return by_id.get(room_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+
+
+def get_room_catalog(app=None):
+    app = app or current_app
+    return app.extensions['room_catalog']
+
+
+def _on_tables_committed(app, names):
+    catalog = app.extensions.get('room_catalog')
+    if catalog is not None and VERSION_NAME in names:
+        catalog.invalidate()
+
+
+def init_room_catalog(app):
+    app.extensions['room_catalog'] = RoomCatalog(app.config.get('ROOM_CATALOG_CHECK_SECONDS', 1.0))
+    tables_committed.connect(_on_tables_committed)
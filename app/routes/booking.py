@@ -1,24 +1,30 @@
 from flask import Blueprint, jsonify, request
 from app.models import Booking, Room, Guest
 from app import db
-from sqlalchemy.exc import OperationalError
-from datetime import date, datetime
+from sqlalchemy.exc import IntegrityError, OperationalError
+from datetime import date, datetime, timedelta
 from app.routes.dashboard_routes import has_overlapping_booking, update_room_status
+from app.availability import find_available_rooms, find_available_rooms_for_ranges, parse_price_filters
+from app.database import lock_retry
+from app.idempotency import record_response, replay_response
+from app.availability_calendar import MAX_CALENDAR_DAYS, CALENDAR_CACHE_TTL, CALENDAR_HORIZON_DAYS, calendar_cache
 import logging
 import traceback
-import time
 
 booking_bp = Blueprint('booking', __name__)
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Upper bound on candidate check-in dates per flexible search
+MAX_FLEXIBLE_RANGES = 60
+# Longest stay a flexible search accepts
+MAX_FLEXIBLE_NIGHTS = 30
+
 
 @booking_bp.route('/create_booking', methods=['POST'])
 def create_booking():
     data = request.get_json()
-    logger.debug(f"create_booking received data: {data}")
+    logger.debug("create_booking received data: %s", data)
     full_name = data.get('full_name')
     email = data.get('email')
     phone = data.get('phone')
@@ -30,6 +36,11 @@ def create_booking():
     if not all([full_name, email, phone, room_id, check_in_date, check_out_date, request_id]):
         return jsonify({'error': 'Missing required fields, including request_id', 'code': 'MISSING_DATA'}), 400
 
+    replay = replay_response('create_booking', request_id)
+    if replay:
+        logger.info("Replaying stored response for request_id=%s", request_id)
+        return jsonify(replay[0]), replay[1]
+
     try:
         room_id = int(room_id)
         if room_id <= 0:
@@ -48,13 +59,7 @@ def create_booking():
     if not room:
         return jsonify({'error': 'Room not found', 'code': 'ROOM_NOT_FOUND'}), 404
 
-    existing_booking = Booking.query.filter_by(booking_reference=f"PL{request_id[-5:]}").first()
-    if existing_booking:
-        logger.warning(f"Duplicate booking request detected: request_id={request_id}")
-        return jsonify({'error': 'Duplicate booking request', 'code': 'DUPLICATE_REQUEST'}), 400
-
-    max_retries = 3
-    for attempt in range(max_retries):
+    for attempt in range(lock_retry.attempts):
         try:
             with db.session.begin_nested():
                 if has_overlapping_booking(room_id, check_in, check_out):
@@ -64,7 +69,7 @@ def create_booking():
                     guest = Guest(full_name=full_name, email=email, phone=phone)
                     db.session.add(guest)
                     db.session.flush()
-                    logger.debug(f"Created new guest: {email}")
+                    logger.debug("Created new guest: %s", email)
                 booking = Booking(
                     guest_id=guest.id,
                     room_id=room_id,
@@ -76,17 +81,24 @@ def create_booking():
                 db.session.add(booking)
                 db.session.flush()
                 booking_reference = booking.booking_reference
-                logger.debug(
-                    f"Created booking for guest: {email}, room_id: {room_id}, booking_reference: {booking_reference}")
+                logger.debug("Created booking for guest: %s, room_id: %s, booking_reference: %s",
+                             email, room_id, booking_reference)
                 update_room_status(room_id)
+                response = {'message': 'Booking created', 'booking_reference': booking_reference, 'code': 'SUCCESS'}
+                record_response('create_booking', request_id, response)
             db.session.commit()
-            return jsonify(
-                {'message': 'Booking created', 'booking_reference': booking_reference, 'code': 'SUCCESS'}), 200
+            return jsonify(response), 200
+        except IntegrityError as e:
+            db.session.rollback()
+            # A concurrent retry with the same request_id committed first; hand back its response
+            replay = replay_response('create_booking', request_id)
+            if replay:
+                return jsonify(replay[0]), replay[1]
+            logger.error(f"IntegrityError in create_booking: {str(e)}\n{traceback.format_exc()}")
+            return jsonify({'error': 'Database constraint violated', 'code': 'DB_CONSTRAINT'}), 400
         except OperationalError as e:
             db.session.rollback()
-            if "database is locked" in str(e) and attempt < max_retries - 1:
-                logger.warning(f"Database locked, retrying attempt {attempt + 1}/{max_retries}")
-                time.sleep(0.1 * (2 ** attempt))
+            if lock_retry.should_retry(e, attempt):
                 continue
             logger.error(f"OperationalError in create_booking: {str(e)}\n{traceback.format_exc()}")
             return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
@@ -102,7 +114,7 @@ def create_booking():
 def search_available_rooms():
     try:
         data = request.get_json()
-        logger.debug(f"search_available_rooms received data: {data}")
+        logger.debug("search_available_rooms received data: %s", data)
         check_in_date = datetime.strptime(data['check_in_date'], '%Y-%m-%d').date()
         check_out_date = datetime.strptime(data['check_out_date'], '%Y-%m-%d').date()
 
@@ -110,28 +122,20 @@ def search_available_rooms():
             return jsonify({'error': 'Check-in date must be today or in the future', 'code': 'INVALID_CHECK_IN'}), 400
         if check_out_date <= check_in_date:
             return jsonify({'error': 'Check-out date must be after check-in date', 'code': 'INVALID_CHECK_OUT'}), 400
+        try:
+            min_price, max_price = parse_price_filters(data)
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid price filter', 'code': 'INVALID_PRICE'}), 400
 
-        max_retries = 3
-        for attempt in range(max_retries):
+        for attempt in range(lock_retry.attempts):
             try:
                 with db.session.begin_nested():
-                    # Find rooms with overlapping bookings
-                    overlapping_bookings = Booking.query.filter(
-                        Booking.check_in_date < check_out_date,
-                        Booking.check_out_date > check_in_date,
-                        Booking.status.in_(['booked', 'checked-in'])
-                    ).with_entities(Booking.room_id).distinct().all()
-
-                    overlapping_room_ids = [booking.room_id for booking in overlapping_bookings]
-                    logger.debug(f"Overlapping room IDs: {overlapping_room_ids}")
-
-                    # Get all rooms that are not in overlapping bookings
-                    available_rooms = Room.query.filter(
-                        ~Room.id.in_(overlapping_room_ids)
-                    ).all()
-
-                    logger.debug(
-                        f"Available rooms: {[{'id': r.id, 'room_number': r.room_number} for r in available_rooms]}")
+                    available_rooms = find_available_rooms(check_in_date, check_out_date, data.get('room_type'),
+                                                           min_price, max_price)
+
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Available rooms: %s",
+                                     [{'id': r.id, 'room_number': r.room_number} for r in available_rooms])
                     room_list = [room.to_dict() for room in available_rooms]
                 db.session.commit()
                 return jsonify({
@@ -142,9 +146,7 @@ def search_available_rooms():
                 }), 200
             except OperationalError as e:
                 db.session.rollback()
-                if "database is locked" in str(e) and attempt < max_retries - 1:
-                    logger.warning(f"Database locked, retrying attempt {attempt + 1}/{max_retries}")
-                    time.sleep(0.1 * (2 ** attempt))
+                if lock_retry.should_retry(e, attempt):
                     continue
                 logger.error(f"OperationalError in search_rooms: {str(e)}\n{traceback.format_exc()}")
                 return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
@@ -154,5 +156,107 @@ def search_available_rooms():
                 return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
             finally:
                 db.session.remove()
+    except Exception as e:
+        logger.error("Unexpected error in search_rooms: %s\n%s", e, traceback.format_exc())
+        return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
+
+
+@booking_bp.route('/search_rooms/flexible', methods=['POST'])
+def search_flexible_dates():
+    """Free rooms for every check-in date in [check_in_from, check_in_to] with a fixed number of nights."""
+    try:
+        data = request.get_json()
+        logger.debug("search_flexible_dates received data: %s", data)
+        try:
+            check_in_from = datetime.strptime(data['check_in_from'], '%Y-%m-%d').date()
+            check_in_to = datetime.strptime(data['check_in_to'], '%Y-%m-%d').date()
+            nights = int(data['nights'])
+        except (KeyError, ValueError, TypeError):
+            return jsonify({'error': 'check_in_from, check_in_to and nights are required', 'code': 'INVALID_INPUT'}), 400
+
+        if check_in_from < date.today():
+            return jsonify({'error': 'Check-in date must be today or in the future', 'code': 'INVALID_CHECK_IN'}), 400
+        if check_in_to < check_in_from or nights < 1:
+            return jsonify({'error': 'Invalid date range or number of nights', 'code': 'INVALID_RANGE'}), 400
+        if nights > MAX_FLEXIBLE_NIGHTS:
+            return jsonify({'error': f'At most {MAX_FLEXIBLE_NIGHTS} nights per flexible search',
+                            'code': 'INVALID_RANGE'}), 400
+        candidates = (check_in_to - check_in_from).days + 1
+        if candidates > MAX_FLEXIBLE_RANGES:
+            return jsonify({'error': f'At most {MAX_FLEXIBLE_RANGES} check-in dates per search',
+                            'code': 'INVALID_RANGE'}), 400
+        try:
+            min_price, max_price = parse_price_filters(data)
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid price filter', 'code': 'INVALID_PRICE'}), 400
+
+        try:
+            ranges = [(check_in_from + timedelta(days=i), check_in_from + timedelta(days=i + nights))
+                      for i in range(candidates)]
+        except OverflowError:
+            return jsonify({'error': 'Invalid date range or number of nights', 'code': 'INVALID_RANGE'}), 400
+        for attempt in range(lock_retry.attempts):
+            try:
+                results = find_available_rooms_for_ranges(ranges, data.get('room_type'), min_price, max_price)
+                rooms = {}
+                options = []
+                for (check_in, check_out), available_rooms in zip(ranges, results):
+                    for room in available_rooms:
+                        rooms.setdefault(room.id, room.to_dict())
+                    options.append({
+                        'check_in_date': check_in.isoformat(),
+                        'check_out_date': check_out.isoformat(),
+                        'available_count': len(available_rooms),
+                        'room_ids': [room.id for room in available_rooms]
+                    })
+                db.session.commit()
+                return jsonify({'options': options, 'rooms': list(rooms.values()), 'code': 'SUCCESS'}), 200
+            except OperationalError as e:
+                db.session.rollback()
+                if lock_retry.should_retry(e, attempt):
+                    continue
+                logger.error("OperationalError in search_flexible_dates: %s\n%s", e, traceback.format_exc())
+                return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
+            except Exception as e:
+                db.session.rollback()
+                logger.error("Unexpected error in search_flexible_dates: %s\n%s", e, traceback.format_exc())
+                return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
+            finally:
+                db.session.remove()
+    except Exception as e:
+        logger.error("Unexpected error in search_flexible_dates: %s\n%s", e, traceback.format_exc())
+        return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
+
+
+@booking_bp.route('/availability/calendar', methods=['GET'])
+def availability_calendar():
+    """Per-day free room counts and lowest price for each room type, e.g. ?start=2025-07-01&days=31."""
+    try:
+        start = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if request.args.get('start') \
+            else date.today()
+        days = int(request.args.get('days', 31))
+    except ValueError:
+        return jsonify({'error': 'start must be YYYY-MM-DD and days an integer', 'code': 'INVALID_INPUT'}), 400
+    if start < date.today():
+        start = date.today()
+    if start > date.today() + timedelta(days=CALENDAR_HORIZON_DAYS):
+        return jsonify({'error': f'start must be within {CALENDAR_HORIZON_DAYS} days of today',
+                        'code': 'INVALID_RANGE'}), 400
+    if not 1 <= days <= MAX_CALENDAR_DAYS:
+        return jsonify({'error': f'days must be between 1 and {MAX_CALENDAR_DAYS}', 'code': 'INVALID_RANGE'}), 400
+
+    try:
+        calendar = calendar_cache.get(start, days)
+        response = jsonify({'start': start.isoformat(), 'days': days, 'calendar': calendar, 'code': 'SUCCESS'})
+        response.headers['Cache-Control'] = f'public, max-age={CALENDAR_CACHE_TTL}'
+        return response, 200
+    except OperationalError as e:
+        db.session.rollback()
+        logger.error("OperationalError in availability_calendar: %s\n%s", e, traceback.format_exc())
+        return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Unexpected error in availability_calendar: %s\n%s", e, traceback.format_exc())
+        return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
     finally:
-        print()
+        db.session.remove()
@@ -1,16 +1,32 @@
-from flask import Blueprint, jsonify, request, session, redirect, render_template, url_for
+from flask import (Blueprint, Response, current_app, jsonify, request, session, redirect, render_template,
+                   send_file, stream_with_context, url_for)
 from app import db
 from app.models import Booking, Room, Guest, Receptionist
+from app.availability import find_available_rooms, parse_price_filters
+from app.database import lock_retry
+from app.documents import DOCUMENT_KINDS, booking_document_data, document_renderer
+from app.etags import conditional_get
+from app.exports import EXPORT_FORMATS, export_filename, stream_bookings_csv, stream_bookings_xlsx
+from app.events import broker, format_event
+from app.idempotency import record_response, replay_response
+from app.pagination import InvalidCursor, count_cache, keyset_paginate
+from app.priorities import current_priorities
+from app.query_stats import query_stats
+from app.reference_search import canonical_reference, reference_filter
+from app.guest_search import MAX_SEARCH_LIMIT, SEARCH_FIELDS, SEARCH_LIMIT, search_guests
+from app.slow_queries import slow_query_log
+from app.transitions import run_transitions
+from app.serializers import (GUEST_PAGE_SIZE, MAX_GUEST_PAGE_SIZE, booking_list_query, booking_row_to_dict,
+                             guest_directory_query, guest_row_to_dict, parse_guest_fields, serialize_booking,
+                             serialize_bookings, stream_guests_ndjson)
 from sqlalchemy.exc import IntegrityError, OperationalError
 import logging
+import queue
 import traceback
 from datetime import date, datetime, timedelta
-import time
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
@@ -23,15 +39,15 @@ def has_overlapping_booking(room_id, check_in, check_out, exclude_booking_id=Non
     )
     if exclude_booking_id:
         query = query.filter(Booking.id != exclude_booking_id)
-    logger.debug(
-        f"Checking overlapping booking for room_id: {room_id}, check_in: {check_in}, check_out: {check_out}, exclude_booking_id: {exclude_booking_id}")
+    logger.debug("Checking overlapping booking for room_id: %s, check_in: %s, check_out: %s, exclude_booking_id: %s",
+                 room_id, check_in, check_out, exclude_booking_id)
     return query.first()
 
 
 def update_room_status(room_id):
     room = db.session.get(Room, room_id)
     if not room:
-        logger.debug(f"Room not found for room_id: {room_id}")
+        logger.debug("Room not found for room_id: %s", room_id)
         return
     active_bookings = Booking.query.filter(
         Booking.room_id == room_id,
@@ -40,10 +56,10 @@ def update_room_status(room_id):
     ).first()
     new_status = 'available' if not active_bookings else 'booked'
     if room.status != new_status:
-        logger.debug(f"Updating room_id: {room_id} status from {room.status} to {new_status}")
+        logger.debug("Updating room_id: %s status from %s to %s", room_id, room.status, new_status)
         room.status = new_status
     else:
-        logger.debug(f"No status change needed for room_id: {room_id}, current status: {room.status}")
+        logger.debug("No status change needed for room_id: %s, current status: %s", room_id, room.status)
 
 
 def custom_paginate(query, page, per_page):
@@ -65,10 +81,12 @@ def search_rooms():
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
     data = request.get_json()
-    logger.debug(f"search_rooms received data: {data}")
+    logger.debug("search_rooms received data: %s", data)
     check_in_date = data.get('check_in_date')
     check_out_date = data.get('check_out_date')
     room_type = data.get('room_type')
+    if room_type not in ['Single', 'Double', 'Suite']:
+        room_type = None
 
     try:
         check_in = datetime.strptime(check_in_date, '%Y-%m-%d').date()
@@ -79,25 +97,21 @@ def search_rooms():
             return jsonify({'error': 'Check-out date must be after check-in date', 'code': 'INVALID_CHECK_OUT'}), 400
     except (ValueError, TypeError):
         return jsonify({'error': 'Invalid date format (use YYYY-MM-DD)', 'code': 'INVALID_DATE_FORMAT'}), 400
+    try:
+        min_price, max_price = parse_price_filters(data)
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid price filter', 'code': 'INVALID_PRICE'}), 400
 
     try:
-        query = Room.query
-        if room_type and room_type in ['Single', 'Double', 'Suite']:
-            query = query.filter(Room.room_type == room_type)
-        all_rooms = query.all()
-
-        available_rooms = []
-        for room in all_rooms:
-            if not has_overlapping_booking(room.id, check_in, check_out):
-                available_rooms.append({
-                    'id': room.id,
-                    'room_number': room.room_number,
-                    'room_type': room.room_type,
-                    'price': float(room.price),
-                    'status': room.status
-                })
-
-        logger.debug(f"Found {len(available_rooms)} available rooms")
+        available_rooms = [{
+            'id': room.id,
+            'room_number': room.room_number,
+            'room_type': room.room_type,
+            'price': float(room.price),
+            'status': room.status
+        } for room in find_available_rooms(check_in, check_out, room_type, min_price, max_price)]
+
+        logger.debug("Found %s available rooms", len(available_rooms))
         return jsonify(available_rooms), 200
     except IntegrityError as e:
         db.session.rollback()
@@ -118,7 +132,7 @@ def create_walkin_booking():
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
     data = request.get_json()
-    logger.debug(f"create_walkin_booking received data: {data}")
+    logger.debug("create_walkin_booking received data: %s", data)
     full_name = data.get('full_name')
     email = data.get('email')
     phone = data.get('phone')
@@ -128,6 +142,10 @@ def create_walkin_booking():
     request_id = data.get('request_id')
     if not all([full_name, email, phone, room_id, check_in_date, check_out_date, request_id]):
         return jsonify({'error': 'Missing required fields, including request_id', 'code': 'MISSING_DATA'}), 400
+    replay = replay_response('create_walkin_booking', request_id)
+    if replay:
+        logger.info("Replaying stored response for request_id=%s", request_id)
+        return jsonify(replay[0]), replay[1]
     try:
         room_id = int(room_id)
         if room_id <= 0:
@@ -144,12 +162,7 @@ def create_walkin_booking():
     room = db.session.get(Room, room_id)
     if not room:
         return jsonify({'error': 'Room not found', 'code': 'ROOM_NOT_FOUND'}), 404
-    existing_booking = Booking.query.filter_by(booking_reference=f"PL{request_id[-5:]}").first()
-    if existing_booking:
-        logger.warning(f"Duplicate booking request detected: request_id={request_id}")
-        return jsonify({'error': 'Duplicate booking request', 'code': 'DUPLICATE_REQUEST'}), 400
-    max_retries = 3
-    for attempt in range(max_retries):
+    for attempt in range(lock_retry.attempts):
         try:
             with db.session.begin_nested():
                 if has_overlapping_booking(room_id, check_in, check_out):
@@ -159,7 +172,7 @@ def create_walkin_booking():
                     guest = Guest(full_name=full_name, email=email, phone=phone)
                     db.session.add(guest)
                     db.session.flush()
-                    logger.debug(f"Created new guest: {email}")
+                    logger.debug("Created new guest: %s", email)
                 booking = Booking(
                     guest_id=guest.id,
                     room_id=room_id,
@@ -171,26 +184,29 @@ def create_walkin_booking():
                 db.session.add(booking)
                 db.session.flush()
                 booking_reference = booking.booking_reference
-                logger.debug(
-                    f"Created walk-in booking for guest: {email}, room_id: {room_id}, booking_reference: {booking_reference}")
+                logger.debug("Created walk-in booking for guest: %s, room_id: %s, booking_reference: %s",
+                             email, room_id, booking_reference)
                 update_room_status(room_id)
+                response = {
+                    'message': 'Booking created',
+                    'booking_reference': booking_reference,
+                    'booking': serialize_booking(booking.id),
+                    'code': 'SUCCESS'
+                }
+                record_response('create_walkin_booking', request_id, response)
             db.session.commit()
-            return jsonify({
-                'message': 'Booking created',
-                'booking_reference': booking_reference,
-                'booking': booking.to_dict(),
-                'code': 'SUCCESS'
-            }), 200
+            return jsonify(response), 200
         except OperationalError as e:
             db.session.rollback()
-            if "database is locked" in str(e) and attempt < max_retries - 1:
-                logger.warning(f"Database locked, retrying attempt {attempt + 1}/{max_retries}")
-                time.sleep(0.1 * (2 ** attempt))
+            if lock_retry.should_retry(e, attempt):
                 continue
             logger.error(f"OperationalError in create_walkin_booking: {str(e)}\n{traceback.format_exc()}")
             return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
         except IntegrityError as e:
             db.session.rollback()
+            replay = replay_response('create_walkin_booking', request_id)
+            if replay:
+                return jsonify(replay[0]), replay[1]
             logger.error(f"IntegrityError in create_walkin_booking: {str(e)}\n{traceback.format_exc()}")
             return jsonify({'error': 'Database constraint violated', 'code': 'DB_CONSTRAINT'}), 400
         except Exception as e:
@@ -200,51 +216,15 @@ def create_walkin_booking():
 
 
 @dashboard_bp.route('/receptionist/priorities', methods=['GET'])
+@conditional_get('bookings', daily=True)
 def get_priorities():
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
     logger.debug("Fetching priorities data")
     try:
-        today = date.today()
-        seven_days_ago = today - timedelta(days=7)
-        seven_days_later = today + timedelta(days=7)
-        check_ins_today = Booking.query.filter(
-            Booking.check_in_date == today,
-            Booking.status == 'booked'
-        ).count()
-        check_outs_today = Booking.query.filter(
-            Booking.check_out_date == today,
-            Booking.status == 'checked-in'
-        ).count()
-        overdue_payments = Booking.query.filter(
-            Booking.payment_status == 'pending',
-            Booking.check_in_date <= today,
-            Booking.status.in_(['booked', 'checked-in'])
-        ).count()
-        recent_bookings = Booking.query.filter(
-            Booking.created_at >= seven_days_ago
-        ).count()
-        upcoming_checkins = Booking.query.filter(
-            Booking.check_in_date.between(today, seven_days_later),
-            Booking.status == 'booked'
-        ).count()
-        total_bookings_today = Booking.query.filter(
-            Booking.check_in_date <= today,
-            Booking.check_out_date >= today,
-            Booking.status.in_(['booked', 'checked-in'])
-        ).count()
-        logger.debug(
-            f"Fetched priorities: check_ins={check_ins_today}, check_outs={check_outs_today}, "
-            f"overdue_payments={overdue_payments}, recent_bookings={recent_bookings}, "
-            f"upcoming_checkins={upcoming_checkins}, total_bookings_today={total_bookings_today}")
-        return jsonify({
-            'check_ins_today': check_ins_today,
-            'check_outs_today': check_outs_today,
-            'overdue_payments': overdue_payments,
-            'recent_bookings': recent_bookings,
-            'upcoming_checkins': upcoming_checkins,
-            'total_bookings_today': total_bookings_today
-        }), 200
+        priorities = current_priorities()
+        logger.debug("Fetched priorities: %s", priorities)
+        return jsonify(priorities), 200
     except IntegrityError as e:
         db.session.rollback()
         logger.error(f"IntegrityError in get_priorities: {str(e)}\n{traceback.format_exc()}")
@@ -284,9 +264,39 @@ def receptionist_dashboard():
                 Booking.check_in_date.between(date.today(), date.today() + timedelta(days=7)),
                 Booking.status == 'booked'
             )
-        bookings_paginated = custom_paginate(query, bookings_page, 10)
-        rooms_paginated = custom_paginate(Room.query.order_by(Room.id), rooms_page, 10)
-        bookings = [b.to_dict() for b in bookings_paginated['items']]
+        include_total = request.args.get('include_total', 0, type=int)
+        if 'bookings_cursor' in request.args:
+            bookings_paginated = keyset_paginate(booking_list_query(query), Booking.id, 10,
+                                                 request.args.get('bookings_cursor'), descending=True)
+            bookings_pagination = {
+                'next_cursor': bookings_paginated['next_cursor'],
+                'prev_cursor': bookings_paginated['prev_cursor']
+            }
+            if include_total:
+                bookings_pagination['total'] = count_cache.count(query)
+        else:
+            bookings_paginated = custom_paginate(booking_list_query(query), bookings_page, 10)
+            bookings_pagination = {
+                'page': bookings_paginated['page'],
+                'total': bookings_paginated['total'],
+                'pages': bookings_paginated['pages']
+            }
+        if 'rooms_cursor' in request.args:
+            rooms_paginated = keyset_paginate(Room.query, Room.id, 10, request.args.get('rooms_cursor'))
+            rooms_pagination = {
+                'next_cursor': rooms_paginated['next_cursor'],
+                'prev_cursor': rooms_paginated['prev_cursor']
+            }
+            if include_total:
+                rooms_pagination['total'] = count_cache.count(Room.query)
+        else:
+            rooms_paginated = custom_paginate(Room.query.order_by(Room.id), rooms_page, 10)
+            rooms_pagination = {
+                'page': rooms_paginated['page'],
+                'total': rooms_paginated['total'],
+                'pages': rooms_paginated['pages']
+            }
+        bookings = serialize_bookings(bookings_paginated['items'])
         rooms = [{
             'id': r.id,
             'room_number': r.room_number,
@@ -294,21 +304,15 @@ def receptionist_dashboard():
             'price': float(r.price),
             'status': r.status
         } for r in rooms_paginated['items']]
-        logger.debug(f"Dashboard data fetched: {len(bookings)} bookings, {len(rooms)} rooms")
+        logger.debug("Dashboard data fetched: %s bookings, %s rooms", len(bookings), len(rooms))
         return jsonify({
             'bookings': bookings,
             'rooms': rooms,
-            'bookings_pagination': {
-                'page': bookings_paginated['page'],
-                'total': bookings_paginated['total'],
-                'pages': bookings_paginated['pages']
-            },
-            'rooms_pagination': {
-                'page': rooms_paginated['page'],
-                'total': rooms_paginated['total'],
-                'pages': rooms_paginated['pages']
-            }
+            'bookings_pagination': bookings_pagination,
+            'rooms_pagination': rooms_pagination
         }), 200
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid pagination cursor', 'code': 'INVALID_CURSOR'}), 400
     except IntegrityError as e:
         db.session.rollback()
         logger.error(f"IntegrityError in receptionist_dashboard: {str(e)}\n{traceback.format_exc()}")
@@ -324,20 +328,42 @@ def receptionist_dashboard():
 
 
 @dashboard_bp.route('/receptionist/guests', methods=['GET'])
+@conditional_get('guests')
 def get_guests():
+    """Guest directory: full list, keyset pages (?cursor=&per_page=) or NDJSON (?format=ndjson).
+
+    ?fields=id,name,... limits each guest to the listed GUEST_FIELDS.
+    """
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
     logger.debug("Fetching guests data")
     try:
-        guests = Guest.query.all()
-        guests_data = [{
-            'id': g.id,
-            'name': g.full_name,
-            'email': g.email,
-            'phone': g.phone
-        } for g in guests]
-        logger.debug(f"Fetched {len(guests_data)} guests")
+        fields = parse_guest_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e), 'code': 'INVALID_FIELDS'}), 400
+    query = guest_directory_query(fields)
+
+    if request.args.get('format') == 'ndjson':
+        response = Response(stream_with_context(stream_guests_ndjson(query, fields)),
+                            mimetype='application/x-ndjson')
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+
+    try:
+        if 'cursor' in request.args:
+            per_page = min(max(request.args.get('per_page', GUEST_PAGE_SIZE, type=int), 1), MAX_GUEST_PAGE_SIZE)
+            guests_paginated = keyset_paginate(query, Guest.id, per_page, request.args.get('cursor') or None)
+            guests_data = [guest_row_to_dict(row, fields) for row in guests_paginated['items']]
+            logger.debug("Fetched %s guests", len(guests_data))
+            return jsonify({'guests': guests_data, 'pagination': {
+                'next_cursor': guests_paginated['next_cursor'],
+                'prev_cursor': guests_paginated['prev_cursor']
+            }}), 200
+        guests_data = [guest_row_to_dict(row, fields) for row in query.order_by(Guest.id)]
+        logger.debug("Fetched %s guests", len(guests_data))
         return jsonify({'guests': guests_data}), 200
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid pagination cursor', 'code': 'INVALID_CURSOR'}), 400
     except IntegrityError as e:
         db.session.rollback()
         logger.error(f"IntegrityError in get_guests: {str(e)}\n{traceback.format_exc()}")
@@ -352,17 +378,45 @@ def get_guests():
         return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
 
 
+@dashboard_bp.route('/receptionist/guests/search', methods=['GET'])
+def search_guests_route():
+    """Prefix search over guest name, email and phone: ?q=smi[&field=name|email|phone][&limit=20][&fields=...]."""
+    if session.get('role') != 'receptionist':
+        return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
+    query = (request.args.get('q') or '').strip()
+    field = request.args.get('field')
+    if field and field not in SEARCH_FIELDS:
+        return jsonify({'error': f"field must be one of {', '.join(SEARCH_FIELDS)}", 'code': 'INVALID_FIELD'}), 400
+    limit = min(max(request.args.get('limit', SEARCH_LIMIT, type=int), 1), MAX_SEARCH_LIMIT)
+    try:
+        fields = parse_guest_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e), 'code': 'INVALID_FIELDS'}), 400
+    logger.debug("Searching guests for %r (field=%s)", query, field)
+    try:
+        rows = search_guests(guest_directory_query(fields), query, field, limit)
+        return jsonify({'guests': [guest_row_to_dict(row, fields) for row in rows], 'code': 'SUCCESS'}), 200
+    except OperationalError as e:
+        db.session.rollback()
+        logger.error("OperationalError in search_guests: %s\n%s", e, traceback.format_exc())
+        return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Unexpected error in search_guests: %s\n%s", e, traceback.format_exc())
+        return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
+
+
 @dashboard_bp.route('/receptionist/booking/search/<string:reference>', methods=['GET'])
 def search_booking(reference):
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
-    logger.debug(f"Searching booking with reference: {reference}")
+    logger.debug("Searching booking with reference: %s", reference)
     try:
-        booking = Booking.query.filter_by(booking_reference=reference).first()
-        if not booking:
+        row = booking_list_query().filter(Booking.booking_reference == canonical_reference(reference)).first()
+        if not row:
             return jsonify({'error': 'Booking not found', 'code': 'BOOKING_NOT_FOUND'}), 404
-        logger.debug(f"Found booking: {booking.to_dict()}")
-        return jsonify({'booking': booking.to_dict()}), 200
+        logger.debug("Found booking: %s", row.id)
+        return jsonify({'booking': booking_row_to_dict(row)}), 200
     except IntegrityError as e:
         db.session.rollback()
         logger.error(f"IntegrityError in search_booking: {str(e)}\n{traceback.format_exc()}")
@@ -377,15 +431,61 @@ def search_booking(reference):
         return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
 
 
+@dashboard_bp.route('/receptionist/booking/<int:booking_id>/<string:kind>.pdf', methods=['GET'])
+def booking_document(booking_id, kind):
+    """PDF confirmation or invoice, rendered once per booking version by the worker pool and then served from disk."""
+    if session.get('role') != 'receptionist':
+        return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
+    if kind not in DOCUMENT_KINDS:
+        return jsonify({'error': f"Document must be one of {', '.join(DOCUMENT_KINDS)}", 'code': 'INVALID_DOCUMENT'}), 404
+    logger.debug("Fetching %s for booking %s", kind, booking_id)
+    try:
+        data = booking_document_data(booking_id, current_app.config)
+        if not data:
+            return jsonify({'error': 'Booking not found', 'code': 'BOOKING_NOT_FOUND'}), 404
+        path = document_renderer.get(kind, data, current_app.config.get('DOCUMENT_RENDER_WAIT_SECONDS', 5))
+        if path is None:
+            response = jsonify({'message': 'Document is being rendered', 'code': 'RENDERING'})
+            response.headers['Retry-After'] = '1'
+            return response, 202
+        return send_file(path, mimetype='application/pdf', conditional=True,
+                         download_name=f"{data['booking_reference']}-{kind}.pdf")
+    except OperationalError as e:
+        db.session.rollback()
+        logger.error("OperationalError in booking_document: %s\n%s", e, traceback.format_exc())
+        return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Unexpected error in booking_document: %s\n%s", e, traceback.format_exc())
+        return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
+
+
+@dashboard_bp.route('/receptionist/maintenance/transitions', methods=['POST'])
+def apply_booking_transitions():
+    """Run the daily no-show / auto-checkout / room status job now, even if it already ran today."""
+    if session.get('role') != 'receptionist':
+        return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
+    logger.debug("Running booking transitions on demand")
+    try:
+        result = run_transitions(force=True)
+        return jsonify({'result': result, 'code': 'SUCCESS'}), 200
+    except OperationalError as e:
+        logger.error("OperationalError in apply_booking_transitions: %s\n%s", e, traceback.format_exc())
+        return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
+    except Exception as e:
+        logger.error("Unexpected error in apply_booking_transitions: %s\n%s", e, traceback.format_exc())
+        return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
+
+
 @dashboard_bp.route('/receptionist/booking/update_payment', methods=['POST'])
 def update_payment_status():
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
     data = request.get_json()
-    logger.debug(f"update_payment_status received data: {data}")
+    logger.debug("update_payment_status received data: %s", data)
     booking_id = data.get('booking_id')
     new_payment_status = data.get('payment_status')
-    logger.debug(f"Processing booking_id: {booking_id}, payment_status: {new_payment_status}")
+    logger.debug("Processing booking_id: %s, payment_status: %s", booking_id, new_payment_status)
     if not booking_id or not isinstance(booking_id, int) or booking_id <= 0:
         return jsonify({'error': 'Invalid booking ID', 'code': 'INVALID_BOOKING_ID'}), 400
     if new_payment_status not in ['paid', 'pending']:
@@ -400,8 +500,8 @@ def update_payment_status():
         db.session.refresh(booking)
         booking.payment_status = new_payment_status
         db.session.commit()
-        logger.debug(f"Payment status updated for booking_id: {booking_id}")
-        return jsonify({'message': 'Payment status updated', 'booking': booking.to_dict()}), 200
+        logger.debug("Payment status updated for booking_id: %s", booking_id)
+        return jsonify({'message': 'Payment status updated', 'booking': serialize_booking(booking_id)}), 200
     except IntegrityError as e:
         db.session.rollback()
         logger.error(f"IntegrityError in update_payment_status: {str(e)}\n{traceback.format_exc()}")
@@ -421,7 +521,7 @@ def add_room():
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
     data = request.get_json()
-    logger.debug(f"add_room received data: {data}")
+    logger.debug("add_room received data: %s", data)
     room_number = data.get('room_number')
     room_type = data.get('room_type')
     price = data.get('price')
@@ -435,7 +535,7 @@ def add_room():
         new_room = Room(room_number=room_number, room_type=room_type, price=price, status='available')
         db.session.add(new_room)
         db.session.commit()
-        logger.debug(f"Added room: {room_number}")
+        logger.debug("Added room: %s", room_number)
         return jsonify({'message': 'Room added successfully', 'room': {
             'id': new_room.id,
             'room_number': new_room.room_number,
@@ -462,10 +562,10 @@ def update_booking_status():
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
     data = request.get_json()
-    logger.debug(f"update_booking_status received data: {data}")
+    logger.debug("update_booking_status received data: %s", data)
     booking_id = data.get('booking_id')
     new_status = data.get('status')
-    logger.debug(f"Processing booking_id: {booking_id}, status: {new_status}")
+    logger.debug("Processing booking_id: %s, status: %s", booking_id, new_status)
     if not booking_id or not isinstance(booking_id, int) or booking_id <= 0:
         return jsonify({'error': 'Invalid booking ID', 'code': 'INVALID_BOOKING_ID'}), 400
     if new_status not in ['checked-in', 'cancelled']:
@@ -486,8 +586,8 @@ def update_booking_status():
         if new_status == 'cancelled':
             update_room_status(booking.room_id)
         db.session.commit()
-        logger.debug(f"Status updated for booking_id: {booking_id}")
-        return jsonify({'message': 'Status updated', 'booking': booking.to_dict()}), 200
+        logger.debug("Status updated for booking_id: %s", booking_id)
+        return jsonify({'message': 'Status updated', 'booking': serialize_booking(booking_id)}), 200
     except IntegrityError as e:
         db.session.rollback()
         logger.error(f"IntegrityError in update_booking_status: {str(e)}\n{traceback.format_exc()}")
@@ -507,9 +607,9 @@ def checkout_guest():
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
     data = request.get_json()
-    logger.debug(f"checkout_guest received data: {data}")
+    logger.debug("checkout_guest received data: %s", data)
     booking_id = data.get('booking_id')
-    logger.debug(f"Processing booking_id: {booking_id}")
+    logger.debug("Processing booking_id: %s", booking_id)
     if not booking_id or not isinstance(booking_id, int) or booking_id <= 0:
         return jsonify({'error': 'Invalid booking ID', 'code': 'INVALID_BOOKING_ID'}), 400
     booking = db.session.get(Booking, booking_id)
@@ -524,8 +624,8 @@ def checkout_guest():
         booking.status = 'checked-out'
         update_room_status(booking.room_id)
         db.session.commit()
-        logger.debug(f"Checked out booking: {booking_id}")
-        return jsonify({'message': 'Guest checked out', 'booking': booking.to_dict()}), 200
+        logger.debug("Checked out booking: %s", booking_id)
+        return jsonify({'message': 'Guest checked out', 'booking': serialize_booking(booking_id)}), 200
     except IntegrityError as e:
         db.session.rollback()
         logger.error(f"IntegrityError in checkout_guest: {str(e)}\n{traceback.format_exc()}")
@@ -545,7 +645,7 @@ def manage_booking(booking_id):
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
     data = request.get_json()
-    logger.debug(f"manage_booking received data for booking_id {booking_id}: {data}")
+    logger.debug("manage_booking received data for booking_id %s: %s", booking_id, data)
     email = data.get('email')
     room_id = data.get('room_id')
     check_in_date = data.get('check_in_date')
@@ -599,11 +699,11 @@ def manage_booking(booking_id):
         if room_id and old_room_id != booking.room_id:
             update_room_status(old_room_id)
         db.session.commit()
-        logger.debug(f"Modified booking_id: {booking_id}")
+        logger.debug("Modified booking_id: %s", booking_id)
         return jsonify({
             'message': 'Booking modified',
             'booking_reference': booking.booking_reference,
-            'booking': booking.to_dict(),
+            'booking': serialize_booking(booking_id),
             'code': 'SUCCESS'
         }), 200
     except IntegrityError as e:
@@ -624,7 +724,7 @@ def manage_booking(booking_id):
 def delete_room(room_id):
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
-    logger.debug(f"Attempting to delete room_id: {room_id}")
+    logger.debug("Attempting to delete room_id: %s", room_id)
     room = db.session.get(Room, room_id)
     if not room:
         return jsonify({'error': 'Room not found', 'code': 'ROOM_NOT_FOUND'}), 404
@@ -639,7 +739,7 @@ def delete_room(room_id):
     try:
         db.session.delete(room)
         db.session.commit()
-        logger.debug(f"Deleted room_id: {room_id}")
+        logger.debug("Deleted room_id: %s", room_id)
         return jsonify({'message': 'Room deleted successfully', 'room_id': room_id}), 200
     except IntegrityError as e:
         db.session.rollback()
@@ -659,7 +759,7 @@ def delete_room(room_id):
 def delete_booking(booking_id):
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
-    logger.debug(f"Attempting to delete booking_id: {booking_id}")
+    logger.debug("Attempting to delete booking_id: %s", booking_id)
     if not booking_id or not isinstance(booking_id, int) or booking_id <= 0:
         return jsonify({'error': 'Invalid booking ID', 'code': 'INVALID_BOOKING_ID'}), 400
     booking = db.session.get(Booking, booking_id)
@@ -673,7 +773,7 @@ def delete_booking(booking_id):
         db.session.delete(booking)
         update_room_status(room_id)
         db.session.commit()
-        logger.debug(f"Deleted booking_id: {booking_id}")
+        logger.debug("Deleted booking_id: %s", booking_id)
         return jsonify({'message': 'Booking deleted successfully', 'booking_id': booking_id, 'code': 'SUCCESS'}), 200
     except IntegrityError as e:
         db.session.rollback()
@@ -689,47 +789,70 @@ def delete_booking(booking_id):
         return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
 
 
+def filtered_bookings_query(args):
+    """Booking query for the dashboard list filters (?status=, ?filter=, ?search_reference=), newest first."""
+    status_filter = args.get('status', 'all')
+    filter_type = args.get('filter', 'all')  # Maps to date_range
+    search_reference = args.get('search_reference', '')
+
+    query = Booking.query.order_by(Booking.id.desc())
+    if status_filter != 'all' and status_filter in ['booked', 'checked-in', 'checked-out', 'cancelled']:
+        query = query.filter(Booking.status == status_filter)
+    if filter_type == 'today':
+        query = query.filter(
+            Booking.check_in_date <= date.today(),
+            Booking.check_out_date >= date.today()
+        )
+    elif filter_type == 'week':
+        query = query.filter(Booking.created_at >= date.today() - timedelta(days=7))
+    elif filter_type == 'upcoming':
+        query = query.filter(
+            Booking.check_in_date.between(date.today(), date.today() + timedelta(days=7)),
+            Booking.status == 'booked'
+        )
+    if search_reference:
+        condition = reference_filter(search_reference,
+                                     current_app.config.get('BOOKING_REFERENCE_SUBSTRING_SEARCH', True))
+        if condition is not None:
+            query = query.filter(condition)
+    return query
+
+
 @dashboard_bp.route('/receptionist/bookings', methods=['GET'])
+@conditional_get('bookings', 'guests', 'rooms', daily=True)
 def get_bookings():
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
     logger.debug("Fetching bookings data")
     page = request.args.get('page', 1, type=int)
-    status_filter = request.args.get('status', 'all')
-    filter_type = request.args.get('filter', 'all')  # Maps to date_range
-    search_reference = request.args.get('search_reference', '')
 
     try:
-        query = Booking.query.order_by(Booking.id.desc())
-        if status_filter != 'all' and status_filter in ['booked', 'checked-in', 'checked-out', 'cancelled']:
-            query = query.filter(Booking.status == status_filter)
-        if filter_type == 'today':
-            query = query.filter(
-                Booking.check_in_date <= date.today(),
-                Booking.check_out_date >= date.today()
-            )
-        elif filter_type == 'week':
-            query = query.filter(Booking.created_at >= date.today() - timedelta(days=7))
-        elif filter_type == 'upcoming':
-            query = query.filter(
-                Booking.check_in_date.between(date.today(), date.today() + timedelta(days=7)),
-                Booking.status == 'booked'
-            )
-        if search_reference:
-            query = query.filter(Booking.booking_reference.ilike(f'%{search_reference}%'))
-
-        bookings_paginated = custom_paginate(query, page, 10)
-        bookings = [b.to_dict() for b in bookings_paginated['items']]
-
-        logger.debug(f"Fetched {len(bookings)} bookings")
-        return jsonify({
-            'bookings': bookings,
-            'pagination': {
+        query = filtered_bookings_query(request.args)
+        if 'cursor' in request.args:
+            bookings_paginated = keyset_paginate(booking_list_query(query), Booking.id, 10, request.args.get('cursor'),
+                                                 descending=True)
+            pagination = {
+                'next_cursor': bookings_paginated['next_cursor'],
+                'prev_cursor': bookings_paginated['prev_cursor']
+            }
+            if request.args.get('include_total', type=int):
+                pagination['total_items'] = count_cache.count(query)
+        else:
+            bookings_paginated = custom_paginate(booking_list_query(query), page, 10)
+            pagination = {
                 'current_page': bookings_paginated['page'],
                 'total_pages': bookings_paginated['pages'],
                 'total_items': bookings_paginated['total']
             }
+        bookings = serialize_bookings(bookings_paginated['items'])
+
+        logger.debug("Fetched %s bookings", len(bookings))
+        return jsonify({
+            'bookings': bookings,
+            'pagination': pagination
         }), 200
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid pagination cursor', 'code': 'INVALID_CURSOR'}), 400
     except IntegrityError as e:
         db.session.rollback()
         logger.error(f"IntegrityError in get_bookings: {str(e)}\n{traceback.format_exc()}")
@@ -744,7 +867,26 @@ def get_bookings():
         return jsonify({'error': f'Server error: {str(e)}', 'code': 'SERVER_ERROR'}), 500
 
 
+@dashboard_bp.route('/receptionist/bookings/export', methods=['GET'])
+def export_bookings():
+    """Stream every booking matching the dashboard filters as ?format=csv (default) or xlsx."""
+    if session.get('role') != 'receptionist':
+        return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(EXPORT_FORMATS)}", 'code': 'INVALID_FORMAT'}), 400
+    logger.debug("Exporting bookings as %s", export_format)
+    query = filtered_bookings_query(request.args)
+    stream = stream_bookings_csv(query) if export_format == 'csv' else stream_bookings_xlsx(query)
+    response = Response(stream_with_context(stream), mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename="{export_filename(export_format, date.today())}"'
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @dashboard_bp.route('/receptionist/rooms', methods=['GET'])
+@conditional_get('rooms')
 def get_rooms():
     if session.get('role') != 'receptionist':
         return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
@@ -752,7 +894,21 @@ def get_rooms():
     page = request.args.get('page', 1, type=int)
 
     try:
-        rooms_paginated = custom_paginate(Room.query.order_by(Room.id), page, 10)
+        if 'cursor' in request.args:
+            rooms_paginated = keyset_paginate(Room.query, Room.id, 10, request.args.get('cursor'))
+            pagination = {
+                'next_cursor': rooms_paginated['next_cursor'],
+                'prev_cursor': rooms_paginated['prev_cursor']
+            }
+            if request.args.get('include_total', type=int):
+                pagination['total_items'] = count_cache.count(Room.query)
+        else:
+            rooms_paginated = custom_paginate(Room.query.order_by(Room.id), page, 10)
+            pagination = {
+                'current_page': rooms_paginated['page'],
+                'total_pages': rooms_paginated['pages'],
+                'total_items': rooms_paginated['total']
+            }
         rooms = [{
             'id': r.id,
             'room_number': r.room_number,
@@ -761,15 +917,13 @@ def get_rooms():
             'status': r.status
         } for r in rooms_paginated['items']]
 
-        logger.debug(f"Fetched {len(rooms)} rooms")
+        logger.debug("Fetched %s rooms", len(rooms))
         return jsonify({
             'rooms': rooms,
-            'pagination': {
-                'current_page': rooms_paginated['page'],
-                'total_pages': rooms_paginated['pages'],
-                'total_items': rooms_paginated['total']
-            }
+            'pagination': pagination
         }), 200
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid pagination cursor', 'code': 'INVALID_CURSOR'}), 400
     except IntegrityError as e:
         db.session.rollback()
         logger.error(f"IntegrityError in get_rooms: {str(e)}\n{traceback.format_exc()}")
@@ -789,3 +943,51 @@ def receptionist_dashboard_html():
     if session.get('role') != 'receptionist':
         return redirect(url_for('dashboard.login'))
     return render_template('receptionist/receptionist_dashboard.html', today=date.today().isoformat())
+
+
+@dashboard_bp.route('/receptionist/events', methods=['GET'])
+def dashboard_events():
+    """Server-sent events stream of committed booking and room changes for open dashboards."""
+    if session.get('role') != 'receptionist':
+        return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    heartbeat = current_app.config.get('EVENTS_HEARTBEAT_SECONDS', 15)
+    # The stream can stay open for hours; don't pin a database connection to it
+    db.session.remove()
+
+    def stream():
+        # Subscribe on first iteration so a response that is never streamed leaves no queue behind
+        subscriber = broker.subscribe(last_event_id)
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    yield format_event(subscriber.get(timeout=heartbeat))
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+        finally:
+            broker.unsubscribe(subscriber)
+
+    response = Response(stream_with_context(stream()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@dashboard_bp.route('/receptionist/diagnostics/queries', methods=['GET'])
+def query_diagnostics():
+    """Per-endpoint SQL statement counts and database time since the process started."""
+    if session.get('role') != 'receptionist':
+        return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
+    return jsonify({'endpoints': query_stats.snapshot(), 'lock_retry': lock_retry.snapshot()}), 200
+
+
+@dashboard_bp.route('/receptionist/diagnostics/slow_queries', methods=['GET'])
+def slow_query_diagnostics():
+    """Statements over SLOW_QUERY_THRESHOLD_MS with their routes, last parameters and captured plans."""
+    if session.get('role') != 'receptionist':
+        return jsonify({'error': 'Unauthorized', 'code': 'UNAUTHORIZED'}), 401
+    return jsonify({
+        'threshold_ms': slow_query_log.threshold_ms,
+        'statements': slow_query_log.snapshot()
+    }), 200
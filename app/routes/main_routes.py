@@ -1,5 +1,6 @@
-from flask import Blueprint, render_template
+from flask import Blueprint, Response, render_template
 from datetime import datetime
+from app.metrics import render_metrics
 
 main = Blueprint('main', __name__)
 
@@ -18,3 +19,8 @@ def manage_booking():
 def booking():
     return render_template('guest/booking.html')
 
+
+@main.route('/metrics')
+def metrics():
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
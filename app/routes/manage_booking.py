@@ -3,28 +3,30 @@ from app.models import Booking, Room, Guest
 from app import db
 from datetime import date, datetime
 from app.routes.dashboard_routes import has_overlapping_booking, update_room_status
+from app.availability import find_available_rooms, parse_exclude_booking_id, parse_price_filters
+from app.database import lock_retry
+from app.references import is_valid_booking_reference
 import logging
 import traceback
-import time
 from sqlalchemy.exc import IntegrityError, OperationalError
 
 manage_booking_bp = Blueprint('manage_booking', __name__)
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 @manage_booking_bp.route('/manage_booking', methods=['POST'])
 def query_booking():
     data = request.get_json()
-    logger.debug(f"query_booking received data: {data}")
+    logger.debug("query_booking received data: %s", data)
     email = data.get('email')
     booking_reference = data.get('booking_reference')
 
     if not all([email, booking_reference]):
         return jsonify({'error': 'Email and booking reference are required', 'code': 'MISSING_DATA'}), 400
+    if not is_valid_booking_reference(booking_reference):
+        return jsonify({'error': 'Booking not found', 'code': 'BOOKING_NOT_FOUND'}), 404
 
-    max_retries = 3
-    for attempt in range(max_retries):
+    for attempt in range(lock_retry.attempts):
         try:
             with db.session.begin_nested():
                 booking = Booking.query.filter_by(booking_reference=booking_reference).first()
@@ -55,13 +57,11 @@ def query_booking():
                     'payment_status': booking.payment_status
                 }
             db.session.commit()
-            logger.debug(f"Found booking: {booking_reference}")
+            logger.debug("Found booking: %s", booking_reference)
             return jsonify({'message': 'Booking found', 'booking': booking_data, 'code': 'SUCCESS'}), 200
         except OperationalError as e:
             db.session.rollback()
-            if "database is locked" in str(e) and attempt < max_retries - 1:
-                logger.warning(f"Database locked, retrying attempt {attempt + 1}/{max_retries}")
-                time.sleep(0.1 * (2 ** attempt))
+            if lock_retry.should_retry(e, attempt):
                 continue
             logger.error(f"OperationalError in query_booking: {str(e)}\n{traceback.format_exc()}")
             return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
@@ -75,10 +75,9 @@ def query_booking():
 @manage_booking_bp.route('/available_rooms', methods=['POST'])
 def available_rooms():
     data = request.get_json()
-    logger.debug(f"available_rooms received data: {data}")
+    logger.debug("available_rooms received data: %s", data)
     check_in_date = data.get('check_in_date')
     check_out_date = data.get('check_out_date')
-    exclude_booking_id = data.get('exclude_booking_id')
     current_room_id = data.get('current_room_id')
     room_type = data.get('room_type')
 
@@ -94,30 +93,20 @@ def available_rooms():
             return jsonify({'error': 'Check-out date must be after check-in date', 'code': 'INVALID_CHECK_OUT'}), 400
     except ValueError:
         return jsonify({'error': 'Invalid date format (use YYYY-MM-DD)', 'code': 'INVALID_DATE_FORMAT'}), 400
+    try:
+        min_price, max_price = parse_price_filters(data)
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid price filter', 'code': 'INVALID_PRICE'}), 400
+    try:
+        exclude_booking_id = parse_exclude_booking_id(data)
+    except ValueError:
+        return jsonify({'error': 'exclude_booking_id must be an integer', 'code': 'INVALID_INPUT'}), 400
 
-    max_retries = 3
-    for attempt in range(max_retries):
+    for attempt in range(lock_retry.attempts):
         try:
             with db.session.begin_nested():
-                overlapping_bookings = Booking.query.filter(
-                    Booking.check_in_date <= check_out,
-                    Booking.check_out_date >= check_in,
-                    Booking.status.in_(['booked', 'checked-in'])
-                )
-                if exclude_booking_id:
-                    overlapping_bookings = overlapping_bookings.filter(Booking.id != exclude_booking_id)
-                overlapping_room_ids = [booking.room_id for booking in
-                                        overlapping_bookings.with_entities(Booking.room_id).distinct().all()]
-                logger.debug(f"Overlapping room IDs: {overlapping_room_ids}")
-
-                query = Room.query.filter(
-                    ~Room.id.in_(overlapping_room_ids),
-                    Room.status == 'available'
-                )
-                if room_type:
-                    query = query.filter(Room.room_type == room_type)
-                available_rooms = query.all()
-
+                available_rooms = find_available_rooms(check_in, check_out, room_type, min_price, max_price,
+                                                       exclude_booking_id)
                 room_list = [{
                     'id': room.id,
                     'room_number': room.room_number,
@@ -126,22 +115,12 @@ def available_rooms():
                     'status': room.status,
                     'is_current': room.id == current_room_id
                 } for room in available_rooms]
-
-                if current_room_id and not any(room['id'] == current_room_id for room in room_list):
-                    current_room = Room.query.get(current_room_id)
-                    if current_room and current_room.id not in overlapping_room_ids and current_room.room_type == room_type:
-                        room_list.insert(0, {
-                            'id': current_room.id,
-                            'room_number': current_room.room_number,
-                            'room_type': current_room.room_type,
-                            'price': current_room.price,
-                            'status': current_room.status,
-                            'is_current': True
-                        })
-                        logger.debug(f"Added current room {current_room.room_number} to available rooms")
+                # Keep the guest's current room at the top of the list, as the modify form expects
+                room_list.sort(key=lambda room: not room['is_current'])
 
             db.session.commit()
-            logger.debug(f"Available rooms: {[room['room_number'] for room in room_list]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Available rooms: %s", [room['room_number'] for room in room_list])
             return jsonify({
                 'rooms': room_list,
                 'check_in': check_in.strftime('%d %B %Y'),
@@ -150,9 +129,7 @@ def available_rooms():
             }), 200
         except OperationalError as e:
             db.session.rollback()
-            if "database is locked" in str(e) and attempt < max_retries - 1:
-                logger.warning(f"Database locked, retrying attempt {attempt + 1}/{max_retries}")
-                time.sleep(0.1 * (2 ** attempt))
+            if lock_retry.should_retry(e, attempt):
                 continue
             logger.error(f"OperationalError in available_rooms: {str(e)}\n{traceback.format_exc()}")
             return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
@@ -166,15 +143,16 @@ def available_rooms():
 @manage_booking_bp.route('/cancel_booking', methods=['POST'])
 def cancel_booking():
     data = request.get_json()
-    logger.debug(f"cancel_booking received data: {data}")
+    logger.debug("cancel_booking received data: %s", data)
     email = data.get('email')
     booking_reference = data.get('booking_reference')
 
     if not all([email, booking_reference]):
         return jsonify({'error': 'Email and booking reference are required', 'code': 'MISSING_DATA'}), 400
+    if not is_valid_booking_reference(booking_reference):
+        return jsonify({'error': 'Booking not found', 'code': 'BOOKING_NOT_FOUND'}), 404
 
-    max_retries = 3
-    for attempt in range(max_retries):
+    for attempt in range(lock_retry.attempts):
         try:
             with db.session.begin_nested():
                 booking = Booking.query.filter_by(booking_reference=booking_reference).first()
@@ -192,7 +170,7 @@ def cancel_booking():
                 booking.status = 'cancelled'
                 update_room_status(booking.room_id)
             db.session.commit()
-            logger.debug(f"Cancelled booking: {booking_reference}")
+            logger.debug("Cancelled booking: %s", booking_reference)
             return jsonify({
                 'message': 'Booking cancelled successfully',
                 'booking_reference': booking_reference,
@@ -201,9 +179,7 @@ def cancel_booking():
             }), 200
         except OperationalError as e:
             db.session.rollback()
-            if "database is locked" in str(e) and attempt < max_retries - 1:
-                logger.warning(f"Database locked, retrying attempt {attempt + 1}/{max_retries}")
-                time.sleep(0.1 * (2 ** attempt))
+            if lock_retry.should_retry(e, attempt):
                 continue
             logger.error(f"OperationalError in cancel_booking: {str(e)}\n{traceback.format_exc()}")
             return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
@@ -217,7 +193,7 @@ def cancel_booking():
 @manage_booking_bp.route('/modify_booking/<string:booking_reference>', methods=['POST'])
 def modify_booking(booking_reference):
     data = request.get_json()
-    logger.debug(f"modify_booking received data for booking_reference {booking_reference}: {data}")
+    logger.debug("modify_booking received data for booking_reference %s: %s", booking_reference, data)
     email = data.get('email')
     room_id = data.get('room_id')
     check_in_date = data.get('check_in_date')
@@ -228,9 +204,10 @@ def modify_booking(booking_reference):
         return jsonify(
             {'error': 'Email, request_id, and at least one of room_id, check_in_date, or check_out_date required',
              'code': 'MISSING_DATA'}), 400
+    if not is_valid_booking_reference(booking_reference):
+        return jsonify({'error': 'Booking not found', 'code': 'BOOKING_NOT_FOUND'}), 404
 
-    max_retries = 3
-    for attempt in range(max_retries):
+    for attempt in range(lock_retry.attempts):
         try:
             with db.session.begin_nested():
                 booking = Booking.query.filter_by(booking_reference=booking_reference).first()
@@ -288,7 +265,7 @@ def modify_booking(booking_reference):
                 if room_id and old_room_id != booking.room_id:
                     update_room_status(old_room_id)
             db.session.commit()
-            logger.debug(f"Modified booking: {booking_reference}")
+            logger.debug("Modified booking: %s", booking_reference)
             return jsonify({
                 'message': 'Booking modified successfully',
                 'booking_reference': booking_reference,
@@ -302,9 +279,7 @@ def modify_booking(booking_reference):
             }), 200
         except OperationalError as e:
             db.session.rollback()
-            if "database is locked" in str(e) and attempt < max_retries - 1:
-                logger.warning(f"Database locked, retrying attempt {attempt + 1}/{max_retries}")
-                time.sleep(0.1 * (2 ** attempt))
+            if lock_retry.should_retry(e, attempt):
                 continue
             logger.error(f"OperationalError in modify_booking: {str(e)}\n{traceback.format_exc()}")
             return jsonify({'error': 'Database connection issue', 'code': 'DB_CONNECTION'}), 500
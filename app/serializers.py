@@ -0,0 +1,100 @@
+# app/serializers.py
+import json
+from app.models import Booking, Guest, Room
+
+# Only the columns Booking.to_dict() exposes, fetched with one LEFT JOIN to guests and rooms
+BOOKING_LIST_COLUMNS = (
+    Booking.id,
+    Booking.booking_reference,
+    Guest.full_name.label('guest_full_name'),
+    Guest.email.label('guest_email'),
+    Room.id.label('room_id'),
+    Room.room_number.label('room_number'),
+    Room.room_type.label('room_type'),
+    Booking.check_in_date,
+    Booking.check_out_date,
+    Booking.status,
+    Booking.payment_status,
+)
+
+
+def booking_list_query(query=None):
+    """Turn a Booking query (filters and ordering kept) into a row projection for serialization."""
+    query = query if query is not None else Booking.query
+    return query.outerjoin(Guest, Booking.guest_id == Guest.id) \
+        .outerjoin(Room, Booking.room_id == Room.id) \
+        .with_entities(*BOOKING_LIST_COLUMNS)
+
+
+def booking_row_to_dict(row):
+    """Same shape as Booking.to_dict(), built straight from a booking_list_query row."""
+    has_guest = row.guest_full_name is not None
+    has_room = row.room_id is not None
+    return {
+        'id': row.id,
+        'booking_reference': row.booking_reference,
+        'guest': {
+            'full_name': row.guest_full_name if has_guest else 'Unknown',
+            'email': row.guest_email if has_guest else ''
+        },
+        'room': {
+            'id': row.room_id,
+            'room_number': row.room_number if has_room else 'N/A',
+            'room_type': row.room_type if has_room else 'N/A'
+        },
+        'check_in_date': row.check_in_date.isoformat() if row.check_in_date else '',
+        'check_out_date': row.check_out_date.isoformat() if row.check_out_date else '',
+        'status': row.status,
+        'payment_status': row.payment_status
+    }
+
+
+def serialize_bookings(rows):
+    return [booking_row_to_dict(row) for row in rows]
+
+
+def serialize_booking(booking_id):
+    """Serialize one booking in a single statement instead of lazy-loading guest and room."""
+    row = booking_list_query().filter(Booking.id == booking_id).first()
+    return booking_row_to_dict(row) if row else None
+
+
+# Public names of the guest directory fields and the columns behind them
+GUEST_FIELDS = {
+    'id': Guest.id,
+    'name': Guest.full_name,
+    'email': Guest.email,
+    'phone': Guest.phone,
+}
+GUEST_PAGE_SIZE = 50
+MAX_GUEST_PAGE_SIZE = 500
+# Rows fetched per round trip when streaming the directory
+GUEST_STREAM_BATCH = 1000
+
+
+def parse_guest_fields(value):
+    """Comma-separated ?fields= value as a list of GUEST_FIELDS names; all fields when empty."""
+    if not value:
+        return list(GUEST_FIELDS)
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in GUEST_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown guest fields: {', '.join(unknown)}; expected some of {', '.join(GUEST_FIELDS)}")
+    return fields
+
+
+def guest_directory_query(fields):
+    """Projection of only the requested guest columns (plus id, which paging keys on)."""
+    columns = [Guest.id] + [GUEST_FIELDS[field].label(field) for field in fields if field != 'id']
+    return Guest.query.with_entities(*columns)
+
+
+def guest_row_to_dict(row, fields):
+    return {field: getattr(row, field) for field in fields}
+
+
+def stream_guests_ndjson(query, fields):
+    """Yield one JSON line per guest in id order, holding at most one batch of rows in memory."""
+    result = query.order_by(Guest.id).execution_options(yield_per=GUEST_STREAM_BATCH)
+    for row in result:
+        yield json.dumps(guest_row_to_dict(row, fields)) + '\n'
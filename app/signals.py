@@ -0,0 +1,95 @@
+# app/signals.py
+from collections import namedtuple
+from blinker import Namespace
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.models import Booking
+
+_signals = Namespace()
+
+# Sent once per committed transaction with the list of BookingChange rows it wrote.
+bookings_committed = _signals.signal('bookings-committed')
+
+# Sent once per committed transaction with the set of table_versions names it bumped.
+tables_committed = _signals.signal('tables-committed')
+
+BookingChange = namedtuple('BookingChange', [
+    'id', 'room_id', 'check_in_date', 'check_out_date', 'status', 'payment_status', 'created_at', 'deleted',
+    'previous'
+])
+
+_TRACKED_FIELDS = ('room_id', 'check_in_date', 'check_out_date', 'status', 'payment_status', 'created_at')
+
+
+def _snapshot(booking, deleted=False, previous=None):
+    return BookingChange(
+        id=booking.id,
+        room_id=booking.room_id,
+        check_in_date=booking.check_in_date,
+        check_out_date=booking.check_out_date,
+        status=booking.status,
+        payment_status=booking.payment_status,
+        created_at=booking.created_at,
+        deleted=deleted,
+        previous=previous
+    )
+
+
+def _committed_state(booking):
+    """The row as it was before this flush, read from attribute history."""
+    state = inspect(booking)
+    values = {}
+    for field in _TRACKED_FIELDS:
+        history = state.attrs[field].history
+        values[field] = history.deleted[0] if history.deleted else getattr(booking, field)
+    return BookingChange(id=booking.id, deleted=False, previous=None, **values)
+
+
+def _pending(session):
+    return session.info.setdefault('booking_changes', {})
+
+
+def record_booking_changes(session, changes):
+    """Queue BookingChange rows for bookings written by bulk statements, to go out with this commit."""
+    pending = _pending(session)
+    for change in changes:
+        earlier = pending.get(change.id)
+        pending[change.id] = change._replace(previous=earlier.previous) if earlier else change
+
+
+def _after_flush(session, flush_context):
+    pending = _pending(session)
+    for obj in session.new:
+        if isinstance(obj, Booking) and obj.id is not None:
+            pending[obj.id] = _snapshot(obj)
+    for obj in session.dirty:
+        if isinstance(obj, Booking) and obj.id is not None:
+            # Keep the state from before the transaction's first flush, not an intermediate one
+            earlier = pending.get(obj.id)
+            previous = earlier.previous if earlier else _committed_state(obj)
+            pending[obj.id] = _snapshot(obj, previous=previous)
+    for obj in session.deleted:
+        if isinstance(obj, Booking) and obj.id is not None:
+            earlier = pending.get(obj.id)
+            previous = earlier.previous if earlier else _committed_state(obj)
+            pending[obj.id] = _snapshot(obj, deleted=True, previous=previous)
+
+
+def _after_commit(session):
+    changes = list(session.info.pop('booking_changes', {}).values())
+    if changes and has_app_context():
+        bookings_committed.send(current_app._get_current_object(), changes=changes)
+
+
+def _after_rollback(session):
+    session.info.pop('booking_changes', None)
+
+
+def init_signals():
+    """Hook ORM sessions so committed Booking writes are broadcast on bookings_committed."""
+    if event.contains(Session, 'after_flush', _after_flush):
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
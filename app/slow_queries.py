@@ -0,0 +1,122 @@
+# app/slow_queries.py
+from collections import OrderedDict
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MAX_STATEMENTS = 200
+EXPLAIN_QUEUE_SIZE = 100
+EXPLAINABLE = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')
+
+
+class SlowQueryLog:
+    """Statements that crossed SLOW_QUERY_THRESHOLD_MS, grouped by SQL text.
+
+    Each offender is logged with its parameters and route. EXPLAIN QUERY PLAN runs on a
+    background thread with its own connection, at most once per statement every
+    SLOW_QUERY_EXPLAIN_INTERVAL seconds, and each distinct plan is kept once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._statements = OrderedDict()
+        self._explain_queue = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+        self._worker = None
+        self.threshold_ms = 100
+        self.explain_interval = 300
+
+    def configure(self, threshold_ms, explain_interval):
+        self.threshold_ms = threshold_ms
+        self.explain_interval = explain_interval
+
+    def observe(self, engine, statement, parameters, elapsed_ms, route, executemany=False):
+        now = time.time()
+        with self._lock:
+            entry = self._statements.pop(statement, None)
+            if entry is None:
+                entry = {'statement': statement, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'routes': {},
+                         'last_parameters': None, 'last_seen': None, 'explained_at': 0.0, 'plans': {}}
+            entry['count'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['routes'][route] = entry['routes'].get(route, 0) + 1
+            entry['last_parameters'] = repr(parameters)
+            entry['last_seen'] = now
+            self._statements[statement] = entry
+            while len(self._statements) > MAX_STATEMENTS:
+                self._statements.popitem(last=False)
+            explain = (not executemany and now - entry['explained_at'] >= self.explain_interval
+                       and statement.lstrip().upper().startswith(EXPLAINABLE))
+            if explain:
+                entry['explained_at'] = now
+        logger.warning("Slow query %.1fms in %s: %s parameters=%r", elapsed_ms, route, statement, parameters)
+        if explain and engine.dialect.name == 'sqlite':
+            self._enqueue_explain(engine, statement, parameters)
+
+    def _enqueue_explain(self, engine, statement, parameters):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='slow-query-explain', daemon=True)
+                self._worker.start()
+        try:
+            self._explain_queue.put_nowait((engine, statement, parameters))
+        except queue.Full:
+            logger.debug("Slow query EXPLAIN queue full; skipping plan capture")
+
+    def _run(self):
+        while True:
+            engine, statement, parameters = self._explain_queue.get()
+            try:
+                plan = explain_statement(engine, statement, parameters)
+            except Exception as e:
+                logger.debug("EXPLAIN QUERY PLAN failed for slow query: %s", e)
+                continue
+            with self._lock:
+                entry = self._statements.get(statement)
+                if entry is None:
+                    continue
+                new_plan = plan not in entry['plans']
+                entry['plans'][plan] = entry['plans'].get(plan, 0) + 1
+            if new_plan:
+                logger.warning("Query plan for slow query %s:\n%s", statement, plan)
+
+    def snapshot(self):
+        """Offenders ordered by worst single execution, slowest first."""
+        with self._lock:
+            entries = [dict(entry, routes=dict(entry['routes']), plans=[
+                {'plan': plan, 'seen': seen} for plan, seen in entry['plans'].items()
+            ]) for entry in self._statements.values()]
+        for entry in entries:
+            entry['avg_ms'] = round(entry['total_ms'] / entry['count'], 3)
+            entry['total_ms'] = round(entry['total_ms'], 3)
+            entry['max_ms'] = round(entry['max_ms'], 3)
+            del entry['explained_at']
+        return sorted(entries, key=lambda entry: entry['max_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+
+
+def explain_statement(engine, statement, parameters):
+    """EXPLAIN QUERY PLAN for a raw DBAPI statement, as indented plan lines."""
+    with engine.connect() as connection:
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        connection.rollback()
+    depth = {0: 0}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, 0) + 1
+        lines.append('  ' * (depth[node_id] - 1) + detail)
+    return '\n'.join(lines)
+
+
+slow_query_log = SlowQueryLog()
@@ -7,6 +7,7 @@ document.addEventListener('DOMContentLoaded', () => {
   const guestsTableBody = document.querySelector('#guestsTable tbody');
   const bookingsPagination = document.getElementById('bookingsPagination');
   const roomsPagination = document.getElementById('roomsPagination');
+  const guestsPagination = document.getElementById('guestsPagination');
   const searchForm = document.getElementById('searchForm');
   const walkinForm = document.getElementById('walkinForm');
   const addRoomForm = document.getElementById('addRoomForm');
@@ -54,6 +55,7 @@ document.addEventListener('DOMContentLoaded', () => {
   let currentRoomsPage = 1;
   let currentStatusFilter = 'all';
   let currentBookingFilter = 'all';
+  let renderedBookings = [];
   let walkinFormData = null;
 
   // Date Formatting Functions
@@ -296,7 +298,7 @@ addRoomBtnModal.addEventListener('click', () => {
   }
 
   // Fetch Bookings
-  async function fetchBookings(page = currentBookingsPage, status = currentStatusFilter, filter = currentBookingFilter, search = '') {
+  async function fetchBookings(page = currentBookingsPage, status = currentStatusFilter, filter = currentBookingFilter, search = document.getElementById('searchReference').value.trim()) {
     try {
       showSpinner();
       const params = new URLSearchParams({
@@ -326,6 +328,7 @@ addRoomBtnModal.addEventListener('click', () => {
 
   // Render Bookings as Cards
   function renderBookings(bookings) {
+  renderedBookings = bookings || [];
   if (!bookings || bookings.length === 0) {
     bookingsContent.innerHTML = '<p class="text-gray-200 col-span-full">No bookings found.</p>';
     return;
@@ -357,6 +360,11 @@ addRoomBtnModal.addEventListener('click', () => {
         <p class="text-gray-200"><strong>Check-Out:</strong> ${checkOutDate}</p>
         <p class="text-gray-200"><strong>Status:</strong> <span class="${isCancelled ? 'text-red-400' : isCheckedOut ? 'text-gray-400' : isCheckedIn ? 'text-green-400' : 'text-yellow-400'}">${booking.status}</span></p>
         <p class="text-gray-200"><strong>Payment:</strong> <span class="${isPaid ? 'text-green-400' : 'text-red-400'}">${booking.payment_status}</span></p>
+        <p class="text-gray-200 text-sm mt-1">
+          <a href="/receptionist/booking/${booking.id}/confirmation.pdf" target="_blank" class="text-blue-400 hover:underline">Confirmation PDF</a>
+          &middot;
+          <a href="/receptionist/booking/${booking.id}/invoice.pdf" target="_blank" class="text-blue-400 hover:underline">Invoice PDF</a>
+        </p>
         <div class="flex flex-wrap gap-2 mt-4">
           <button class="modify-booking-btn p-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700 transition flex items-center gap-1 ${modifyDisabled}" data-booking-id="${booking.id}" data-email="${booking.guest.email || ''}" data-check-in="${booking.check_in_date}" data-check-out="${booking.check_out_date}" data-room-id="${booking.room.id || ''}" aria-label="Modify booking ${booking.booking_reference}">
             <svg class="w-4 h-4" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
@@ -440,15 +448,17 @@ addRoomBtnModal.addEventListener('click', () => {
   }
 
   // Fetch Guests
-  async function fetchGuests() {
+  async function fetchGuests(cursor = '') {
     try {
       showSpinner();
-      const response = await fetch('/receptionist/guests', {
+      const params = new URLSearchParams({ cursor, per_page: 50, fields: 'id,name,email,phone' });
+      const response = await fetch(`/receptionist/guests?${params}`, {
         headers: { 'X-Requested-With': 'XMLHttpRequest' }
       });
       if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
       const data = await response.json();
-      renderGuests(data.guests);
+      renderGuests(data.guests, Boolean(cursor));
+      renderGuestsLoadMore(data.pagination.next_cursor);
     } catch (error) {
       console.error('Error fetching guests:', error);
       showFeedback('Failed to load guests. Please try again.');
@@ -458,20 +468,36 @@ addRoomBtnModal.addEventListener('click', () => {
     }
   }
 
+  // Guests are paged with a keyset cursor; "Load more" appends the next page
+  function renderGuestsLoadMore(nextCursor) {
+    guestsPagination.innerHTML = '';
+    if (!nextCursor) return;
+    const button = document.createElement('button');
+    button.className = 'px-4 py-2 bg-gray-600 text-white rounded-lg hover:bg-gray-500 transition';
+    button.textContent = 'Load more';
+    button.addEventListener('click', () => fetchGuests(nextCursor));
+    guestsPagination.appendChild(button);
+  }
+
   // Render Guests
-  function renderGuests(guests) {
-    if (!guests || guests.length === 0) {
+  function renderGuests(guests, append = false) {
+    if (!append && (!guests || guests.length === 0)) {
       guestsTableBody.innerHTML = '<tr><td colspan="4" class="p-3 text-gray-200">No guests found.</td></tr>';
       return;
     }
-    guestsTableBody.innerHTML = guests.map(guest => `
+    const rows = guests.map(guest => `
       <tr class="bg-gray-700 hover:bg-gray-600 transition">
         <td class="p-3 text-gray-200">${guest.id}</td>
-        <td class="p-3 text-gray-200">${guest.full_name}</td>
+        <td class="p-3 text-gray-200">${guest.name}</td>
         <td class="p-3 text-gray-200">${guest.email}</td>
         <td class="p-3 text-gray-200">${guest.phone || 'N/A'}</td>
       </tr>
     `).join('');
+    if (append) {
+      guestsTableBody.insertAdjacentHTML('beforeend', rows);
+    } else {
+      guestsTableBody.innerHTML = rows;
+    }
   }
 
   // Render Pagination
@@ -534,6 +560,19 @@ addRoomBtnModal.addEventListener('click', () => {
     fetchBookings(currentBookingsPage, currentStatusFilter, currentBookingFilter, '');
   });
 
+  // Export the bookings matching the current filters
+  document.querySelectorAll('.export-link').forEach(link => {
+    link.addEventListener('click', () => {
+      const params = new URLSearchParams({
+        format: link.dataset.format,
+        status: currentStatusFilter,
+        filter: currentBookingFilter,
+        search_reference: document.getElementById('searchReference').value.trim()
+      });
+      link.href = `/receptionist/bookings/export?${params}`;
+    });
+  });
+
   // Search Rooms for Walk-in
   searchRoomsBtn.addEventListener('click', async () => {
   const checkInDate = walkinCheckIn.value;
@@ -1054,6 +1093,46 @@ addRoomBtnModal.addEventListener('click', () => {
     fetchBookings();
   });
 
+  // Live Updates: patch the rendered booking cards from pushed deltas, and refetch the visible
+  // lists only when a change may move bookings in or out of them
+  function applyBookingDelta(delta) {
+    const booking = renderedBookings.find(b => b.id === delta.id);
+    if (!booking || delta.action === 'created' || delta.action === 'deleted') return false;
+    if (booking.room.id !== delta.room_id || booking.check_in_date !== delta.check_in_date
+        || booking.check_out_date !== delta.check_out_date) return false;
+    if (currentBookingFilter !== 'all' || (currentStatusFilter !== 'all' && delta.status !== currentStatusFilter)) return false;
+    booking.status = delta.status;
+    booking.payment_status = delta.payment_status;
+    renderBookings(renderedBookings);
+    return true;
+  }
+
+  let liveRefreshTimer = null;
+  const pendingRefresh = new Set();
+  function scheduleLiveRefresh(...sections) {
+    sections.forEach(section => pendingRefresh.add(section));
+    clearTimeout(liveRefreshTimer);
+    liveRefreshTimer = setTimeout(() => {
+      const visible = section => !document.getElementById(section).classList.contains('hidden');
+      if (pendingRefresh.has('priorities')) fetchPriorities();
+      if (pendingRefresh.has('bookings') && visible('bookings')) fetchBookings();
+      if (pendingRefresh.has('rooms') && visible('rooms')) fetchRooms();
+      if (pendingRefresh.has('guests') && visible('guests')) fetchGuests();
+      pendingRefresh.clear();
+    }, 300);
+  }
+
+  if (window.EventSource) {
+    const events = new EventSource('/receptionist/events');
+    events.addEventListener('booking', event => {
+      const data = JSON.parse(event.data);
+      const sections = applyBookingDelta(data) ? ['priorities'] : ['priorities', 'bookings'];
+      scheduleLiveRefresh(...sections, ...(data.action === 'created' ? ['guests'] : []));
+    });
+    events.addEventListener('rooms', () => scheduleLiveRefresh('rooms'));
+    events.addEventListener('resync', () => scheduleLiveRefresh('priorities', 'bookings', 'rooms', 'guests'));
+  }
+
   // Initial Load
   fetchPriorities();
 });
\ No newline at end of file
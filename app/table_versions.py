@@ -0,0 +1,79 @@
+# app/table_versions.py
+from flask import current_app, has_app_context
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models import Booking, Guest, Room, TableVersion
+from app.signals import tables_committed
+
+# Models whose ORM writes bump a table_versions row, keyed by the row name
+TRACKED_MODELS = {Room: 'rooms', Guest: 'guests', Booking: 'bookings'}
+
+
+def bump_version(connection, name):
+    """Increment a table_versions row inside the caller's transaction."""
+    connection.execute(
+        update(TableVersion).where(TableVersion.name == name).values(version=TableVersion.version + 1)
+    )
+
+
+def record_bulk_change(session, names):
+    """Bump and announce tables written with Core UPDATE/INSERT statements, which the flush hook never sees."""
+    connection = session.connection()
+    for name in sorted(names):
+        bump_version(connection, name)
+    session.info.setdefault('changed_tables', set()).update(names)
+
+
+def read_version(name):
+    return db.session.execute(select(TableVersion.version).where(TableVersion.name == name)).scalar() or 0
+
+
+def read_versions(names):
+    """Current version of each named table in one primary-key lookup; missing rows read as 0."""
+    rows = db.session.execute(select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names)))
+    versions = dict(rows.all())
+    return [versions.get(name, 0) for name in names]
+
+
+def _changed_tables(session):
+    changed = set()
+    for obj in session.new:
+        if type(obj) in TRACKED_MODELS:
+            changed.add(TRACKED_MODELS[type(obj)])
+    for obj in session.deleted:
+        if type(obj) in TRACKED_MODELS:
+            changed.add(TRACKED_MODELS[type(obj)])
+    for obj in session.dirty:
+        if type(obj) in TRACKED_MODELS and session.is_modified(obj, include_collections=False):
+            changed.add(TRACKED_MODELS[type(obj)])
+    return changed
+
+
+def _after_flush(session, flush_context):
+    changed = _changed_tables(session)
+    if not changed:
+        return
+    connection = session.connection()
+    for name in sorted(changed):
+        bump_version(connection, name)
+    session.info.setdefault('changed_tables', set()).update(changed)
+
+
+def _after_commit(session):
+    changed = session.info.pop('changed_tables', None)
+    if changed and has_app_context():
+        tables_committed.send(current_app._get_current_object(), names=changed)
+
+
+def _after_rollback(session):
+    session.info.pop('changed_tables', None)
+
+
+def init_table_versions():
+    """Bump table_versions for every flush that writes a tracked model and announce it on commit."""
+    if event.contains(Session, 'after_flush', _after_flush):
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
@@ -0,0 +1,166 @@
+# app/transitions.py
+from datetime import date, datetime, time, timedelta
+import json
+import logging
+import threading
+import click
+from sqlalchemy import case, exists, select, update
+from sqlalchemy.exc import OperationalError
+from app.availability import ACTIVE_STATUSES
+from app.database import lock_retry
+from app.extensions import db
+from app.models import Booking, JobRun, Room
+from app.signals import BookingChange, record_booking_changes
+from app.table_versions import record_bulk_change
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = 'booking_transitions'
+
+_CHANGE_COLUMNS = (Booking.id, Booking.room_id, Booking.check_in_date, Booking.check_out_date, Booking.status,
+                   Booking.payment_status, Booking.created_at)
+
+
+def _claim(connection, as_of, force):
+    """Take the job row for as_of inside the current transaction; False if another run already did.
+
+    The UPDATE also takes the database write lock up front, so the SELECTs that follow see
+    exactly the rows the bulk UPDATEs will change, even with several workers racing.
+    """
+    now = datetime.utcnow()
+    claim = update(JobRun).where(JobRun.name == JOB_NAME)
+    if force:
+        # On-demand runs leave the scheduled day's claim alone
+        claim = claim.values(last_run_at=now)
+    else:
+        claim = claim.where((JobRun.last_run_on.is_(None)) | (JobRun.last_run_on < as_of)) \
+            .values(last_run_on=as_of, last_run_at=now)
+    return connection.execute(claim).rowcount > 0
+
+
+def _transition(connection, conditions, new_status):
+    """Move every booking matching conditions to new_status with one UPDATE; returns their BookingChanges."""
+    rows = connection.execute(select(*_CHANGE_COLUMNS).where(*conditions)).all()
+    if not rows:
+        return []
+    connection.execute(update(Booking).where(*conditions).values(status=new_status))
+    changes = []
+    for row in rows:
+        previous = BookingChange(*row, deleted=False, previous=None)
+        changes.append(previous._replace(status=new_status, previous=previous))
+    return changes
+
+
+def _recompute_room_status(connection, as_of):
+    """Set every room to 'booked' or 'available' from its bookings, touching only rooms that differ."""
+    occupied = exists().where(
+        Booking.room_id == Room.id,
+        Booking.status.in_(ACTIVE_STATUSES),
+        (Booking.check_out_date >= as_of) | (Booking.status == 'checked-in')
+    )
+    target = case((occupied, 'booked'), else_='available')
+    return connection.execute(update(Room).where(Room.status != target).values(status=target)).rowcount
+
+
+def apply_transitions(as_of=None, force=False):
+    """Daily booking maintenance as a few set-based statements in one transaction.
+
+    Bookings still 'booked' after their check-in date are no-shows and are cancelled;
+    paid bookings still 'checked-in' after their check-out date are checked out; then every
+    room's status is recomputed. Like the front desk checkout, unpaid stays are never checked
+    out automatically: they stay checked-in, keep their room booked and are listed under
+    'unpaid_overdue' for the desk to settle. Returns a summary dict, or None when the day's
+    run had already been claimed by another worker (unless force).
+    """
+    as_of = as_of or date.today()
+    session = db.session
+    connection = session.connection()
+    if not _claim(connection, as_of, force):
+        session.rollback()
+        return None
+
+    no_shows = _transition(connection, (Booking.status == 'booked', Booking.check_in_date < as_of), 'cancelled')
+    overdue = (Booking.status == 'checked-in', Booking.check_out_date < as_of)
+    checked_out = _transition(connection, overdue + (Booking.payment_status == 'paid',), 'checked-out')
+    unpaid_overdue = connection.execute(
+        select(Booking.id).where(*overdue, Booking.payment_status != 'paid').order_by(Booking.id)
+    ).scalars().all()
+    rooms_updated = _recompute_room_status(connection, as_of)
+
+    changes = no_shows + checked_out
+    changed_tables = ({'bookings'} if changes else set()) | ({'rooms'} if rooms_updated else set())
+    if changed_tables:
+        record_bulk_change(session, changed_tables)
+    record_booking_changes(session, changes)
+    result = {'as_of': as_of.isoformat(), 'no_shows': len(no_shows), 'checked_out': len(checked_out),
+              'unpaid_overdue': unpaid_overdue, 'rooms_updated': rooms_updated}
+    connection.execute(update(JobRun).where(JobRun.name == JOB_NAME).values(last_result=json.dumps(result)))
+    session.commit()
+    logger.info("Booking transitions for %s: %s no-shows cancelled, %s checked out, %s unpaid overdue, "
+                "%s room statuses updated", as_of.isoformat(), len(no_shows), len(checked_out), len(unpaid_overdue),
+                rooms_updated)
+    return result
+
+
+def run_transitions(as_of=None, force=False):
+    """apply_transitions with the shared 'database is locked' retry policy."""
+    for attempt in range(lock_retry.attempts):
+        try:
+            return apply_transitions(as_of, force)
+        except OperationalError as e:
+            db.session.rollback()
+            if not lock_retry.should_retry(e, attempt):
+                raise
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            db.session.remove()
+
+
+def _schedule_loop(app, hour, stop):
+    while True:
+        now = datetime.now()
+        if now.hour >= hour:
+            # Every worker wakes up; the claim in apply_transitions lets exactly one of them run
+            try:
+                with app.app_context():
+                    run_transitions()
+            except Exception as e:
+                logger.error("Scheduled booking transitions failed: %s", e)
+            next_run = datetime.combine(now.date() + timedelta(days=1), time(hour))
+        else:
+            next_run = datetime.combine(now.date(), time(hour))
+        if stop.wait(max((next_run - datetime.now()).total_seconds(), 1)):
+            return
+
+
+def start_scheduler(app):
+    """Start the daily transitions thread when BOOKING_TRANSITIONS_HOUR is set.
+
+    Only the serving entry point calls this (see run.py), so CLI commands, migrations,
+    benchmarks and spawned workers that build an app do not start schedulers of their own.
+    """
+    hour = app.config.get('BOOKING_TRANSITIONS_HOUR')
+    if hour is None or 'transitions_stop' in app.extensions:
+        return
+    stop = threading.Event()
+    app.extensions['transitions_stop'] = stop
+    threading.Thread(target=_schedule_loop, args=(app, hour, stop), name='booking-transitions',
+                     daemon=True).start()
+
+
+def init_transitions(app):
+    """Register 'flask apply-transitions'; the daily thread is started separately by start_scheduler."""
+
+    @app.cli.command('apply-transitions')
+    @click.option('--date', 'as_of', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+                  help='Treat this as today (default: today).')
+    @click.option('--force', is_flag=True, help='Run even if the day has already been processed.')
+    def apply_transitions_command(as_of, force):
+        """Cancel no-shows, check out paid overdue stays and recompute room statuses."""
+        result = run_transitions(as_of.date() if as_of else None, force)
+        if result is None:
+            click.echo('Already run for this date; use --force to run again')
+        else:
+            click.echo(json.dumps(result))
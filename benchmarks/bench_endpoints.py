@@ -0,0 +1,249 @@
+"""Endpoint latency benchmarks with a regression gate.
+
+Seeds a throwaway SQLite database at each requested size, drives the hot endpoints
+through the Flask test client and records p50/p95/p99 latency and the SQL statements
+per request reported in X-Query-Count.
+
+    python benchmarks/bench_endpoints.py --sizes 1000 100000 --save benchmarks/baseline.json
+    python benchmarks/bench_endpoints.py --sizes 1000 100000 --check benchmarks/baseline.json
+
+--check exits with status 1 when an endpoint's p95 grows by more than --threshold
+(default 25%) over the baseline or it runs more statements per request.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert  # noqa: E402
+from config import Config  # noqa: E402
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.guest_search import name_tokens, search_keys  # noqa: E402
+from app.models import Booking, BookingReferenceGram, Guest, GuestNameToken, ReferenceCounter, Room  # noqa: E402
+from app.reference_search import reference_grams  # noqa: E402
+from app.references import encode_reference  # noqa: E402
+
+ROOM_COUNT = 300
+ROOM_TYPES = [('Single', 120.0), ('Double', 180.0), ('Suite', 350.0)]
+BATCH_SIZE = 50000
+DEFAULT_SIZES = [1000, 100000, 1000000]
+
+
+class BenchConfig(Config):
+    TESTING = True
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+
+
+def seed(booking_count, rng):
+    """Fill rooms, guests and non-overlapping per-room booking histories ending ~90 days ahead."""
+    today = date.today()
+    db.session.execute(insert(Room.__table__), [{
+        'room_number': str(100 + i),
+        'room_type': ROOM_TYPES[i % 3][0],
+        'price': ROOM_TYPES[i % 3][1],
+        'status': 'available'
+    } for i in range(ROOM_COUNT)])
+
+    guest_count = max(1, booking_count // 5)
+    for start in range(0, guest_count, BATCH_SIZE):
+        ids = range(start + 1, min(guest_count, start + BATCH_SIZE) + 1)
+        db.session.execute(insert(Guest.__table__), [{
+            'id': i,
+            'full_name': f'Guest {i}',
+            'email': f'guest{i}@example.com',
+            'phone': f'0{200000000 + i}',
+            'created_at': today,
+            **search_keys(f'Guest {i}', f'guest{i}@example.com', f'0{200000000 + i}')
+        } for i in ids])
+        db.session.execute(insert(GuestNameToken.__table__), [
+            {'token': token, 'guest_id': i} for i in ids for token in name_tokens(f'Guest {i}')
+        ])
+
+    per_room = booking_count // ROOM_COUNT + 1
+    cursors = [today + timedelta(days=90) - timedelta(days=per_room * 4) for _ in range(ROOM_COUNT)]
+    batch = []
+    for serial in range(1, booking_count + 1):
+        room_index = serial % ROOM_COUNT
+        check_in = cursors[room_index] + timedelta(days=rng.randint(0, 1))
+        check_out = check_in + timedelta(days=rng.randint(1, 3))
+        cursors[room_index] = check_out
+        if check_out <= today:
+            status = 'cancelled' if rng.random() < 0.05 else 'checked-out'
+        elif check_in <= today:
+            status = 'checked-in'
+        else:
+            status = 'booked'
+        batch.append({
+            'id': serial,
+            'booking_reference': encode_reference(serial),
+            'guest_id': rng.randint(1, guest_count),
+            'room_id': room_index + 1,
+            'check_in_date': check_in,
+            'check_out_date': check_out,
+            'status': status,
+            'payment_status': 'paid' if status != 'booked' or rng.random() < 0.5 else 'pending',
+            'created_at': min(check_in, today)
+        })
+        if len(batch) >= BATCH_SIZE:
+            insert_bookings(batch)
+            batch = []
+    if batch:
+        insert_bookings(batch)
+    db.session.merge(ReferenceCounter(name='booking', next_value=booking_count + 1))
+    db.session.commit()
+
+
+def insert_bookings(rows):
+    db.session.execute(insert(Booking.__table__), rows)
+    db.session.execute(insert(BookingReferenceGram.__table__), [
+        {'gram': gram, 'booking_id': row['id']} for row in rows for gram in reference_grams(row['booking_reference'])
+    ])
+
+
+def scenarios(booking_count):
+    """(name, method, url, payload factory) for each benchmarked endpoint; needs an app context."""
+    today = date.today()
+    check_in = (today + timedelta(days=30)).isoformat()
+    check_out = (today + timedelta(days=33)).isoformat()
+    counter = {'n': 0}
+
+    def new_booking():
+        # Far-future, per-room slots so every create succeeds instead of hitting ROOM_BOOKED
+        n = counter['n']
+        counter['n'] += 1
+        start = today + timedelta(days=400 + (n // ROOM_COUNT) * 2)
+        return {
+            'full_name': 'Bench Guest', 'email': 'bench@example.com', 'phone': '0200000000',
+            'room_id': n % ROOM_COUNT + 1, 'check_in_date': start.isoformat(),
+            'check_out_date': (start + timedelta(days=1)).isoformat(), 'request_id': str(uuid.uuid4())
+        }
+
+    upcoming = db.session.query(Booking.booking_reference, Guest.email).join(Guest, Booking.guest_id == Guest.id) \
+        .filter(Booking.status == 'booked').order_by(Booking.id.desc()).limit(200).all()
+
+    def existing_booking():
+        reference, email = random.choice(upcoming)
+        return {'email': email, 'booking_reference': reference}
+
+    dates = {'check_in_date': check_in, 'check_out_date': check_out}
+    return [
+        ('search_rooms', 'POST', '/search_rooms', lambda: dict(dates)),
+        ('available_rooms', 'POST', '/available_rooms', lambda: dict(dates, room_type='Double')),
+        ('create_booking', 'POST', '/create_booking', new_booking),
+        ('manage_booking', 'POST', '/manage_booking', existing_booking),
+        ('receptionist_bookings', 'GET', '/receptionist/bookings?page=1&status=all&filter=all', None),
+        ('receptionist_bookings_reference', 'GET',
+         f'/receptionist/bookings?cursor=&search_reference={encode_reference(booking_count // 2)[4:8]}', None),
+        ('receptionist_priorities', 'GET', '/receptionist/priorities', None),
+        ('receptionist_guest_search', 'GET', '/receptionist/guests/search?q=guest%2012', None),
+        ('receptionist_guest_word_search', 'GET', '/receptionist/guests/search?q=1234&field=name', None),
+        ('receptionist_rooms_search', 'POST', '/receptionist/rooms/search', lambda: dict(dates, room_type='Suite')),
+    ]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_size(booking_count, requests_per_endpoint, warmup, log_level='WARNING'):
+    workdir = tempfile.mkdtemp(prefix='hotel-bench-')
+    config = type('SizedBenchConfig', (BenchConfig,), {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(workdir, 'bench.db'),
+        'LOG_LEVELS': {'': log_level}
+    })
+    app = create_app(config)
+    rng = random.Random(booking_count)
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        seed(booking_count, rng)
+        print(f"seeded {booking_count} bookings in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['role'] = 'receptionist'
+
+    with app.app_context():
+        endpoints = scenarios(booking_count)
+    results = {}
+    for name, method, url, payload in endpoints:
+        latencies = []
+        queries = []
+        for i in range(warmup + requests_per_endpoint):
+            body = payload() if payload else None
+            started = time.perf_counter()
+            response = client.open(url, method=method, json=body)
+            elapsed = (time.perf_counter() - started) * 1000
+            if response.status_code != 200:
+                raise RuntimeError(f"{name} returned {response.status_code}: {response.get_data(as_text=True)}")
+            if i >= warmup:
+                latencies.append(elapsed)
+                queries.append(int(response.headers['X-Query-Count']))
+        results[name] = {
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'queries_per_request': round(statistics.mean(queries), 2)
+        }
+        print(f"{booking_count:>8} {name:<28} p50={results[name]['p50_ms']:>8.2f}ms "
+              f"p95={results[name]['p95_ms']:>8.2f}ms p99={results[name]['p99_ms']:>8.2f}ms "
+              f"queries={results[name]['queries_per_request']}", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for size, endpoints in results.items():
+        for name, current in endpoints.items():
+            previous = baseline.get(size, {}).get(name)
+            if not previous:
+                continue
+            if current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+                regressions.append(f"{size}/{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+            if current['queries_per_request'] > previous['queries_per_request']:
+                regressions.append(f"{size}/{name}: queries/request {previous['queries_per_request']} -> "
+                                   f"{current['queries_per_request']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--requests', type=int, default=100, help='measured requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--save', help='write results to this JSON baseline file')
+    parser.add_argument('--check', help='compare against this JSON baseline and fail on regressions')
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative p95 growth')
+    args = parser.parse_args(argv)
+
+    results = {str(size): run_size(size, args.requests, args.warmup, args.log_level) for size in args.sizes}
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.check:
+        with open(args.check) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    if not args.save:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
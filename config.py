@@ -8,3 +8,56 @@ class Config:
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {'pool_timeout': 10, 'pool_recycle': 3600}
+    # Applied to every SQLite connection: WAL lets readers and the single writer proceed concurrently
+    SQLITE_BUSY_TIMEOUT_MS = 5000
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 268435456,
+        'cache_size': -65536,
+        'temp_store': 'MEMORY',
+    }
+    # Retries for 'database is locked' errors that outlast busy_timeout
+    LOCK_RETRY_ATTEMPTS = 2
+    LOCK_RETRY_BACKOFF = 0.05
+    # 'sql' filters the cached room catalog with one booked-rooms query per search; 'index' uses
+    # the in-memory interval index and 'matrix' the NumPy rooms x days occupancy matrix (both
+    # single process only)
+    AVAILABILITY_BACKEND = 'sql'
+    # Days ahead covered by the occupancy matrix; searches past it fall back to SQL
+    OCCUPANCY_HORIZON_DAYS = 730
+    # How often each process checks table_versions before trusting its cached room catalog
+    ROOM_CATALOG_CHECK_SECONDS = 1.0
+    # Seconds between keepalive comments on idle /receptionist/events streams
+    EVENTS_HEARTBEAT_SECONDS = 15
+    # Statements slower than this are logged and listed at /receptionist/diagnostics/slow_queries
+    SLOW_QUERY_THRESHOLD_MS = 100
+    # Minimum seconds between EXPLAIN QUERY PLAN captures for the same slow statement
+    SLOW_QUERY_EXPLAIN_INTERVAL = 300
+    # Root ('') and per-logger levels for the queued JSON logging pipeline
+    LOG_LEVELS = {'': 'INFO', 'sqlalchemy.engine': 'WARNING'}
+    # Write JSON log lines to this file instead of stderr
+    LOG_FILE = None
+    # Fraction of DEBUG records kept for loggers set to DEBUG
+    LOG_DEBUG_SAMPLE_RATE = 1.0
+    # Match bare digits anywhere in a booking reference via the trigram table, not only as a prefix
+    BOOKING_REFERENCE_SUBSTRING_SEARCH = True
+    # Local hour at which every serving process started through run.py tries the daily
+    # no-show/auto-checkout run (only one wins); None leaves it to cron calling 'flask apply-transitions'
+    BOOKING_TRANSITIONS_HOUR = None
+    # Printed on PDF confirmations and invoices
+    HOTEL_NAME = 'Pelican Hotel'
+    DOCUMENT_CURRENCY = 'GHS'
+    # Rendered PDFs are cached here (default: <instance path>/documents), one file per booking version
+    DOCUMENT_CACHE_DIR = None
+    # PDF render worker processes (default: one per CPU)
+    DOCUMENT_RENDER_WORKERS = None
+    # How long a download waits for an uncached PDF before answering 202 and asking the client to retry
+    DOCUMENT_RENDER_WAIT_SECONDS = 5
+    # Booking reference serials reserved per worker process at a time
+    BOOKING_REFERENCE_BLOCK_SIZE = 50
+    # How long a create_booking/walk-in request_id keeps replaying its original response
+    IDEMPOTENCY_KEY_TTL_HOURS = 24
+    # Serve /receptionist/priorities from in-process counters, resynced from the DB on this interval
+    PRIORITIES_COUNTER_CACHE = False
+    PRIORITIES_RESYNC_SECONDS = 300
@@ -0,0 +1,58 @@
+"""Add guest_name_tokens so guest search matches any word of a name
+
+Revision ID: 2d7f4a9e6c15
+Revises: 7e3a9c5b1f48
+Create Date: 2026-10-18 21:40:00.000000
+
+"""
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7f4a9e6c15'
+down_revision = '7e3a9c5b1f48'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 5000
+
+
+# Frozen copy of app.guest_search.name_tokens as of this revision
+def name_tokens(full_name):
+    decomposed = unicodedata.normalize('NFKD', full_name or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return set(stripped.casefold().split())
+
+
+def upgrade():
+    tokens = op.create_table('guest_name_tokens',
+        sa.Column('token', sa.String(length=100), nullable=False),
+        sa.Column('guest_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['guest_id'], ['guests.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('token', 'guest_id')
+    )
+
+    guests = sa.table('guests',
+        sa.column('id', sa.Integer()),
+        sa.column('full_name', sa.String())
+    )
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(guests.c.id, guests.c.full_name)
+            .where(guests.c.id > last_id).order_by(guests.c.id).limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        values = [{'token': token, 'guest_id': guest_id}
+                  for guest_id, full_name in rows for token in name_tokens(full_name)]
+        if values:
+            connection.execute(tokens.insert(), values)
+        last_id = rows[-1][0]
+
+
+def downgrade():
+    op.drop_table('guest_name_tokens')
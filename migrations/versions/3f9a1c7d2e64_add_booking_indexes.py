@@ -0,0 +1,39 @@
+"""Add booking indexes for overlap, priorities and dashboard queries
+
+Revision ID: 3f9a1c7d2e64
+Revises: b4c565ab88a8
+Create Date: 2026-10-18 09:14:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c7d2e64'
+down_revision = 'b4c565ab88a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('ix_bookings_room_status_dates',
+                              ['room_id', 'status', 'check_in_date', 'check_out_date'], unique=False)
+        batch_op.create_index('ix_bookings_status_check_in', ['status', 'check_in_date'], unique=False)
+        batch_op.create_index('ix_bookings_status_check_out', ['status', 'check_out_date'], unique=False)
+        batch_op.create_index('ix_bookings_payment_status_check_in',
+                              ['payment_status', 'status', 'check_in_date'], unique=False)
+        batch_op.create_index('ix_bookings_status_id', ['status', 'id'], unique=False)
+        batch_op.create_index('ix_bookings_created_at', ['created_at'], unique=False)
+        batch_op.create_index('ix_bookings_guest_id', ['guest_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookings_guest_id')
+        batch_op.drop_index('ix_bookings_created_at')
+        batch_op.drop_index('ix_bookings_status_id')
+        batch_op.drop_index('ix_bookings_payment_status_check_in')
+        batch_op.drop_index('ix_bookings_status_check_out')
+        batch_op.drop_index('ix_bookings_status_check_in')
+        batch_op.drop_index('ix_bookings_room_status_dates')
@@ -0,0 +1,56 @@
+"""Add booking_reference_grams for substring reference search
+
+Revision ID: 4c8f1e6a2d93
+Revises: 9b6e2d4f7c30
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c8f1e6a2d93'
+down_revision = '9b6e2d4f7c30'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 5000
+
+
+# Frozen copy of app.reference_search.reference_grams as of this revision
+def reference_grams(reference):
+    digits = reference[2:] if reference.startswith('PL') else reference
+    return {digits[i:i + 3] for i in range(len(digits) - 2)}
+
+
+def upgrade():
+    grams = op.create_table('booking_reference_grams',
+        sa.Column('gram', sa.String(length=3), nullable=False),
+        sa.Column('booking_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('gram', 'booking_id')
+    )
+
+    bookings = sa.table('bookings',
+        sa.column('id', sa.Integer()),
+        sa.column('booking_reference', sa.String())
+    )
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(bookings.c.id, bookings.c.booking_reference)
+            .where(bookings.c.id > last_id).order_by(bookings.c.id).limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        values = [{'gram': gram, 'booking_id': booking_id}
+                  for booking_id, reference in rows for gram in reference_grams(reference)]
+        if values:
+            connection.execute(grams.insert(), values)
+        last_id = rows[-1][0]
+
+
+def downgrade():
+    op.drop_table('booking_reference_grams')
@@ -0,0 +1,30 @@
+"""Seed table_versions rows for guests and bookings
+
+Revision ID: 5a0d3e8b6f21
+Revises: e27b4f9c1a58
+Create Date: 2026-10-18 16:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a0d3e8b6f21'
+down_revision = 'e27b4f9c1a58'
+branch_labels = None
+depends_on = None
+
+
+table_versions = sa.table('table_versions',
+    sa.column('name', sa.String(length=50)),
+    sa.column('version', sa.BigInteger())
+)
+
+
+def upgrade():
+    op.bulk_insert(table_versions, [{'name': 'guests', 'version': 0}, {'name': 'bookings', 'version': 0}])
+
+
+def downgrade():
+    op.execute(table_versions.delete().where(table_versions.c.name.in_(['guests', 'bookings'])))
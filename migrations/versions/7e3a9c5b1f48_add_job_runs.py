@@ -0,0 +1,32 @@
+"""Add job_runs for claiming scheduled batch jobs across workers
+
+Revision ID: 7e3a9c5b1f48
+Revises: 4c8f1e6a2d93
+Create Date: 2026-10-18 20:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e3a9c5b1f48'
+down_revision = '4c8f1e6a2d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    job_runs = op.create_table('job_runs',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('last_run_on', sa.Date(), nullable=True),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.Column('last_result', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(job_runs, [{'name': 'booking_transitions', 'last_run_on': None, 'last_run_at': None,
+                               'last_result': None}])
+
+
+def downgrade():
+    op.drop_table('job_runs')
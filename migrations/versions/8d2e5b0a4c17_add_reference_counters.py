@@ -0,0 +1,29 @@
+"""Add reference_counters for block-allocated booking references
+
+Revision ID: 8d2e5b0a4c17
+Revises: 3f9a1c7d2e64
+Create Date: 2026-10-18 11:02:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e5b0a4c17'
+down_revision = '3f9a1c7d2e64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    reference_counters = op.create_table('reference_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('next_value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(reference_counters, [{'name': 'booking', 'next_value': 1}])
+
+
+def downgrade():
+    op.drop_table('reference_counters')
@@ -0,0 +1,77 @@
+"""Add normalized, indexed guest search columns
+
+Revision ID: 9b6e2d4f7c30
+Revises: 5a0d3e8b6f21
+Create Date: 2026-10-18 17:05:00.000000
+
+"""
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b6e2d4f7c30'
+down_revision = '5a0d3e8b6f21'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 5000
+
+
+# Frozen copy of app.guest_search.search_keys as of this revision
+def search_keys(full_name, email, phone):
+    decomposed = unicodedata.normalize('NFKD', full_name or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return {
+        'name_folded': ' '.join(stripped.casefold().split()),
+        'email_normalized': (email or '').strip().lower(),
+        'phone_digits': ''.join(ch for ch in (phone or '') if ch.isdigit()),
+    }
+
+
+def upgrade():
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('name_folded', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('email_normalized', sa.String(length=120), nullable=True))
+        batch_op.add_column(sa.Column('phone_digits', sa.String(length=20), nullable=True))
+
+    guests = sa.table('guests',
+        sa.column('id', sa.Integer()),
+        sa.column('full_name', sa.String()),
+        sa.column('email', sa.String()),
+        sa.column('phone', sa.String()),
+        sa.column('name_folded', sa.String()),
+        sa.column('email_normalized', sa.String()),
+        sa.column('phone_digits', sa.String())
+    )
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(guests.c.id, guests.c.full_name, guests.c.email, guests.c.phone)
+            .where(guests.c.id > last_id).order_by(guests.c.id).limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            guests.update().where(guests.c.id == sa.bindparam('guest_id')),
+            [dict(search_keys(full_name, email, phone), guest_id=guest_id)
+             for guest_id, full_name, email, phone in rows]
+        )
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.create_index('ix_guests_name_folded', ['name_folded'], unique=False)
+        batch_op.create_index('ix_guests_email_normalized', ['email_normalized'], unique=False)
+        batch_op.create_index('ix_guests_phone_digits', ['phone_digits'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.drop_index('ix_guests_phone_digits')
+        batch_op.drop_index('ix_guests_email_normalized')
+        batch_op.drop_index('ix_guests_name_folded')
+        batch_op.drop_column('phone_digits')
+        batch_op.drop_column('email_normalized')
+        batch_op.drop_column('name_folded')
@@ -0,0 +1,29 @@
+"""Add table_versions for cross-process cache invalidation
+
+Revision ID: e27b4f9c1a58
+Revises: c61f0e9b7a35
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e27b4f9c1a58'
+down_revision = 'c61f0e9b7a35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    table_versions = op.create_table('table_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(table_versions, [{'name': 'rooms', 'version': 0}])
+
+
+def downgrade():
+    op.drop_table('table_versions')
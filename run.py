@@ -1,10 +1,17 @@
 # run.py
+import os
 
 from app import create_app, db
 from flask_migrate import Migrate
+from app.transitions import start_scheduler
 
-app = create_app()
-migrate = Migrate(app, db)
+# Spawned PDF render workers re-import this script as __mp_main__; only the real process builds the app
+if __name__ != '__mp_main__':
+    app = create_app()
+    migrate = Migrate(app, db)
 
 if __name__ == '__main__':
+    # debug=True runs the reloader; only its child process serves requests and runs the scheduler
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_scheduler(app)
     app.run(debug=True)
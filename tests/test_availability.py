@@ -0,0 +1,48 @@
+# tests/test_availability.py
+import pytest
+from tests.conftest import add_booking, day
+
+
+@pytest.fixture(params=['sql', 'index', 'matrix'])
+def backend_app(request, make_app):
+    return make_app(rooms=3, AVAILABILITY_BACKEND=request.param)
+
+
+def available(client, **payload):
+    payload.setdefault('check_in_date', day(1).isoformat())
+    payload.setdefault('check_out_date', day(3).isoformat())
+    return client.post('/available_rooms', json=payload)
+
+
+def test_available_rooms_excludes_overlapping_bookings(backend_app):
+    with backend_app.app_context():
+        add_booking(1, day(2), day(4))
+        add_booking(2, day(3), day(5))
+    response = available(backend_app.test_client())
+    assert response.status_code == 200
+    assert [room['id'] for room in response.get_json()['rooms']] == [2, 3]
+
+
+def test_excluded_booking_frees_its_own_room(backend_app):
+    with backend_app.app_context():
+        booking_id = add_booking(1, day(1), day(3)).id
+    client = backend_app.test_client()
+    for value in (booking_id, str(booking_id)):
+        response = available(client, exclude_booking_id=value, current_room_id=1)
+        assert response.status_code == 200
+        rooms = response.get_json()['rooms']
+        assert [room['id'] for room in rooms] == [1, 2, 3]
+        assert rooms[0]['is_current']
+
+
+@pytest.mark.parametrize('value', ['abc', '1.5', [1], True])
+def test_malformed_exclude_booking_id_is_rejected(client, value):
+    response = available(client, exclude_booking_id=value)
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'INVALID_INPUT'
+
+
+def test_empty_exclude_booking_id_is_ignored(client):
+    response = available(client, exclude_booking_id='')
+    assert response.status_code == 200
+    assert len(response.get_json()['rooms']) == 6
@@ -0,0 +1,62 @@
+# tests/test_availability_calendar.py
+from datetime import date, timedelta
+from app import availability_calendar
+from app.availability_calendar import CALENDAR_HORIZON_DAYS, MAX_CALENDAR_DAYS, CalendarCache
+from tests.conftest import add_booking, day
+
+
+def calendar(client, **params):
+    return client.get('/availability/calendar', query_string=params)
+
+
+def test_calendar_counts_free_rooms_and_lowest_price(app, guest_client):
+    with app.app_context():
+        add_booking(1, day(1), day(3))
+    response = calendar(guest_client, start=day(0).isoformat(), days=4)
+    assert response.status_code == 200
+    days = response.get_json()['calendar']
+    assert [entry['date'] for entry in days] == [day(i).isoformat() for i in range(4)]
+    assert [entry['room_types']['Single']['available'] for entry in days] == [2, 1, 1, 2]
+    assert days[1]['room_types']['Single']['lowest_price'] == 100.0
+    assert days[1]['room_types']['Suite'] == {'available': 2, 'lowest_price': 250.0}
+
+
+def test_calendar_rejects_starts_past_the_horizon(guest_client):
+    for start in ('9999-12-20', (date.today() + timedelta(days=CALENDAR_HORIZON_DAYS + 1)).isoformat()):
+        response = calendar(guest_client, start=start, days=31)
+        assert response.status_code == 400
+        assert response.get_json()['code'] == 'INVALID_RANGE'
+    last = (date.today() + timedelta(days=CALENDAR_HORIZON_DAYS)).isoformat()
+    assert calendar(guest_client, start=last, days=MAX_CALENDAR_DAYS).status_code == 200
+
+
+def test_calendar_validates_days(guest_client):
+    assert calendar(guest_client, days=0).status_code == 400
+    assert calendar(guest_client, days=MAX_CALENDAR_DAYS + 1).status_code == 400
+    assert calendar(guest_client, start='soon').get_json()['code'] == 'INVALID_INPUT'
+
+
+def test_calendar_cache_is_bounded(app, monkeypatch):
+    cache = CalendarCache(size=3)
+    computed = []
+    monkeypatch.setattr(availability_calendar, 'compute_calendar',
+                        lambda start, days: computed.append((start, days)) or [])
+    with app.app_context():
+        for offset in range(10):
+            cache.get(day(offset), 7)
+        assert len(cache) == 3
+        # Recently used grids stay cached; the oldest were evicted
+        cache.get(day(9), 7)
+        cache.get(day(0), 7)
+    assert computed == [(day(offset), 7) for offset in range(10)] + [(day(0), 7)]
+
+
+def test_bookings_clear_the_calendar_cache(app, guest_client):
+    def free_doubles():
+        days = calendar(guest_client, start=day(0).isoformat(), days=3).get_json()['calendar']
+        return [entry['room_types']['Double']['available'] for entry in days]
+
+    assert free_doubles() == [2, 2, 2]
+    with app.app_context():
+        add_booking(2, day(1), day(2))
+    assert free_doubles() == [2, 1, 2]
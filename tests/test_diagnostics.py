@@ -0,0 +1,18 @@
+# tests/test_diagnostics.py
+from sqlite3 import OperationalError
+from app.database import lock_retry
+
+
+def test_query_diagnostics_after_unmatched_request(client):
+    assert client.get('/no-such-page').status_code == 404
+    response = client.get('/receptionist/diagnostics/queries')
+    assert response.status_code == 200
+    assert '<unmatched>' in response.get_json()['endpoints']
+
+
+def test_lock_failures_outside_a_request_are_labelled(client, app):
+    with app.app_context():
+        assert not lock_retry.should_retry(OperationalError('database is locked'), lock_retry.attempts - 1)
+    response = client.get('/receptionist/diagnostics/queries')
+    assert response.status_code == 200
+    assert response.get_json()['lock_retry']['failures']['<no request>'] >= 1
@@ -0,0 +1,51 @@
+# tests/test_documents.py
+import os
+from reportlab import rl_config
+from app.documents import booking_document_data, document_path
+from app.extensions import db
+from app.pdf_render import render_document
+from tests.conftest import add_booking, day
+
+
+def test_render_document_replaces_older_versions(app, tmp_path):
+    with app.app_context():
+        booking = add_booking(1, day(1), day(3))
+        data = booking_document_data(booking.id, app.config)
+        first = render_document('invoice', data, document_path(str(tmp_path), 'invoice', data))
+        changed = dict(data, payment_status='paid')
+        second = render_document('invoice', changed, document_path(str(tmp_path), 'invoice', changed))
+    assert first != second
+    assert not os.path.exists(first)
+    with open(second, 'rb') as pdf:
+        assert pdf.read(4) == b'%PDF'
+
+
+def test_invoice_is_dated_from_the_booking(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(rl_config, 'pageCompression', 0)
+    with app.app_context():
+        booking = add_booking(1, day(1), day(3))
+        data = booking_document_data(booking.id, app.config)
+    with open(render_document('invoice', data, document_path(str(tmp_path), 'invoice', data)), 'rb') as pdf:
+        content = pdf.read()
+    assert b'(Issued)' in content
+    assert f"({day(3).isoformat()})".encode() in content
+    assert f"({day(0).isoformat()})".encode() not in content
+
+
+def test_document_route_renders_in_the_pool(make_app):
+    app = make_app(rooms=1, DOCUMENT_RENDER_WAIT_SECONDS=60)
+    with app.app_context():
+        booking_id = add_booking(1, day(1), day(2)).id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['role'] = 'receptionist'
+
+    response = client.get(f'/receptionist/booking/{booking_id}/confirmation.pdf')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
+    assert response.data.startswith(b'%PDF')
+    response.close()
+    assert client.get(f'/receptionist/booking/{booking_id}/receipt.pdf').status_code == 404
+    assert client.get('/receptionist/booking/999/invoice.pdf').status_code == 404
+    with app.app_context():
+        db.engine.dispose()
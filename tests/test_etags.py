@@ -0,0 +1,40 @@
+# tests/test_etags.py
+from app.extensions import db
+from app.models import Room
+from tests.conftest import add_booking, day
+
+
+def test_unchanged_tables_answer_304(client):
+    first = client.get('/receptionist/rooms')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    again = client.get('/receptionist/rooms', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.headers['ETag'] == etag
+    assert again.data == b''
+
+
+def test_writes_change_the_etag(client, app):
+    etag = client.get('/receptionist/rooms').headers['ETag']
+    with app.app_context():
+        db.session.get(Room, 1).price = 99.0
+        db.session.commit()
+    changed = client.get('/receptionist/rooms', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+
+def test_etag_covers_only_the_listed_tables_and_the_url(client, app):
+    rooms_etag = client.get('/receptionist/rooms').headers['ETag']
+    page_etag = client.get('/receptionist/rooms?page=1').headers['ETag']
+    assert page_etag != rooms_etag
+    with app.app_context():
+        add_booking(1, day(1), day(2))
+    assert client.get('/receptionist/rooms', headers={'If-None-Match': rooms_etag}).status_code == 304
+
+
+def test_unauthorized_requests_get_no_etag(guest_client):
+    response = guest_client.get('/receptionist/rooms')
+    assert response.status_code == 401
+    assert 'ETag' not in response.headers
@@ -0,0 +1,76 @@
+# tests/test_events.py
+import pytest
+from flask import session
+from app.events import REPLAY_BUFFER_SIZE, SUBSCRIBER_QUEUE_SIZE, EventBroker, broker
+from app.routes.dashboard_routes import dashboard_events
+
+
+def test_unstreamed_response_leaves_no_subscriber(app):
+    before = broker.subscriber_count()
+    with app.test_request_context('/receptionist/events'):
+        session['role'] = 'receptionist'
+        response = dashboard_events()
+        assert response.status_code == 200
+        assert broker.subscriber_count() == before
+        chunks = response.iter_encoded()
+        assert next(chunks) == b'retry: 3000\n\n'
+        assert broker.subscriber_count() == before + 1
+        response.close()
+    assert broker.subscriber_count() == before
+
+
+def drained(subscriber):
+    events = []
+    while not subscriber.empty():
+        events.append(subscriber.get_nowait())
+    return events
+
+
+def test_publish_reaches_every_subscriber():
+    events = EventBroker()
+    first, second = events.subscribe(), events.subscribe()
+    events.publish('rooms', {})
+    assert drained(first) == drained(second) == [(1, 'rooms', {})]
+    events.unsubscribe(first)
+    events.publish('rooms', {})
+    assert drained(first) == []
+    assert drained(second) == [(2, 'rooms', {})]
+
+
+def test_reconnect_replays_missed_events():
+    events = EventBroker()
+    for number in range(3):
+        events.publish('booking', {'id': number})
+    assert [event[0] for event in drained(events.subscribe(last_event_id=1))] == [2, 3]
+    assert drained(events.subscribe(last_event_id=3)) == []
+
+
+@pytest.mark.parametrize('last_event_id', [-5, 0, REPLAY_BUFFER_SIZE + 10])
+def test_reconnect_outside_the_buffer_gets_resync(last_event_id):
+    events = EventBroker()
+    for number in range(REPLAY_BUFFER_SIZE + 3):
+        events.publish('booking', {'id': number})
+    assert drained(events.subscribe(last_event_id)) == [(REPLAY_BUFFER_SIZE + 3, 'resync', {})]
+
+
+def test_reconnect_after_restart_gets_resync():
+    events = EventBroker()
+    assert drained(events.subscribe(last_event_id=12)) == [(0, 'resync', {})]
+    assert drained(events.subscribe(last_event_id=0)) == []
+    events.publish('rooms', {})
+    assert drained(events.subscribe(last_event_id=5)) == [(1, 'resync', {})]
+
+
+def test_backlog_larger_than_the_queue_gets_resync():
+    events = EventBroker()
+    for number in range(SUBSCRIBER_QUEUE_SIZE + 1):
+        events.publish('booking', {'id': number})
+    assert drained(events.subscribe(last_event_id=0)) == [(SUBSCRIBER_QUEUE_SIZE + 1, 'resync', {})]
+
+
+def test_slow_subscriber_is_reset_with_resync():
+    events = EventBroker()
+    subscriber = events.subscribe()
+    for number in range(SUBSCRIBER_QUEUE_SIZE + 1):
+        events.publish('booking', {'id': number})
+    assert drained(subscriber) == [(SUBSCRIBER_QUEUE_SIZE + 1, 'resync', {})]
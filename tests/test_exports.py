@@ -0,0 +1,44 @@
+# tests/test_exports.py
+import csv
+import io
+from openpyxl import load_workbook
+from app.extensions import db
+from app.exports import EXPORT_COLUMNS, spreadsheet_text
+from tests.conftest import add_booking, day
+
+PAYLOAD = '=HYPERLINK("http://evil","x")'
+
+
+def add_hostile_booking(app):
+    with app.app_context():
+        booking = add_booking(1, day(1), day(3), email='evil@example.com')
+        booking.guest.full_name = PAYLOAD
+        db.session.commit()
+
+
+def test_spreadsheet_text():
+    for value in ('=1+1', '+1', '-1', '@SUM(A1)', '\tx', '\rx'):
+        assert spreadsheet_text(value) == "'" + value
+    assert spreadsheet_text('Ama Mensah') == 'Ama Mensah'
+    assert spreadsheet_text(-1) == -1
+
+
+def test_csv_export_writes_formulas_as_text(app, client):
+    add_hostile_booking(app)
+    response = client.get('/receptionist/bookings/export?format=csv')
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip('\ufeff'))))
+    assert rows[0] == list(EXPORT_COLUMNS)
+    assert rows[1][2] == "'" + PAYLOAD
+    assert rows[1][3] == 'evil@example.com'
+
+
+def test_xlsx_export_writes_formulas_as_text(app, client):
+    add_hostile_booking(app)
+    response = client.get('/receptionist/bookings/export?format=xlsx')
+    assert response.status_code == 200
+    sheet = load_workbook(io.BytesIO(response.data))['Bookings']
+    guest = sheet.cell(row=2, column=3)
+    assert guest.data_type == 's'
+    assert guest.value == "'" + PAYLOAD
+    assert sheet.cell(row=2, column=9).value == 2
@@ -0,0 +1,66 @@
+# tests/test_guest_search.py
+from flask_migrate import Migrate, upgrade
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from app.models import Guest, GuestNameToken
+from tests.conftest import MIGRATIONS, make_config
+
+
+def add_guest(full_name, email, phone='0200000000'):
+    guest = Guest(full_name=full_name, email=email, phone=phone)
+    db.session.add(guest)
+    db.session.commit()
+    return guest
+
+
+def search(client, q, **params):
+    response = client.get('/receptionist/guests/search', query_string=dict(params, q=q, fields='id,name'))
+    assert response.status_code == 200
+    return sorted(guest['name'] for guest in response.get_json()['guests'])
+
+
+def test_search_by_first_name_surname_email_and_phone(app, client):
+    with app.app_context():
+        add_guest('John Smith', 'jsmith@example.com', '+233 24 123 4567')
+        add_guest('José Núñez', 'jose@example.com', '0201112222')
+        add_guest('Akosua Smithson', 'akosua@example.com', '0203334444')
+    assert search(client, 'john') == ['John Smith']
+    assert search(client, 'smith') == ['Akosua Smithson', 'John Smith']
+    assert search(client, 'NUNEZ') == ['José Núñez']
+    assert search(client, 'john smi') == ['John Smith']
+    assert search(client, 'akosua@') == ['Akosua Smithson']
+    assert search(client, '+233 24') == ['John Smith']
+    assert search(client, 's') == []
+
+
+def test_name_tokens_follow_renames_and_deletes(app, client):
+    with app.app_context():
+        guest = add_guest('Ama Mensah', 'ama@example.com')
+        guest_id = guest.id
+        guest.full_name = 'Ama Owusu'
+        db.session.commit()
+        assert {token.token for token in GuestNameToken.query} == {'ama', 'owusu'}
+    assert search(client, 'owusu') == ['Ama Owusu']
+    assert search(client, 'mensah') == []
+    with app.app_context():
+        db.session.delete(db.session.get(Guest, guest_id))
+        db.session.commit()
+        assert GuestNameToken.query.count() == 0
+
+
+def test_migrations_backfill_search_keys_and_tokens(tmp_path):
+    app = create_app(make_config(tmp_path))
+    Migrate(app, db)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS, revision='5a0d3e8b6f21')
+        db.session.execute(text("INSERT INTO guests (full_name, email, phone) "
+                                "VALUES ('Kofi  Ánnan', 'Kofi@Example.com ', '024-555-0101')"))
+        db.session.commit()
+        upgrade(directory=MIGRATIONS)
+        row = db.session.execute(text("SELECT name_folded, email_normalized, phone_digits FROM guests")).one()
+        assert tuple(row) == ('kofi annan', 'kofi@example.com', '0245550101')
+        tokens = db.session.execute(text("SELECT token FROM guest_name_tokens ORDER BY token")).scalars().all()
+        assert tokens == ['annan', 'kofi']
+        db.session.remove()
+        db.engine.dispose()
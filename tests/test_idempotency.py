@@ -0,0 +1,48 @@
+# tests/test_idempotency.py
+import time
+import pytest
+from app import idempotency
+from app.models import Booking, IdempotencyKey
+from tests.conftest import day
+
+
+def booking_payload(request_id, room_id=1):
+    return {
+        'full_name': 'Ama Mensah', 'email': 'ama@example.com', 'phone': '0241234567', 'room_id': room_id,
+        'check_in_date': day(1).isoformat(), 'check_out_date': day(3).isoformat(), 'request_id': request_id
+    }
+
+
+def test_retried_request_replays_the_first_response(app, guest_client):
+    first = guest_client.post('/create_booking', json=booking_payload('req-1'))
+    assert first.status_code == 200
+    retry = guest_client.post('/create_booking', json=booking_payload('req-1'))
+    assert retry.status_code == 200
+    assert retry.get_json() == first.get_json()
+    with app.app_context():
+        assert Booking.query.count() == 1
+
+
+def test_replay_survives_the_in_process_cache(app, guest_client, monkeypatch):
+    first = guest_client.post('/create_booking', json=booking_payload('req-2')).get_json()
+    monkeypatch.setattr(idempotency, '_cache', idempotency.ResponseCache())
+    with app.app_context():
+        assert idempotency.replay_response('create_booking', 'req-2') == (first, 200)
+        assert idempotency.replay_response('create_walkin_booking', 'req-2') is None
+
+
+@pytest.fixture
+def expiring_app(make_app, monkeypatch):
+    # Keys expire as soon as they are written, and the periodic purge never runs
+    monkeypatch.setattr(idempotency, '_last_purge', time.monotonic())
+    return make_app(rooms=2, IDEMPOTENCY_KEY_TTL_HOURS=-1)
+
+
+def test_expired_unpurged_key_is_reused(expiring_app):
+    client = expiring_app.test_client()
+    assert client.post('/create_booking', json=booking_payload('req-3', room_id=1)).status_code == 200
+    second = client.post('/create_booking', json=booking_payload('req-3', room_id=2))
+    assert second.status_code == 200
+    with expiring_app.app_context():
+        assert Booking.query.count() == 2
+        assert IdempotencyKey.query.count() == 1
@@ -0,0 +1,18 @@
+# tests/test_metrics.py
+from prometheus_client.parser import text_string_to_metric_families
+
+
+def request_count(client, endpoint):
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    for family in text_string_to_metric_families(response.get_data(as_text=True)):
+        if family.name == 'hotel_request_duration_seconds':
+            return sum(sample.value for sample in family.samples
+                       if sample.name.endswith('_count') and sample.labels['endpoint'] == endpoint)
+    return 0
+
+
+def test_metrics_counts_requests_by_endpoint(client):
+    before = request_count(client, 'dashboard.get_rooms')
+    assert client.get('/receptionist/rooms').status_code == 200
+    assert request_count(client, 'dashboard.get_rooms') == before + 1
@@ -0,0 +1,76 @@
+# tests/test_occupancy.py
+import pytest
+from app.extensions import db
+from app.occupancy import OccupancyMatrix
+from app.routes.booking import MAX_FLEXIBLE_NIGHTS, MAX_FLEXIBLE_RANGES
+from tests.conftest import add_booking, day
+
+STATUSES = ('booked', 'checked-in')
+
+
+@pytest.fixture
+def matrix_app(make_app):
+    return make_app(rooms=3, AVAILABILITY_BACKEND='matrix', OCCUPANCY_HORIZON_DAYS=30)
+
+
+def test_matrix_marks_booked_nights(app):
+    with app.app_context():
+        booking = add_booking(1, day(2), day(4))
+        add_booking(2, day(0), day(1), status='cancelled')
+        matrix = OccupancyMatrix(30, STATUSES)
+        matrix.load()
+        rooms = [1, 2, 3]
+        assert matrix.free_room_ids(rooms, day(0), day(2)) == [1, 2, 3]
+        assert matrix.free_room_ids(rooms, day(3), day(5)) == [2, 3]
+        assert matrix.free_room_ids(rooms, day(4), day(6)) == [1, 2, 3]
+        assert matrix.free_room_ids(rooms, day(1), day(5), exclude_booking_id=booking.id) == [1, 2, 3]
+        # Outside the horizon the caller falls back to SQL
+        assert matrix.free_room_ids(rooms, day(29), day(31)) is None
+        assert matrix.free_room_ids_for_ranges(rooms, [(day(1), day(3)), (day(4), day(5)), (day(40), day(41))]) \
+            == [[2, 3], [1, 2, 3], None]
+
+
+def test_matrix_follows_committed_changes(matrix_app):
+    with matrix_app.app_context():
+        matrix = matrix_app.extensions['occupancy_matrix']
+        matrix.load()
+        booking = add_booking(3, day(1), day(3))
+        assert matrix.free_room_ids([1, 2, 3], day(1), day(2)) == [1, 2]
+        booking.status = 'cancelled'
+        db.session.commit()
+        assert matrix.free_room_ids([1, 2, 3], day(1), day(2)) == [1, 2, 3]
+
+
+def flexible(client, **payload):
+    payload.setdefault('check_in_from', day(1).isoformat())
+    payload.setdefault('check_in_to', day(3).isoformat())
+    payload.setdefault('nights', 2)
+    return client.post('/search_rooms/flexible', json=payload)
+
+
+def test_flexible_search_matches_per_range_search(matrix_app):
+    with matrix_app.app_context():
+        add_booking(1, day(2), day(3))
+    response = flexible(matrix_app.test_client())
+    assert response.status_code == 200
+    options = response.get_json()['options']
+    assert [option['room_ids'] for option in options] == [[2, 3], [2, 3], [1, 2, 3]]
+
+
+@pytest.mark.parametrize('payload', [
+    {'nights': 10 ** 9},
+    {'nights': MAX_FLEXIBLE_NIGHTS + 1},
+    {'nights': 0},
+    {'check_in_to': day(MAX_FLEXIBLE_RANGES + 1).isoformat()},
+    {'check_in_to': '9999-12-31'},
+])
+def test_flexible_search_rejects_oversized_requests(client, payload):
+    response = flexible(client, **payload)
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'INVALID_RANGE'
+
+
+def test_flexible_search_rejects_dates_past_the_calendar(client):
+    response = flexible(client, check_in_from='9999-12-30', check_in_to='9999-12-31', nights=5)
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'INVALID_RANGE'
@@ -0,0 +1,70 @@
+# tests/test_pagination.py
+import pytest
+from app.extensions import db
+from app.models import Room
+from app.pagination import InvalidCursor, count_cache, decode_cursor, encode_cursor, keyset_paginate
+from tests.conftest import add_booking, day
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42, 'prev')) == (42, 'prev')
+    with pytest.raises(InvalidCursor):
+        decode_cursor('not-a-cursor')
+
+
+def test_keyset_pages_walk_forward_and_back(app):
+    with app.app_context():
+        first = keyset_paginate(Room.query, Room.id, 4)
+        assert [room.id for room in first['items']] == [1, 2, 3, 4]
+        assert first['prev_cursor'] is None
+        second = keyset_paginate(Room.query, Room.id, 4, first['next_cursor'])
+        assert [room.id for room in second['items']] == [5, 6]
+        assert second['next_cursor'] is None
+        back = keyset_paginate(Room.query, Room.id, 4, second['prev_cursor'])
+        assert [room.id for room in back['items']] == [1, 2, 3, 4]
+
+
+def test_keyset_descending(app):
+    with app.app_context():
+        page = keyset_paginate(Room.query, Room.id, 4, descending=True)
+        assert [room.id for room in page['items']] == [6, 5, 4, 3]
+        rest = keyset_paginate(Room.query, Room.id, 4, page['next_cursor'], descending=True)
+        assert [room.id for room in rest['items']] == [2, 1]
+
+
+def test_page_totals_follow_added_rooms(client):
+    assert client.get('/receptionist/rooms?page=1').get_json()['pagination']['total_items'] == 6
+    response = client.post('/receptionist/room/add', json={'room_number': '201', 'room_type': 'Suite', 'price': 300})
+    assert response.status_code == 200
+    assert client.get('/receptionist/rooms?page=1').get_json()['pagination']['total_items'] == 7
+
+
+def test_cursor_totals_only_on_demand_and_never_stale(client):
+    body = client.get('/receptionist/rooms?cursor=').get_json()
+    assert 'total_items' not in body['pagination']
+    assert client.get('/receptionist/rooms?cursor=&include_total=1').get_json()['pagination']['total_items'] == 6
+    client.post('/receptionist/room/add', json={'room_number': '202', 'room_type': 'Single', 'price': 90})
+    assert client.get('/receptionist/rooms?cursor=&include_total=1').get_json()['pagination']['total_items'] == 7
+
+
+def test_count_cache_tracks_table_versions(app):
+    with app.app_context():
+        add_booking(1, day(1), day(3))
+        query = Room.query.filter(Room.price > 0)
+        assert count_cache.count(query) == 6
+        db.session.add(Room(room_number='301', room_type='Double', price=120, status='available'))
+        db.session.commit()
+        assert count_cache.count(query) == 7
+
+
+def test_count_cache_is_bounded(app):
+    with app.app_context():
+        for price in range(count_cache.max_entries + 10):
+            count_cache.count(Room.query.filter(Room.price > price))
+        assert len(count_cache._counts) <= count_cache.max_entries
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get('/receptionist/rooms?cursor=garbage')
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'INVALID_CURSOR'
@@ -0,0 +1,62 @@
+# tests/test_priorities.py
+from datetime import date
+import pytest
+from app.extensions import db
+from app.models import Booking
+from app.priorities import METRICS, compute_priorities, current_priorities, matches
+from tests.conftest import add_booking, day
+
+
+def add_mixed_bookings():
+    add_booking(1, day(0), day(2))
+    add_booking(2, day(-2), day(0), status='checked-in', payment_status='paid')
+    add_booking(3, day(-1), day(1), status='checked-in')
+    add_booking(4, day(3), day(5))
+    add_booking(5, day(10), day(12), payment_status='paid')
+    add_booking(6, day(-5), day(-3), status='checked-out', payment_status='paid')
+    add_booking(1, day(4), day(6), status='cancelled')
+
+
+def expected_counts():
+    counts = dict.fromkeys(METRICS, 0)
+    for booking in Booking.query:
+        for name, hit in matches(booking, date.today()).items():
+            counts[name] += hit
+    return counts
+
+
+@pytest.fixture
+def counter_app(make_app):
+    return make_app(PRIORITIES_COUNTER_CACHE=True, PRIORITIES_RESYNC_SECONDS=3600)
+
+
+def test_aggregate_matches_python_mirror(app):
+    with app.app_context():
+        add_mixed_bookings()
+        counts = compute_priorities()
+        assert counts == expected_counts()
+        assert counts == {'check_ins_today': 1, 'check_outs_today': 1, 'overdue_payments': 2, 'recent_bookings': 7,
+                          'upcoming_checkins': 2, 'total_bookings_today': 3}
+
+
+def test_counters_follow_committed_changes(counter_app):
+    with counter_app.app_context():
+        add_mixed_bookings()
+        assert current_priorities() == compute_priorities()
+        arriving = Booking.query.filter_by(room_id=1, status='booked').one()
+        arriving.status = 'checked-in'
+        staying = Booking.query.filter_by(room_id=3).one()
+        staying.payment_status = 'paid'
+        db.session.delete(Booking.query.filter_by(room_id=4).one())
+        db.session.commit()
+        add_booking(6, day(0), day(1))
+        # Served from the in-process counters: the resync interval has not passed
+        assert current_priorities() == compute_priorities() == expected_counts()
+
+
+def test_priorities_route(client, app):
+    with app.app_context():
+        add_mixed_bookings()
+    response = client.get('/receptionist/priorities')
+    assert response.status_code == 200
+    assert response.get_json()['check_ins_today'] == 1
@@ -0,0 +1,25 @@
+# tests/test_query_plans.py
+import pytest
+from app.query_plans import check_hot_query_plans, full_scans
+
+
+@pytest.fixture
+def migrated_app(make_app):
+    return make_app(rooms=0, migrate=True)
+
+
+def test_full_scans_only_passes_searches():
+    assert full_scans([
+        'SEARCH bookings USING INDEX ix_bookings_status_id (status=?)',
+        'USE TEMP B-TREE FOR ORDER BY',
+    ]) == []
+    assert full_scans(['SCAN bookings']) == ['SCAN bookings']
+    assert full_scans(['SCAN bookings USING INDEX ix_bookings_status_id']) == \
+        ['SCAN bookings USING INDEX ix_bookings_status_id']
+    assert full_scans(['SCAN booking_reference_grams']) == ['SCAN booking_reference_grams']
+
+
+def test_hot_queries_use_indexes_on_migrated_schema(migrated_app):
+    with migrated_app.app_context():
+        failures = {name: plan for name, (plan, scans) in check_hot_query_plans().items() if scans}
+    assert failures == {}
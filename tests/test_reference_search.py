@@ -0,0 +1,52 @@
+# tests/test_reference_search.py
+import pytest
+from sqlalchemy import false
+from app import reference_search
+from app.models import Booking
+from app.reference_search import (canonical_reference, normalize_reference_query, reference_filter, reference_grams,
+                                  selective_grams)
+from tests.conftest import add_booking, day
+
+
+def test_normalize_and_canonical_reference():
+    assert normalize_reference_query(' pl-1234 ') == ('PL', '1234')
+    assert normalize_reference_query('1234') == ('', '1234')
+    assert normalize_reference_query('PLX12') is None
+    assert canonical_reference('pl 0000001-8') == 'PL00000018'
+    assert reference_grams('PL00000018') == {'000', '001', '018'}
+
+
+def matches(value, substring=True):
+    condition = reference_filter(value, substring)
+    query = Booking.query if condition is None else Booking.query.filter(condition)
+    return sorted(booking.booking_reference for booking in query)
+
+
+@pytest.fixture
+def references(app):
+    with app.app_context():
+        for i in range(12):
+            add_booking(i % 6 + 1, day(2 * i), day(2 * i + 1))
+        yield sorted(booking.booking_reference for booking in Booking.query)
+
+
+def test_prefix_and_substring_search(app, references):
+    with app.app_context():
+        assert matches('PL000001') == [ref for ref in references if ref.startswith('PL000001')]
+        assert matches(references[10][-4:]) == [ref for ref in references if references[10][-4:] in ref]
+        assert matches(references[10][-4:], substring=False) == []
+        assert matches('pl') == references
+        assert matches('no such') == []
+        assert reference_filter('PLX') is not None and str(reference_filter('PLX')) == str(false())
+
+
+def test_common_grams_are_not_intersected(app, references, monkeypatch):
+    with app.app_context():
+        # With a threshold below the booking count, '000' (on every reference) is not selective
+        monkeypatch.setattr(reference_search, 'MAX_GRAM_POSTINGS', 5)
+        assert selective_grams({'000', references[3][-3:]}, 5) == [references[3][-3:]]
+        assert selective_grams({'000'}, 5) == []
+        assert 'booking_reference_grams' not in str(reference_filter('0000'))
+        assert 'booking_reference_grams' in str(reference_filter(references[3][-4:]))
+        assert matches('0000') == references
+        assert matches(references[3][-4:]) == [ref for ref in references if references[3][-4:] in ref]
@@ -0,0 +1,54 @@
+# tests/test_references.py
+import pytest
+from app.extensions import db
+from app.models import Booking, JobRun, ReferenceCounter, TableVersion
+from app.references import MAX_SERIAL, encode_reference, is_valid_booking_reference, luhn_check_digit
+from tests.conftest import add_booking, day
+
+
+def test_luhn_check_digit():
+    assert luhn_check_digit('7992739871') == '3'
+    assert encode_reference(1) == 'PL00000018'
+    assert is_valid_booking_reference('PL00000018')
+    assert is_valid_booking_reference('PL12345')
+    assert not is_valid_booking_reference('PL00000017')
+    assert not is_valid_booking_reference('PL0000001')
+    with pytest.raises(ValueError):
+        encode_reference(MAX_SERIAL + 1)
+
+
+def test_any_single_digit_typo_is_caught():
+    reference = encode_reference(4242)
+    for i in range(2, len(reference)):
+        for digit in '0123456789':
+            if digit != reference[i]:
+                assert not is_valid_booking_reference(reference[:i] + digit + reference[i + 1:])
+
+
+def test_create_all_seeds_the_rows_migrations_seed(app):
+    with app.app_context():
+        assert db.session.get(ReferenceCounter, 'booking') is not None
+        assert {row.name for row in TableVersion.query} == {'rooms', 'guests', 'bookings'}
+        assert db.session.get(JobRun, 'booking_transitions') is not None
+
+
+def test_bookings_get_sequential_valid_references(app):
+    app.config['BOOKING_REFERENCE_BLOCK_SIZE'] = 2
+    with app.app_context():
+        references = [add_booking(i % 6 + 1, day(2 * i), day(2 * i + 1)).booking_reference for i in range(5)]
+        assert references == [encode_reference(serial) for serial in range(1, 6)]
+        assert db.session.get(ReferenceCounter, 'booking').next_value == 7
+
+
+def test_rolled_back_block_is_dropped(app):
+    app.config['BOOKING_REFERENCE_BLOCK_SIZE'] = 2
+    with app.app_context():
+        guest = add_booking(1, day(1), day(2)).guest
+        db.session.add(Booking(guest=guest, room_id=2, check_in_date=day(1), check_out_date=day(2),
+                               status='booked', payment_status='pending'))
+        db.session.flush()
+        db.session.rollback()
+        # Serial 2 came from the committed pool and is skipped; nothing is handed out twice
+        references = [add_booking(3 + i, day(1), day(2)).booking_reference for i in range(3)]
+        assert references == [encode_reference(serial) for serial in range(3, 6)]
+        assert Booking.query.count() == 4
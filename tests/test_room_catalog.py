@@ -0,0 +1,39 @@
+# tests/test_room_catalog.py
+from app.extensions import db
+from app.models import Room
+from app.room_catalog import RoomCatalog, get_room_catalog
+
+
+def room_numbers(catalog):
+    return [room.room_number for room in catalog.rooms()]
+
+
+def test_catalog_follows_room_writes_through_table_versions(app):
+    with app.app_context():
+        # A catalog the commit signal never reaches, like the one in another process
+        other = RoomCatalog(check_seconds=0)
+        assert room_numbers(other) == ['101', '102', '103', '104', '105', '106']
+        db.session.add(Room(room_number='201', room_type='Suite', price=300.0, status='available'))
+        db.session.commit()
+        assert room_numbers(other)[-1] == '201'
+        db.session.get(Room, 1).price = 120.0
+        db.session.commit()
+        assert other.get(1).price == 120.0
+        db.session.delete(db.session.get(Room, 2))
+        db.session.commit()
+        assert other.get(2) is None
+        assert '102' not in room_numbers(other)
+
+
+def test_room_routes_refresh_the_catalog(client, app):
+    with app.app_context():
+        assert len(get_room_catalog().rooms()) == 6
+    response = client.post('/receptionist/room/add', json={'room_number': '201', 'room_type': 'Suite', 'price': 300})
+    assert response.status_code == 200
+    room_id = response.get_json()['room']['id']
+    with app.app_context():
+        assert get_room_catalog().get(room_id).room_number == '201'
+    assert client.post(f'/receptionist/room/delete/{room_id}').status_code == 200
+    with app.app_context():
+        assert get_room_catalog().get(room_id) is None
+        assert len(get_room_catalog().rooms()) == 6
@@ -0,0 +1,18 @@
+# tests/test_slow_queries.py
+from app.slow_queries import slow_query_log
+
+
+def test_slow_queries_outside_a_request_are_reported(make_app):
+    slow_query_log.reset()
+    try:
+        app = make_app(rooms=1, SLOW_QUERY_THRESHOLD_MS=0)
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['role'] = 'receptionist'
+        assert client.get('/receptionist/rooms').status_code == 200
+        response = client.get('/receptionist/diagnostics/slow_queries')
+        assert response.status_code == 200
+        routes = {route for entry in response.get_json()['statements'] for route in entry['routes']}
+        assert {'<no request>', 'dashboard.get_rooms'} <= routes
+    finally:
+        slow_query_log.reset()
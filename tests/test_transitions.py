@@ -0,0 +1,63 @@
+# tests/test_transitions.py
+import threading
+from app import create_app
+from app.extensions import db
+from app.models import Booking, Room
+from app.transitions import apply_transitions, start_scheduler
+from tests.conftest import add_booking, day, make_config
+
+
+def statuses(*bookings):
+    return [db.session.get(Booking, booking.id).status for booking in bookings]
+
+
+def test_daily_transitions(app):
+    with app.app_context():
+        no_show = add_booking(1, day(-2), day(1))
+        arriving = add_booking(2, day(0), day(2))
+        paid_overdue = add_booking(3, day(-3), day(-1), status='checked-in', payment_status='paid')
+        unpaid_overdue = add_booking(4, day(-3), day(-1), status='checked-in')
+        staying = add_booking(5, day(-1), day(1), status='checked-in')
+        db.session.query(Room).update({'status': 'booked'})
+        db.session.commit()
+
+        result = apply_transitions(day(0))
+        assert result['no_shows'] == 1
+        assert result['checked_out'] == 1
+        assert result['unpaid_overdue'] == [unpaid_overdue.id]
+        assert statuses(no_show, arriving, paid_overdue, unpaid_overdue, staying) == \
+            ['cancelled', 'booked', 'checked-out', 'checked-in', 'checked-in']
+        room_statuses = {room.id: room.status for room in Room.query}
+        assert room_statuses == {1: 'available', 2: 'booked', 3: 'available', 4: 'booked', 5: 'booked',
+                                 6: 'available'}
+
+
+def test_transitions_run_once_per_day_unless_forced(app):
+    with app.app_context():
+        add_booking(1, day(-2), day(1))
+        assert apply_transitions(day(0))['no_shows'] == 1
+        assert apply_transitions(day(0)) is None
+        assert apply_transitions(day(0), force=True)['no_shows'] == 0
+        assert apply_transitions(day(1)) is not None
+
+
+def test_transitions_route(client, app):
+    with app.app_context():
+        add_booking(1, day(-2), day(1))
+    response = client.post('/receptionist/maintenance/transitions')
+    assert response.status_code == 200
+    assert response.get_json()['result']['no_shows'] == 1
+
+
+def scheduler_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'booking-transitions']
+
+
+def test_scheduler_starts_only_on_request(tmp_path):
+    app = create_app(make_config(tmp_path, BOOKING_TRANSITIONS_HOUR=23))
+    assert 'transitions_stop' not in app.extensions
+    before = len(scheduler_threads())
+    start_scheduler(app)
+    start_scheduler(app)
+    assert len(scheduler_threads()) == before + 1
+    app.extensions['transitions_stop'].set()